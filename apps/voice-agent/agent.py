@@ -4,11 +4,14 @@ LiveKit Voice AI Agent
 """
 
 import asyncio
+import contextlib
 import logging
 import os
 import io
 import time
 import json
+import sys
+import threading
 import numpy as np
 from dotenv import load_dotenv
 
@@ -17,6 +20,7 @@ from livekit.agents import (
     AutoSubscribe,
     JobContext,
     JobProcess,
+    JobRequest,
     WorkerOptions,
     cli,
     vad as agents_vad,
@@ -25,7 +29,23 @@ from livekit.plugins import silero
 from faster_whisper import WhisperModel
 import edge_tts
 
-from llm import get_default_provider, ChatMessage, LLMProvider
+from llm import (
+    get_default_provider,
+    set_queue_key,
+    ChatMessage,
+    LLMProvider,
+    GenerationPolicy,
+    LLMPrewarmer,
+    estimate_tokens,
+)
+from stt import STTClient, WhisperCalibrator
+from monitoring import JobLoadReporter, LoadEstimator, LoopMonitor
+from tts import TTSConnectionManager, FillerBank, MAX_SSML_TEXT_BYTES, fade_out
+from session import ConversationSession, SessionRegistry, ConversationStateStore
+from capture import CaptureWriter, VAD_START, VAD_END, capture_filename
+from transport import ResponseStreamer
+from speech import BatchedVAD, EnergyGate, RemoteVAD
+from cache import CachedProvider, MemoryLRU, RedisTier, TieredCache, make_key
 
 load_dotenv()
 
@@ -41,7 +61,99 @@ logger.setLevel(logging.DEBUG)
 WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
 WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
 WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CALIBRATION = os.getenv("WHISPER_CALIBRATION", "true").lower() == "true"  # CPU 모델별 보정 결과 사용 (없으면 위 설정)
 TTS_VOICE = os.getenv("TTS_VOICE", "ko-KR-SunHiNeural")  # 한국어 여성 음성
+TTS_CONNECTION_REUSE = os.getenv("TTS_CONNECTION_REUSE", "true").lower() == "true"  # warm websocket 재사용
+TTS_WSS_URL = os.getenv("TTS_WSS_URL", "")  # 합성 서버 주소 재정의 (로컬 stand-in 측정용)
+TTS_CONN_MAX_AGE_SEC = float(os.getenv("TTS_CONN_MAX_AGE_SEC", "120"))
+TTS_CONN_MAX_IDLE_SEC = float(os.getenv("TTS_CONN_MAX_IDLE_SEC", "30"))
+
+# 필러 음성 설정 (STT 이후 응답 음성이 늦어지면 재생)
+FILLER_ENABLED = os.getenv("FILLER_ENABLED", "true").lower() == "true"
+FILLER_DEADLINE_MS = int(os.getenv("FILLER_DEADLINE_MS", "700"))  # STT 완료 후 이 시간 안에 응답이 없으면 재생
+FILLER_TEXTS = [t.strip() for t in os.getenv("FILLER_TEXTS", "음…,잠시만요").split(",")]
+
+# 응답 텍스트 점진 전송 설정
+RESPONSE_STREAM_ENABLED = os.getenv("RESPONSE_STREAM_ENABLED", "true").lower() == "true"
+RESPONSE_STREAM_MAX_CHARS = int(os.getenv("RESPONSE_STREAM_MAX_CHARS", "24"))  # 이만큼 모이면 즉시 전송
+RESPONSE_STREAM_MAX_DELAY_MS = float(os.getenv("RESPONSE_STREAM_MAX_DELAY_MS", "150"))  # 최대 묶음 대기 시간
+RESPONSE_STREAM_BINARY = os.getenv("RESPONSE_STREAM_BINARY", "false").lower() == "true"  # 바이너리 프레이밍
+
+# 응답 캐시 설정 (반복 질문은 LLM/TTS 생략)
+# 기본 비활성화 - 키에 직전 몇 개 메시지만 들어가므로 시간/상태에 따라 답이 바뀌는 질문에 지난 응답이 재생될 수 있음
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_TTL_SEC = float(os.getenv("LLM_CACHE_TTL_SEC", "3600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+LLM_CACHE_CONTEXT_MESSAGES = int(os.getenv("LLM_CACHE_CONTEXT_MESSAGES", "2"))  # 키에 포함할 직전 메시지 수
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"  # 응답 텍스트별 합성 음성 보관
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "")  # 설정 시 Worker 간 공유 계층 사용 (redis://...)
+
+# 출력 오디오 형식 (24kHz mono, 20ms 프레임)
+OUTPUT_SAMPLE_RATE = 24000
+OUTPUT_FRAME_SIZE = 480
+
+# 공유 STT 서버 설정 (설정 시 Job 프로세스는 모델을 로드하지 않음)
+STT_SERVER_SOCKET = os.getenv("STT_SERVER_SOCKET", "")
+STT_SERVER_TIMEOUT_SEC = float(os.getenv("STT_SERVER_TIMEOUT_SEC", "30"))
+
+# Worker 부하 / 수락 제어 설정
+WORKER_LOAD_THRESHOLD = float(os.getenv("WORKER_LOAD_THRESHOLD", "0.75"))  # 이 이상이면 신규 Job 거절
+LOAD_STATS_DIR = os.getenv("LOAD_STATS_DIR", "/tmp/voice-agent-load")
+LOAD_STT_QUEUE_LIMIT = int(os.getenv("LOAD_STT_QUEUE_LIMIT", "4"))  # 포화로 보는 STT 대기 요청 수
+LOAD_STT_SLO_MS = float(os.getenv("LOAD_STT_SLO_MS", "1500"))  # 단계별 p95 지연 SLO
+LOAD_LLM_SLO_MS = float(os.getenv("LOAD_LLM_SLO_MS", "3000"))
+LOAD_TTS_SLO_MS = float(os.getenv("LOAD_TTS_SLO_MS", "1500"))
+LOAD_LOOP_LAG_LIMIT_MS = float(os.getenv("LOAD_LOOP_LAG_LIMIT_MS", "100"))
+
+# 이벤트 루프 감시 / 프로파일러 설정
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "50"))  # 지연 측정 주기
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))  # 이 이상 멈추면 스택 캡처
+LOOP_METRICS_INTERVAL_SEC = float(os.getenv("LOOP_METRICS_INTERVAL_SEC", "10"))  # 백분위수 보고 주기
+LOOP_PROFILE_SEC = float(os.getenv("LOOP_PROFILE_SEC", "0"))  # >0 이면 Job 시작 시 프로파일 (SIGUSR2로도 시작)
+LOOP_PROFILE_DIR = os.getenv("LOOP_PROFILE_DIR", "/tmp/voice-agent-profiles")
+LOOP_PROFILE_HZ = float(os.getenv("LOOP_PROFILE_HZ", "100"))
+
+# 세션 캡처 (오프라인 재현용, 기본 비활성화)
+CAPTURE_ENABLED = os.getenv("CAPTURE_ENABLED", "false").lower() == "true"
+CAPTURE_DIR = os.getenv("CAPTURE_DIR", "/tmp/voice-agent-captures")
+CAPTURE_MAX_QUEUE = int(os.getenv("CAPTURE_MAX_QUEUE", "2000"))  # 기록 대기 레코드 상한 (초과 시 버림)
+
+# 세션 자원 보고 주기
+SESSION_METRICS_INTERVAL_SEC = float(os.getenv("SESSION_METRICS_INTERVAL_SEC", "30"))
+
+# 대화 상태 저장 (Worker 재시작/재배포/Job 이동 후 재입장 시 대화 기록 복원, Redis write-behind)
+SESSION_STATE_ENABLED = os.getenv("SESSION_STATE_ENABLED", "false").lower() == "true"
+SESSION_STATE_REDIS_URL = os.getenv("SESSION_STATE_REDIS_URL", "")  # 응답 캐시와 별도 (비우면 비활성화)
+SESSION_STATE_TTL_SEC = float(os.getenv("SESSION_STATE_TTL_SEC", "3600"))
+SESSION_STATE_FLUSH_MS = float(os.getenv("SESSION_STATE_FLUSH_MS", "250"))  # 이 시간 동안 모아서 한 번에 기록
+SESSION_STATE_MAX_BATCH = int(os.getenv("SESSION_STATE_MAX_BATCH", "64"))  # 대기 키가 이만큼이면 즉시 기록
+SESSION_STATE_RESTORE_WAIT_MS = float(os.getenv("SESSION_STATE_RESTORE_WAIT_MS", "300"))  # 첫 턴에서 복원을 기다리는 최대 시간
+
+# 음성 응답 생성 정책 (적응형 max_tokens + 문장 수/시간 예산 조기 종료)
+GENERATION_POLICY_ENABLED = os.getenv("GENERATION_POLICY_ENABLED", "true").lower() == "true"
+LLM_MAX_SENTENCES = int(os.getenv("LLM_MAX_SENTENCES", "3"))  # 완결 문장이 이만큼 나오면 스트림 종료 (0 = 제한 없음)
+LLM_TIME_BUDGET_MS = float(os.getenv("LLM_TIME_BUDGET_MS", "8000"))  # 응답 생성 시간 예산, 첫 토큰부터 (0 = 제한 없음)
+LLM_MIN_TOKENS = int(os.getenv("LLM_MIN_TOKENS", "40"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "400"))
+LLM_FALLBACK_REPLY = "죄송합니다, 응답을 생성하는 데 문제가 발생했습니다."  # 오류 또는 빈 응답 시
+
+# LLM 사전 준비 (발화 시작 시 모델 적재 + 시스템 프롬프트/대화 기록 미리 평가)
+LLM_PREWARM_ENABLED = os.getenv("LLM_PREWARM_ENABLED", "true").lower() == "true"
+LLM_PREWARM_MIN_INTERVAL_SEC = float(os.getenv("LLM_PREWARM_MIN_INTERVAL_SEC", "5"))  # 대화당 최소 간격
+LLM_PREWARM_REUSE_SEC = float(os.getenv("LLM_PREWARM_REUSE_SEC", "60"))  # 같은 접두부 재준비 생략 시간
+
+# VAD 프론트엔드 설정 (참가자 간 배치 추론 + 무음 게이트)
+VAD_BATCHING = os.getenv("VAD_BATCHING", "true").lower() == "true"  # false: 참가자별 silero VADStream
+VAD_SERVER_SOCKET = os.getenv("VAD_SERVER_SOCKET", "")  # 설정 시 호스트 공용 VAD 서버로 방 간 배치
+VAD_GATE_ENABLED = os.getenv("VAD_GATE_ENABLED", "true").lower() == "true"
+VAD_GATE_DB = float(os.getenv("VAD_GATE_DB", "-50"))  # 이보다 작은 윈도우는 추론 생략
+VAD_GATE_ZCR = float(os.getenv("VAD_GATE_ZCR", "0.35"))  # 약한 에너지 + 높은 영교차율도 무음 처리
+VAD_GATE_HANGOVER_MS = float(os.getenv("VAD_GATE_HANGOVER_MS", "300"))  # 무음 시작 후 추론 유지 시간
+VAD_BATCH_WAIT_MS = float(os.getenv("VAD_BATCH_WAIT_MS", "4"))  # 홉마다 다른 참가자 프레임을 기다리는 시간
+VAD_METRICS_INTERVAL_SEC = float(os.getenv("VAD_METRICS_INTERVAL_SEC", "30"))
 
 # Turn Detection 설정
 TURN_DETECTION_SILENCE_MS = int(os.getenv("TURN_DETECTION_SILENCE_MS", "800"))  # 침묵 후 턴 종료 (ms)
@@ -51,28 +163,310 @@ INTERRUPT_THRESHOLD_MS = int(os.getenv("INTERRUPT_THRESHOLD_MS", "500"))  # 인
 
 # 전역 모델
 _whisper_model = None
+_whisper_model_lock = threading.Lock()
+_calibration_thread: threading.Thread = None
 _llm_provider: LLMProvider = None
+_stt_client: STTClient = None
+_load_reporter: JobLoadReporter = None
+_load_estimator: LoadEstimator = None
+_tts_manager: TTSConnectionManager = None
+_loop_monitor: LoopMonitor = None
+_filler_bank: FillerBank = None
+_filler_load_task: asyncio.Task = None
+_llm_cache: TieredCache = None
+_batched_vad: BatchedVAD = None
+_remote_vad: RemoteVAD = None
+_tts_cache: TieredCache = None
+_session_store: ConversationStateStore = None
 
 
 def get_whisper_model():
-    """Whisper 모델 싱글톤"""
+    """Whisper 모델 싱글톤 (STT 서버 장애 시 대체 로드가 여러 스레드에서 동시에 호출될 수 있음)"""
     global _whisper_model
-    if _whisper_model is None:
-        logger.info(f"Loading Whisper model: {WHISPER_MODEL_SIZE}")
-        _whisper_model = WhisperModel(
-            WHISPER_MODEL_SIZE,
-            device=WHISPER_DEVICE,
-            compute_type=WHISPER_COMPUTE_TYPE
-        )
-        logger.info("Whisper model loaded")
+    with _whisper_model_lock:
+        if _whisper_model is None:
+            logger.info(f"Loading Whisper model: {WHISPER_MODEL_SIZE}")
+            start_time = time.time()
+            # 보정 결과는 Worker 시작 시 calibrate_whisper()가 저장 (여기서는 읽기만 - 측정 비용 없음)
+            calibration = None
+            if WHISPER_CALIBRATION:
+                calibration = WhisperCalibrator(WHISPER_MODEL_SIZE, device=WHISPER_DEVICE).load_cached()
+            if calibration:
+                settings = dict(
+                    compute_type=calibration.compute_type,
+                    cpu_threads=calibration.cpu_threads,
+                    num_workers=calibration.num_workers,
+                )
+            else:
+                settings = dict(compute_type=WHISPER_COMPUTE_TYPE, cpu_threads=0, num_workers=1)
+            _whisper_model = WhisperModel(WHISPER_MODEL_SIZE, device=WHISPER_DEVICE, **settings)
+            log_metric(
+                "whisper_model_load",
+                (time.time() - start_time) * 1000,
+                model=WHISPER_MODEL_SIZE,
+                settings_source=calibration.source if calibration else "env",
+                rtf=calibration.rtf if calibration else None,
+                throughput=calibration.throughput if calibration else None,
+                **settings
+            )
+            logger.info("Whisper model loaded")
     return _whisper_model
 
 
+def calibrate_whisper():
+    """Worker 시작 시 Whisper 설정 보정을 백그라운드로 시작 (CPU 모델별 저장 결과가 없을 때만 측정)
+
+    측정 중에는 compute_worker_load가 임계값을 반환해 Job을 받지 않는다 (측정 왜곡/세션 CPU 경합 방지).
+    """
+    global _calibration_thread
+    if not WHISPER_CALIBRATION or STT_SERVER_SOCKET:
+        return None
+    calibrator = WhisperCalibrator(
+        WHISPER_MODEL_SIZE,
+        device=WHISPER_DEVICE,
+        transcribe_options=WHISPER_TRANSCRIBE_OPTIONS,
+    )
+    _calibration_thread = calibrator.start_background(on_done=log_whisper_calibration)
+    return _calibration_thread
+
+
+def calibration_running() -> bool:
+    return _calibration_thread is not None and _calibration_thread.is_alive()
+
+
+def log_whisper_calibration(result, error):
+    """보정 완료 메트릭 (결과 없음 = 다른 프로세스가 측정 중이거나 최근 실패로 생략)"""
+    if error is not None or result is None:
+        log_metric(
+            "whisper_calibration",
+            0.0,
+            model=WHISPER_MODEL_SIZE,
+            source="failed" if error is not None else "skipped",
+            error=str(error) if error is not None else None,
+        )
+        return
+    log_metric(
+        "whisper_calibration",
+        result.calibration_ms if result.source == "calibrated" else 0.0,
+        model=WHISPER_MODEL_SIZE,
+        source=result.source,
+        cpu_model=result.cpu_model,
+        compute_type=result.compute_type,
+        cpu_threads=result.cpu_threads,
+        num_workers=result.num_workers,
+        rtf=result.rtf,
+        throughput=result.throughput,
+        candidates=len(result.candidates),
+    )
+
+
+def get_stt_client() -> STTClient:
+    """공유 STT 서버 클라이언트 싱글톤 (서버 모드가 아니면 None)"""
+    global _stt_client
+    if _stt_client is None and STT_SERVER_SOCKET:
+        _stt_client = STTClient(STT_SERVER_SOCKET, timeout=STT_SERVER_TIMEOUT_SEC)
+        logger.info(f"Using shared STT server: {STT_SERVER_SOCKET}")
+    return _stt_client
+
+
+def get_load_reporter() -> JobLoadReporter:
+    """Job 프로세스 부하 기록기 싱글톤"""
+    global _load_reporter
+    if _load_reporter is None:
+        loop_monitor = get_loop_monitor()
+        _load_reporter = JobLoadReporter(
+            LOAD_STATS_DIR,
+            lag_source=loop_monitor.recent_lag_ms if loop_monitor else None,
+        )
+    return _load_reporter
+
+
+def get_load_estimator() -> LoadEstimator:
+    """Worker 부하 추정기 싱글톤 (메인 프로세스)"""
+    global _load_estimator
+    if _load_estimator is None:
+        _load_estimator = LoadEstimator(
+            LOAD_STATS_DIR,
+            stt_queue_limit=LOAD_STT_QUEUE_LIMIT,
+            stage_slo_ms={"stt": LOAD_STT_SLO_MS, "llm": LOAD_LLM_SLO_MS, "tts": LOAD_TTS_SLO_MS},
+            loop_lag_limit_ms=LOAD_LOOP_LAG_LIMIT_MS,
+        )
+    return _load_estimator
+
+
+def compute_worker_load(*_args) -> float:
+    """WorkerOptions.load_fnc - 0~1 부하 점수 (Whisper 보정 중에는 임계값 이상으로 고정해 Job을 받지 않음)"""
+    load = get_load_estimator().get_load()
+    if calibration_running():
+        return max(load, WORKER_LOAD_THRESHOLD)
+    return load
+
+
+async def request_job(req: JobRequest):
+    """WorkerOptions.request_fnc - 부하 임계값 초과 시 신규 Job 거절"""
+    load = compute_worker_load()
+    if load >= WORKER_LOAD_THRESHOLD:
+        log_metric(
+            "job_rejected",
+            0,
+            load=round(load, 3),
+            threshold=WORKER_LOAD_THRESHOLD,
+            calibrating=calibration_running(),
+            **{k: round(v, 3) for k, v in get_load_estimator().last_components.items()}
+        )
+        await req.reject()
+        return
+    await req.accept()
+
+
+def get_tts_manager() -> TTSConnectionManager:
+    """TTS 연결 관리자 싱글톤 (재사용 비활성화 시 None)"""
+    global _tts_manager
+    if _tts_manager is None and TTS_CONNECTION_REUSE:
+        _tts_manager = TTSConnectionManager(
+            url=TTS_WSS_URL or None,
+            max_age_sec=TTS_CONN_MAX_AGE_SEC,
+            max_idle_sec=TTS_CONN_MAX_IDLE_SEC,
+        )
+    return _tts_manager
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """이벤트 루프 감시기 싱글톤 (비활성화 시 None)"""
+    global _loop_monitor
+    if _loop_monitor is None and LOOP_MONITOR_ENABLED:
+        _loop_monitor = LoopMonitor(
+            log_metric,
+            interval_ms=LOOP_LAG_INTERVAL_MS,
+            stall_threshold_ms=LOOP_STALL_THRESHOLD_MS,
+            report_interval_sec=LOOP_METRICS_INTERVAL_SEC,
+            profile_dir=LOOP_PROFILE_DIR,
+            profile_hz=LOOP_PROFILE_HZ,
+            profile_duration_sec=LOOP_PROFILE_SEC or 30.0,
+        )
+    return _loop_monitor
+
+
+def get_filler_bank() -> FillerBank:
+    """필러 클립 싱글톤 (비활성화 시 None)"""
+    global _filler_bank
+    if _filler_bank is None and FILLER_ENABLED:
+        _filler_bank = FillerBank(FILLER_TEXTS, sample_rate=OUTPUT_SAMPLE_RATE)
+    return _filler_bank
+
+
+async def load_filler_clips():
+    """필러 음성 미리 합성/디코딩 (프로세스당 1회)"""
+    bank = get_filler_bank()
+    if bank is None or bank.ready:
+        return
+
+    async def synthesize(text: str) -> bytes:
+        audio_data, _ = await text_to_speech(text)
+        return audio_data
+
+    try:
+        await bank.load(synthesize, decode_audio)
+    except Exception as e:
+        logger.warning(f"Failed to prepare filler clips: {e}")
+
+
+def start_filler_load() -> asyncio.Task:
+    """필러 음성 준비 Task 시작 (진행 중이면 같은 Task 재사용, 참조를 유지해 도중에 회수되지 않도록)"""
+    global _filler_load_task
+    if _filler_load_task is None or _filler_load_task.done():
+        _filler_load_task = asyncio.create_task(load_filler_clips())
+    return _filler_load_task
+
+
+async def stop_filler_load():
+    """Job 종료 시 진행 중인 필러 준비 취소"""
+    task = _filler_load_task
+    if task is None:
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def get_rss_mb() -> float:
+    """현재 프로세스 RSS (MB)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def get_batched_vad() -> BatchedVAD:
+    """배치 VAD 싱글톤 (프로세스 내 모든 참가자 공유)"""
+    global _batched_vad
+    if _batched_vad is None:
+        _batched_vad = BatchedVAD.load(
+            on_metric=log_metric,
+            gate=EnergyGate(VAD_GATE_DB, VAD_GATE_ZCR) if VAD_GATE_ENABLED else None,
+            hangover_ms=VAD_GATE_HANGOVER_MS,
+            batch_wait_ms=VAD_BATCH_WAIT_MS,
+            report_interval_sec=VAD_METRICS_INTERVAL_SEC,
+        )
+    return _batched_vad
+
+
+def get_remote_vad() -> RemoteVAD:
+    """공유 VAD 서버 클라이언트 싱글톤 (미설정 시 None, 서버 장애 시 프로세스 내 배치 VAD 사용)"""
+    global _remote_vad
+    if _remote_vad is None and VAD_BATCHING and VAD_SERVER_SOCKET:
+        _remote_vad = RemoteVAD(VAD_SERVER_SOCKET, fallback=get_batched_vad)
+        logger.info(f"Using shared VAD server: {VAD_SERVER_SOCKET}")
+    return _remote_vad
+
+
+def get_session_store() -> ConversationStateStore:
+    """대화 상태 저장소 싱글톤 (비활성화 시 None)"""
+    global _session_store
+    if _session_store is None and SESSION_STATE_ENABLED and SESSION_STATE_REDIS_URL:
+        _session_store = ConversationStateStore(
+            SESSION_STATE_REDIS_URL,
+            ttl_sec=SESSION_STATE_TTL_SEC,
+            flush_interval_ms=SESSION_STATE_FLUSH_MS,
+            max_batch=SESSION_STATE_MAX_BATCH,
+            on_metric=log_metric,
+            report_interval_sec=SESSION_METRICS_INTERVAL_SEC,
+        )
+    return _session_store
+
+
+def get_llm_cache() -> TieredCache:
+    """LLM 응답 캐시 싱글톤 (비활성화 시 None)"""
+    global _llm_cache
+    if _llm_cache is None and LLM_CACHE_ENABLED:
+        _llm_cache = TieredCache(
+            MemoryLRU(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SEC),
+            RedisTier(CACHE_REDIS_URL, ttl_sec=LLM_CACHE_TTL_SEC) if CACHE_REDIS_URL else None,
+        )
+    return _llm_cache
+
+
+def get_tts_cache() -> TieredCache:
+    """합성 음성 캐시 싱글톤 (비활성화 시 None)"""
+    global _tts_cache
+    if _tts_cache is None and TTS_CACHE_ENABLED:
+        _tts_cache = TieredCache(
+            MemoryLRU(LLM_CACHE_MAX_ENTRIES, TTS_CACHE_MAX_BYTES, LLM_CACHE_TTL_SEC),
+            RedisTier(CACHE_REDIS_URL, ttl_sec=LLM_CACHE_TTL_SEC) if CACHE_REDIS_URL else None,
+        )
+    return _tts_cache
+
+
 def get_llm_provider() -> LLMProvider:
-    """LLM Provider 싱글톤"""
+    """LLM Provider 싱글톤 (캐시 활성화 시 CachedProvider로 감쌈)"""
     global _llm_provider
     if _llm_provider is None:
         _llm_provider = get_default_provider()
+        cache = get_llm_cache()
+        if cache:
+            _llm_provider = CachedProvider(_llm_provider, cache, context_messages=LLM_CACHE_CONTEXT_MESSAGES)
         logger.info(f"LLM provider initialized: {_llm_provider.get_provider_type()}, model: {_llm_provider.get_model_name()}")
     return _llm_provider
 
@@ -94,6 +488,17 @@ def log_metric(event: str, duration_ms: float, **kwargs):
         **sanitized_kwargs
     }
     logger.info(f"METRIC: {json.dumps(metric)}")
+    get_load_reporter().record_stage(event, duration_ms)
+
+
+# Whisper 인식 옵션 (보정 측정에도 같은 옵션 사용)
+WHISPER_TRANSCRIBE_OPTIONS = dict(
+    language="ko",
+    beam_size=5,
+    vad_filter=False,
+    log_prob_threshold=-2.0,  # 기본값 -1.0보다 낮춰서 더 관대하게
+    condition_on_previous_text=False,  # 이전 텍스트 의존성 제거
+)
 
 
 async def transcribe_audio(audio_frames: list) -> tuple[str, float]:
@@ -101,7 +506,10 @@ async def transcribe_audio(audio_frames: list) -> tuple[str, float]:
     if not audio_frames:
         return "", 0.0
 
-    model = get_whisper_model()
+    # STT 서버가 장애로 보류 중이면 프로세스 내 Whisper 사용 (서버 모드에서는 처음 필요할 때 로드)
+    stt_client = get_stt_client()
+    if stt_client and not stt_client.available():
+        stt_client = None
     start_time = time.time()
 
     # 오디오 프레임을 numpy로 변환
@@ -159,20 +567,37 @@ async def transcribe_audio(audio_frames: list) -> tuple[str, float]:
     logger.info(f"Audio stats - max: {audio_max:.4f}, rms: {audio_rms:.4f}, samples: {len(audio_float)}")
 
     # Whisper로 음성 인식 (vad_filter 비활성화 - Silero VAD가 이미 처리함)
-    loop = asyncio.get_event_loop()
-    segments, info = await loop.run_in_executor(
-        None,
-        lambda: model.transcribe(
-            audio_float,
-            language="ko",
-            beam_size=5,
-            vad_filter=False,
-            log_prob_threshold=-2.0,  # 기본값 -1.0보다 낮춰서 더 관대하게
-            condition_on_previous_text=False,  # 이전 텍스트 의존성 제거
-        )
-    )
-
-    text = " ".join([seg.text.strip() for seg in segments])
+    transcribe_options = WHISPER_TRANSCRIBE_OPTIONS
+    stt_queue_ms = 0.0
+    stt_mode = "server" if stt_client else ("local" if not STT_SERVER_SOCKET else "fallback")
+    load_reporter = get_load_reporter()
+    load_reporter.stt_started()
+    try:
+        if stt_client:
+            try:
+                result = await stt_client.transcribe(audio_float, **transcribe_options)
+                text, language, stt_queue_ms = result.text, result.language, result.queue_ms
+            except Exception as e:
+                logger.warning(f"STT server request failed, using in-process Whisper: {e}")
+                log_metric("stt_error", (time.time() - start_time) * 1000, stt_mode="server", error=str(e))
+                stt_client, stt_mode = None, "fallback"
+        if not stt_client:
+            loop = asyncio.get_event_loop()
+            try:
+                # 서버 모드의 대체 로드는 스레드에서 (이벤트 루프를 막지 않도록)
+                model = _whisper_model or await loop.run_in_executor(None, get_whisper_model)
+                segments, info = await loop.run_in_executor(
+                    None,
+                    lambda: model.transcribe(audio_float, **transcribe_options)
+                )
+                text = " ".join([seg.text.strip() for seg in segments])
+            except Exception as e:
+                logger.error(f"STT error: {e}")
+                log_metric("stt_error", (time.time() - start_time) * 1000, stt_mode=stt_mode, error=str(e))
+                return "", 0.0
+            language = info.language if hasattr(info, 'language') else "ko"
+    finally:
+        load_reporter.stt_finished()
 
     duration_ms = (time.time() - start_time) * 1000
     log_metric(
@@ -181,45 +606,122 @@ async def transcribe_audio(audio_frames: list) -> tuple[str, float]:
         model=WHISPER_MODEL_SIZE,
         audio_duration_sec=round(audio_duration_sec, 2),
         text_length=len(text),
-        language=info.language if hasattr(info, 'language') else "ko",
+        language=language,
         source_sample_rate=source_sample_rate,
-        audio_level=round(audio_level, 6)
+        audio_level=round(audio_level, 6),
+        stt_mode=stt_mode,
+        queue_ms=stt_queue_ms
     )
 
     return text, duration_ms
 
 
-async def get_llm_response(user_message: str, conversation_history: list) -> tuple[str, float]:
-    """LLM 응답 생성, 응답 시간 반환"""
-    provider = get_llm_provider()
-    start_time = time.time()
-
-    # 시스템 프롬프트
-    system_prompt = """당신은 친절하고 도움이 되는 AI 어시스턴트입니다.
+# 시스템 프롬프트
+SYSTEM_PROMPT = """당신은 친절하고 도움이 되는 AI 어시스턴트입니다.
 사용자와 음성으로 대화하고 있습니다.
 짧고 자연스러운 대화체로 응답하세요.
 한국어로 응답하세요."""
 
-    messages = [ChatMessage(role="system", content=system_prompt)]
+
+def build_messages(conversation_history: list, user_message: str = None) -> list[ChatMessage]:
+    """시스템 프롬프트 + 대화 기록 (+ 사용자 발화) - 사전 준비와 실제 요청이 같은 접두부를 쓰도록 공용"""
+    messages = [ChatMessage(role="system", content=SYSTEM_PROMPT)]
     for msg in conversation_history:
         messages.append(ChatMessage(role=msg["role"], content=msg["content"]))
-    messages.append(ChatMessage(role="user", content=user_message))
+    if user_message is not None:
+        messages.append(ChatMessage(role="user", content=user_message))
+    return messages
+
+
+async def get_llm_response(
+    user_message: str,
+    conversation_history: list,
+    on_delta=None,
+    policy: GenerationPolicy = None,
+    prewarmer: LLMPrewarmer = None,
+) -> tuple[str, float]:
+    """LLM 응답 생성 (스트리밍, 조각마다 on_delta 호출), 응답 시간 반환
+
+    policy가 있으면 토큰 예산을 적용하고 문장 수/시간 예산(첫 토큰부터)을 넘으면 스트림을 닫는다.
+    생성된 텍스트가 없으면 사과 응답으로 대체한다.
+    """
+    provider = get_llm_provider()
+    start_time = time.time()
+
+    messages = build_messages(conversation_history, user_message)
+    prewarm_state = prewarmer.state(messages[:-1]) if prewarmer else "off"
 
+    limiter = policy.start(user_message) if policy else None
+    stats = {}
+    chunks = []
+    first_token_ms = None
     try:
-        response = await provider.chat(messages)
+        stream = provider.chat_stream(
+            messages, max_tokens=limiter.max_tokens if limiter else None, stats=stats
+        )
+        # break 시에도 스트림을 즉시 닫아 HTTP 연결/제한기 슬롯 반환 (서버 측 생성 중단)
+        async with contextlib.aclosing(stream):
+            try:
+                # 시간 예산은 첫 토큰부터 (대기열/TTFT가 길어도 응답이 비지 않도록)
+                async with asyncio.timeout(None) as budget:
+                    async for delta in stream:
+                        if first_token_ms is None:
+                            first_token_ms = (time.time() - start_time) * 1000
+                        stop = False
+                        if limiter:
+                            delta, stop = limiter.feed(delta)
+                            if budget.when() is None and limiter.remaining_sec() is not None:
+                                budget.reschedule(asyncio.get_running_loop().time() + limiter.remaining_sec())
+                        if delta:
+                            chunks.append(delta)
+                            if on_delta:
+                                await on_delta(delta)
+                        if stop:
+                            break
+            except TimeoutError:
+                limiter.stop_for_time()
+
+        content = limiter.text if limiter else "".join(chunks)
         duration_ms = (time.time() - start_time) * 1000
 
+        usage = stats.get("usage") or {}
+        if limiter:
+            generated_tokens = limiter.finish(usage.get("completion_tokens"), stats.get("finish_reason"))
+            policy.record(limiter, generated_tokens)
+            policy_fields = {
+                "question_type": limiter.question_type,
+                "max_tokens": limiter.max_tokens,
+                "truncated": limiter.truncated or "none",
+                "truncation_rate": round(policy.truncation_rate(), 3),
+            }
+        else:
+            generated_tokens = usage.get("completion_tokens") or estimate_tokens(content)
+            policy_fields = {}
+
         log_metric(
             "llm_response",
             duration_ms,
             provider=provider.get_provider_type(),
             model=provider.get_model_name(),
             input_length=len(user_message),
-            output_length=len(response.content),
-            history_length=len(conversation_history)
+            output_length=len(content),
+            history_length=len(conversation_history),
+            queue_wait_ms=round(stats.get("queue_wait_ms", 0.0), 2),
+            slot_wait_ms=round(stats.get("slot_wait_ms", 0.0), 2),
+            retries=stats.get("retries", 0),
+            ttft_ms=round(first_token_ms or duration_ms, 2),
+            generated_tokens=generated_tokens,
+            tokens_estimated=not usage.get("completion_tokens"),
+            prewarm=prewarm_state,
+            **policy_fields,
+            cache=stats.get("cache", "off"),
+            **(get_llm_cache().stats() if get_llm_cache() else {})
         )
 
-        return response.content, duration_ms
+        if not content.strip():
+            logger.warning("LLM returned an empty reply, using fallback")
+            return LLM_FALLBACK_REPLY, duration_ms
+        return content, duration_ms
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
         log_metric(
@@ -227,22 +729,65 @@ async def get_llm_response(user_message: str, conversation_history: list) -> tup
             duration_ms,
             provider=provider.get_provider_type(),
             model=provider.get_model_name(),
-            error=str(e)
+            error=str(e),
+            partial_length=sum(len(c) for c in chunks)
         )
         logger.error(f"LLM error: {e}")
-        return "죄송합니다, 응답을 생성하는 데 문제가 발생했습니다.", duration_ms
+        if "".join(chunks).strip():
+            # 스트리밍 도중 끊긴 경우 받은 부분까지 사용
+            return "".join(chunks), duration_ms
+        return LLM_FALLBACK_REPLY, duration_ms
 
 
 async def text_to_speech(text: str) -> tuple[bytes, float]:
     """텍스트 → 음성 (TTS), 생성 시간 반환"""
     start_time = time.time()
     try:
-        communicate = edge_tts.Communicate(text, TTS_VOICE)
-        audio_data = b""
+        # 같은 응답 텍스트는 저장된 음성 사용 (LLM 캐시 적중 시 TTS까지 생략)
+        cache = get_tts_cache()
+        cache_key = make_key("tts", TTS_VOICE, text) if cache else None
+        if cache:
+            cached, result = await cache.get(cache_key)
+            if cached is not None:
+                duration_ms = (time.time() - start_time) * 1000
+                log_metric(
+                    "tts_synthesis",
+                    duration_ms,
+                    voice=TTS_VOICE,
+                    text_length=len(text),
+                    audio_bytes=len(cached),
+                    ttfb_ms=round(duration_ms, 2),
+                    cache=result,
+                    **cache.stats()
+                )
+                return cached, duration_ms
 
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio":
-                audio_data += chunk["data"]
+        chunks = []
+        first_byte_ms = None
+        stats = {}
+
+        manager = get_tts_manager()
+        if manager and len(text.encode("utf-8")) <= MAX_SSML_TEXT_BYTES:
+            try:
+                async for data in manager.synthesize(text, TTS_VOICE, stats):
+                    if first_byte_ms is None:
+                        first_byte_ms = (time.time() - start_time) * 1000
+                    chunks.append(data)
+            except Exception as e:
+                logger.warning(f"Pooled TTS failed, falling back to edge-tts: {e}")
+                chunks, first_byte_ms, stats = [], None, {}
+
+        if not chunks:
+            communicate = edge_tts.Communicate(text, TTS_VOICE)
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    if first_byte_ms is None:
+                        first_byte_ms = (time.time() - start_time) * 1000
+                    chunks.append(chunk["data"])
+
+        audio_data = b"".join(chunks)
+        if cache and audio_data:
+            await cache.set(cache_key, audio_data)
 
         duration_ms = (time.time() - start_time) * 1000
         log_metric(
@@ -250,7 +795,11 @@ async def text_to_speech(text: str) -> tuple[bytes, float]:
             duration_ms,
             voice=TTS_VOICE,
             text_length=len(text),
-            audio_bytes=len(audio_data)
+            audio_bytes=len(audio_data),
+            ttfb_ms=round(first_byte_ms or 0.0, 2),
+            connection_reused=stats.get("reused", False),
+            connection_prewarmed=stats.get("prewarmed", False),
+            cache="miss" if cache else "off"
         )
 
         return audio_data, duration_ms
@@ -271,18 +820,43 @@ async def entrypoint(ctx: JobContext):
 
     logger.info(f"Voice Agent connecting to room: {ctx.room.name}")
 
-    # Whisper 모델 로드
-    get_whisper_model()
+    # Whisper 모델 로드 (공유 STT 서버 사용 시 생략)
+    if not get_stt_client():
+        get_whisper_model()
 
     # LLM Provider 초기화
     get_llm_provider()
 
+    # 부하 스냅샷 기록 시작 (Worker load_fnc 입력)
+    get_load_reporter().ensure_started()
+
+    # 이벤트 루프 지연 감시 (LOOP_PROFILE_SEC 설정 시 프로파일 시작)
+    loop_monitor = get_loop_monitor()
+    if loop_monitor:
+        loop_monitor.start()
+        if LOOP_PROFILE_SEC > 0:
+            loop_monitor.start_profile()
+
+    # TTS 연결 미리 열기 / 종료 시 정리
+    tts_manager = get_tts_manager()
+    if tts_manager:
+        tts_manager.warm(TTS_VOICE)
+        ctx.add_shutdown_callback(tts_manager.close)
+
+    # 필러 음성 준비 (백그라운드)
+    if get_filler_bank():
+        start_filler_load()
+        ctx.add_shutdown_callback(stop_filler_load)
+
     # 방 연결
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
     logger.info(f"Connected to room: {ctx.room.name}")
 
     # VAD 설정
-    vad = silero.VAD.load()
+    if VAD_BATCHING:
+        vad = get_remote_vad() or get_batched_vad()
+    else:
+        vad = silero.VAD.load()
 
     # 오디오 소스 생성 (TTS 출력용)
     audio_source = rtc.AudioSource(24000, 1)  # 24kHz mono
@@ -296,6 +870,19 @@ async def entrypoint(ctx: JobContext):
     await ctx.room.local_participant.publish_track(track, options)
     logger.info("Published audio track for TTS output")
 
+    # 참가자/트랙별 세션 관리 (퇴장 시 자원 회수)
+    sessions = SessionRegistry(
+        log_metric,
+        report_interval_sec=SESSION_METRICS_INTERVAL_SEC,
+        process_stats=lambda: {"rss_mb": round(get_rss_mb(), 1)},
+    )
+    ctx.add_shutdown_callback(sessions.close_all)
+
+    # 종료 전 대기 중인 대화 상태 기록 후 연결 종료
+    state_store = get_session_store()
+    if state_store:
+        ctx.add_shutdown_callback(state_store.close)
+
     # 참가자별 대화 처리
     @ctx.room.on("track_subscribed")
     def on_track_subscribed(
@@ -309,14 +896,23 @@ async def entrypoint(ctx: JobContext):
             return
 
         logger.info(f"Processing audio from: {participant.identity}")
+        sessions.start(
+            participant.identity,
+            publication.sid,
+            lambda session: handle_conversation(ctx, vad, track, participant, audio_source, session),
+        )
 
-        async def handle_with_error_logging():
-            try:
-                await handle_conversation(ctx, vad, track, participant, audio_source)
-            except Exception as e:
-                logger.error(f"Error in handle_conversation task: {e}", exc_info=True)
+    @ctx.room.on("track_unsubscribed")
+    def on_track_unsubscribed(
+        track: rtc.Track,
+        publication: rtc.TrackPublication,
+        participant: rtc.RemoteParticipant,
+    ):
+        sessions.close(participant.identity, publication.sid, reason="track unsubscribed")
 
-        asyncio.create_task(handle_with_error_logging())
+    @ctx.room.on("participant_disconnected")
+    def on_participant_disconnected(participant: rtc.RemoteParticipant):
+        sessions.close(participant.identity, reason="participant disconnected")
 
 
 class TurnDetector:
@@ -332,16 +928,16 @@ class TurnDetector:
         self.prefix_buffer = []  # 발화 시작 전 버퍼
         self.prefix_buffer_ms = TURN_DETECTION_PREFIX_PADDING_MS
 
-    def start_speech(self):
+    def start_speech(self, now: float = None):
         """발화 시작"""
-        self.speech_start_time = time.time()
+        self.speech_start_time = now if now is not None else time.time()
         self.speech_end_time = None
         self.is_speaking = True
         logger.debug(f"Turn: Speech started")
 
-    def end_speech(self):
+    def end_speech(self, now: float = None):
         """발화 종료"""
-        self.speech_end_time = time.time()
+        self.speech_end_time = now if now is not None else time.time()
         self.is_speaking = False
         logger.debug(f"Turn: Speech ended")
 
@@ -384,33 +980,128 @@ class TurnDetector:
 
 async def handle_conversation(
     ctx: JobContext,
-    vad: silero.VAD,
+    vad: silero.VAD | BatchedVAD | RemoteVAD,
     track: rtc.Track,
     participant: rtc.RemoteParticipant,
     audio_source: rtc.AudioSource,
+    session: ConversationSession = None,
 ):
     """음성 대화 처리 루프 (Turn Detection 적용)"""
 
+    # LLM 공정 큐잉 단위 (이 Task와 하위 Task에 적용)
+    set_queue_key(f"{ctx.room.name}:{participant.identity}")
+
     audio_stream = rtc.AudioStream(track)
     vad_stream = vad.stream()
 
     speech_frames = []
     conversation_history = []
+    generation_policy = GenerationPolicy(
+        max_sentences=LLM_MAX_SENTENCES,
+        time_budget_ms=LLM_TIME_BUDGET_MS,
+        min_tokens=LLM_MIN_TOKENS,
+        max_tokens=LLM_MAX_TOKENS,
+    ) if GENERATION_POLICY_ENABLED else None
+    prewarmer = LLMPrewarmer(
+        get_llm_provider(),
+        on_metric=log_metric,
+        min_interval_sec=LLM_PREWARM_MIN_INTERVAL_SEC,
+        reuse_sec=LLM_PREWARM_REUSE_SEC,
+    ) if LLM_PREWARM_ENABLED else None
     turn_detector = TurnDetector()
     turn_end_task: asyncio.Task = None
     processing_lock = asyncio.Lock()
+    audio_frame_count = 0
+    turn_count = 0
+
+    # 재입장 시 저장된 대화 기록 복원 (조회는 바로 시작, 반영은 처음 필요할 때)
+    # 조회가 끝나기 전이나 실패했으면 저장하지 않음 (저장된 기록을 새 기록으로 덮어쓰지 않도록)
+    state_store = get_session_store()
+    state_saving = state_store is not None
+    state_turns = 0
+    restore_started_at = time.time()
+    restore_task: asyncio.Task = None
+    if state_store:
+        restore_task = asyncio.create_task(state_store.load(ctx.room.name, participant.identity))
+
+    capture: CaptureWriter = None
+    if CAPTURE_ENABLED:
+        os.makedirs(CAPTURE_DIR, exist_ok=True)
+        capture_path = os.path.join(CAPTURE_DIR, capture_filename(ctx.room.name, participant.identity, time.time()))
+        capture = CaptureWriter(
+            capture_path,
+            metadata={"room": ctx.room.name, "participant": participant.identity, "track_sid": track.sid},
+            max_queue=CAPTURE_MAX_QUEUE,
+        )
+        logger.info(f"Capturing session to {capture_path}")
+
+    def capture_time(ts: float) -> float:
+        """time.time() 시각 → 캡처 기준 시각"""
+        return capture.now() - (time.time() - ts)
+
+    def resource_stats() -> dict:
+        """세션 자원 사용량 (레지스트리 보고용)"""
+        buffered = speech_frames + turn_detector.get_prefix_frames()
+        return {
+            "live_tasks": 1 if turn_end_task and not turn_end_task.done() else 0,
+            "buffered_samples": sum(len(f.data) // 2 for f in buffered),
+            "history_messages": len(conversation_history),
+            "history_bytes": sum(len(m["content"].encode("utf-8")) for m in conversation_history),
+        }
+
+    if session:
+        session.resource_stats = resource_stats
+
+    def apply_restored_state():
+        """복원 조회가 끝났으면 저장된 기록을 현재 기록 앞에 반영 (한 번만)"""
+        nonlocal conversation_history, restore_task, state_turns, state_saving
+        if not restore_task or not restore_task.done():
+            return
+        task, restore_task = restore_task, None
+        if task.cancelled() or task.exception():
+            state_saving = False
+            logger.warning(
+                f"Failed to restore conversation state for {participant.identity}, not saving this session: "
+                f"{'cancelled' if task.cancelled() else task.exception()}"
+            )
+            return
+        state = task.result()
+        if state is None:
+            return
+        try:
+            restored = state.history
+            state_turns += state.turns
+        except Exception as e:
+            logger.warning(f"Failed to decode conversation state for {participant.identity}: {e}")
+            return
+        conversation_history = (restored + conversation_history)[-20:]
+        log_metric(
+            "session_restored",
+            (time.time() - restore_started_at) * 1000,
+            participant=participant.identity,
+            messages=len(restored),
+            turns=state.turns,
+            bytes=len(state.raw),
+            age_sec=round(time.time() - state.updated_at, 1)
+        )
 
-    async def send_data(data: dict):
-        """클라이언트에게 데이터 전송"""
+    async def publish(payload: bytes, topic: str = None):
+        """클라이언트에게 바이트 전송"""
         try:
-            payload = json.dumps(data).encode('utf-8')
-            await ctx.room.local_participant.publish_data(payload, reliable=True)
+            if topic:
+                await ctx.room.local_participant.publish_data(payload, reliable=True, topic=topic)
+            else:
+                await ctx.room.local_participant.publish_data(payload, reliable=True)
         except Exception as e:
             logger.error(f"Failed to send data: {e}")
 
-    async def process_turn(frames: list):
+    async def send_data(data: dict):
+        """클라이언트에게 데이터 전송"""
+        await publish(json.dumps(data).encode('utf-8'))
+
+    async def process_turn(frames: list, turn_id: int):
         """턴 처리 - STT → LLM → TTS"""
-        nonlocal conversation_history
+        nonlocal conversation_history, state_turns
 
         async with processing_lock:
             # 전체 파이프라인 시작
@@ -423,47 +1114,156 @@ async def handle_conversation(
                 return
 
             logger.info(f"[{participant.identity}] User: {user_text}")
+            stt_done_at = time.time()
+
+            # 응답 음성이 늦으면 필러 재생 (응답 준비 시 중단)
+            first_audio_at = {}
+            filler_stop = asyncio.Event()
+            filler_task = None
+            filler_bank = get_filler_bank()
+            if filler_bank and filler_bank.ready:
+                filler_task = asyncio.create_task(
+                    play_filler(filler_bank, filler_stop, first_audio_at)
+                )
 
-            # 사용자 발화 텍스트 전송
-            await send_data({"type": "transcription", "text": user_text})
-
-            # 2. LLM: 응답 생성
-            turn_detector.is_agent_speaking = True
-            ai_response, llm_duration = await get_llm_response(user_text, conversation_history)
-            logger.info(f"[{participant.identity}] AI: {ai_response}")
-
-            # AI 응답 텍스트 전송
-            await send_data({"type": "response", "text": ai_response})
-
-            # 대화 기록 업데이트
-            conversation_history.append({"role": "user", "content": user_text})
-            conversation_history.append({"role": "assistant", "content": ai_response})
-
-            # 최근 10개 대화만 유지
-            if len(conversation_history) > 20:
-                conversation_history = conversation_history[-20:]
-
-            # 3. TTS: 텍스트 → 음성
-            audio_data, tts_duration = await text_to_speech(ai_response)
+            try:
+                # 사용자 발화 텍스트 전송
+                await send_data({"type": "transcription", "text": user_text})
+
+                # 재입장 첫 턴이면 저장된 대화 기록 복원 대기 (제한 시간 초과 시 다음 턴에 반영)
+                state_start = time.time()
+                if restore_task and not restore_task.done():
+                    await asyncio.wait({restore_task}, timeout=SESSION_STATE_RESTORE_WAIT_MS / 1000)
+                apply_restored_state()
+                state_ms = (time.time() - state_start) * 1000
+
+                # 2. LLM: 응답 생성 (조각 단위로 클라이언트에 전송)
+                turn_detector.is_agent_speaking = True
+                streamer = None
+                if RESPONSE_STREAM_ENABLED:
+                    streamer = ResponseStreamer(
+                        publish,
+                        turn_id,
+                        identity=participant.identity,
+                        max_chars=RESPONSE_STREAM_MAX_CHARS,
+                        max_delay_ms=RESPONSE_STREAM_MAX_DELAY_MS,
+                        binary=RESPONSE_STREAM_BINARY,
+                    )
+                ai_response, llm_duration = await get_llm_response(
+                    user_text,
+                    conversation_history,
+                    on_delta=streamer.push if streamer else None,
+                    policy=generation_policy,
+                    prewarmer=prewarmer,
+                )
+                logger.info(f"[{participant.identity}] AI: {ai_response}")
+
+                # AI 응답 텍스트 전송 (스트리밍 시 전체 텍스트로 마무리)
+                if streamer:
+                    await streamer.done(ai_response)
+                    log_metric(
+                        "response_stream",
+                        streamer.first_text_ms(),
+                        participant=participant.identity,
+                        messages=streamer.messages,
+                        bytes=streamer.bytes,
+                        binary=RESPONSE_STREAM_BINARY,
+                        text_length=len(ai_response)
+                    )
+                else:
+                    await send_data({"type": "response", "text": ai_response})
+
+                # 대화 기록 업데이트 (빈 응답은 기록하지 않음)
+                if ai_response.strip():
+                    conversation_history.append({"role": "user", "content": user_text})
+                    conversation_history.append({"role": "assistant", "content": ai_response})
+
+                # 최근 10개 대화만 유지
+                if len(conversation_history) > 20:
+                    conversation_history = conversation_history[-20:]
+
+                # 대화 상태 저장 예약 (기록은 백그라운드에서 모아서, 복원이 끝난 뒤에만)
+                state_turns += 1
+                if state_saving and restore_task is None:
+                    state_start = time.time()
+                    state_store.save(ctx.room.name, participant.identity, conversation_history, state_turns)
+                    state_ms += (time.time() - state_start) * 1000
+
+                # 3. TTS: 텍스트 → 음성
+                audio_data, tts_duration = await text_to_speech(ai_response)
+                pcm_data = await decode_audio(audio_data) if audio_data else None
+                response_ready_at = time.time()
+
+                # 필러 종료 대기 (재생 중이면 페이드아웃 후 응답으로 전환)
+                filler_stop.set()
+                filler_played = False
+                if filler_task:
+                    filler_played = await filler_task
+
+                # 전체 파이프라인 메트릭
+                pipeline_duration = (time.time() - pipeline_start) * 1000
+                log_metric(
+                    "pipeline_complete",
+                    pipeline_duration,
+                    participant=participant.identity,
+                    stt_ms=round(stt_duration, 2),
+                    llm_ms=round(llm_duration, 2),
+                    tts_ms=round(tts_duration, 2),
+                    state_ms=round(state_ms, 3),
+                    speech_duration_ms=round(turn_detector.get_speech_duration_ms(), 2)
+                )
+                if capture:
+                    capture.timings(
+                        turn_id,
+                        text=user_text,
+                        stt_ms=round(stt_duration, 2),
+                        llm_ms=round(llm_duration, 2),
+                        tts_ms=round(tts_duration, 2),
+                        pipeline_ms=round(pipeline_duration, 2),
+                    )
+
+                if pcm_data is not None:
+                    def mark_response_audio():
+                        first_audio_at["response"] = time.time()
+                        first_audio_at.setdefault("perceived", first_audio_at["response"])
+
+                    await play_pcm(audio_source, pcm_data, on_first_frame=mark_response_audio)
+
+                # 실제/체감 첫 음성 지연 (STT 완료 기준)
+                if "response" in first_audio_at:
+                    log_metric(
+                        "first_audio",
+                        (first_audio_at["response"] - stt_done_at) * 1000,
+                        participant=participant.identity,
+                        perceived_ms=round((first_audio_at["perceived"] - stt_done_at) * 1000, 2),
+                        response_ready_ms=round((response_ready_at - stt_done_at) * 1000, 2),
+                        filler_played=filler_played
+                    )
+
+                turn_detector.is_agent_speaking = False
+            finally:
+                # 취소/오류 시에도 필러 중단
+                filler_stop.set()
+
+    async def play_filler(bank: FillerBank, stop: asyncio.Event, first_audio_at: dict) -> bool:
+        """데드라인까지 응답이 없으면 필러 재생, 재생 여부 반환"""
+        try:
+            await asyncio.wait_for(stop.wait(), FILLER_DEADLINE_MS / 1000)
+            return False
+        except asyncio.TimeoutError:
+            pass
 
-            # 전체 파이프라인 메트릭
-            pipeline_duration = (time.time() - pipeline_start) * 1000
-            log_metric(
-                "pipeline_complete",
-                pipeline_duration,
-                participant=participant.identity,
-                stt_ms=round(stt_duration, 2),
-                llm_ms=round(llm_duration, 2),
-                tts_ms=round(tts_duration, 2),
-                speech_duration_ms=round(turn_detector.get_speech_duration_ms(), 2)
-            )
+        clip = bank.pick()
+        if clip is None:
+            return False
 
-            if audio_data:
-                await play_audio(audio_source, audio_data)
+        def mark_filler_audio():
+            first_audio_at.setdefault("perceived", time.time())
 
-            turn_detector.is_agent_speaking = False
+        await play_pcm(audio_source, clip, stop_event=stop, on_first_frame=mark_filler_audio)
+        return True
 
-    async def delayed_turn_processing(frames: list):
+    async def delayed_turn_processing(frames: list, turn_id: int):
         """침묵 시간 후 턴 처리"""
         try:
             # 침묵 대기
@@ -472,18 +1272,21 @@ async def handle_conversation(
             # 대기 후에도 말하고 있지 않으면 턴 처리
             if not turn_detector.is_speaking:
                 logger.info(f"Turn: Processing after {TURN_DETECTION_SILENCE_MS}ms silence")
-                await process_turn(frames)
+                await process_turn(frames, turn_id)
         except asyncio.CancelledError:
             logger.debug("Turn: Delayed processing cancelled (user continued speaking)")
 
     async def process_audio():
         """오디오 스트림 처리"""
-        nonlocal speech_frames
-        frame_count = 0
+        nonlocal speech_frames, audio_frame_count
 
         async for event in audio_stream:
             frame = event.frame
-            frame_count += 1
+            audio_frame_count += 1
+            frame_count = audio_frame_count
+
+            if capture:
+                capture.audio(frame_count, frame)
 
             # 첫 프레임과 100프레임마다 로그
             if frame_count == 1 or frame_count % 100 == 0:
@@ -500,7 +1303,7 @@ async def handle_conversation(
 
     async def process_vad():
         """VAD 이벤트 처리 (Turn Detection)"""
-        nonlocal speech_frames, turn_end_task
+        nonlocal speech_frames, turn_end_task, turn_count
 
         logger.info("VAD stream processing started")
         event_count = 0
@@ -510,6 +1313,18 @@ async def handle_conversation(
             logger.debug(f"VAD event {event_count}: type={event.type}")
             if event.type == agents_vad.VADEventType.START_OF_SPEECH:
                 turn_detector.start_speech()
+                if capture:
+                    capture.vad(VAD_START)
+
+                # 응답 합성용 TTS 연결 미리 준비
+                tts_manager = get_tts_manager()
+                if tts_manager:
+                    tts_manager.warm(TTS_VOICE)
+
+                # 사용자가 말하는 동안 LLM 모델 적재 + 대화 접두부 미리 평가
+                apply_restored_state()
+                if prewarmer:
+                    prewarmer.trigger(build_messages(conversation_history))
 
                 # prefix 프레임 추가
                 prefix_frames = turn_detector.get_prefix_frames()
@@ -527,12 +1342,28 @@ async def handle_conversation(
 
             elif event.type == agents_vad.VADEventType.END_OF_SPEECH:
                 turn_detector.end_speech()
+                if capture:
+                    capture.vad(VAD_END)
 
                 if not speech_frames:
                     continue
 
                 # 최소 발화 길이 체크
-                if not turn_detector.should_process_turn():
+                should_process = turn_detector.should_process_turn()
+
+                # 턴 경계 기록 (prefix + 발화 프레임은 마지막 입력 프레임까지 연속 구간)
+                turn_count += 1
+                if capture:
+                    capture.turn(
+                        turn_count,
+                        first_seq=audio_frame_count - len(speech_frames) + 1,
+                        last_seq=audio_frame_count,
+                        speech_start=capture_time(turn_detector.speech_start_time),
+                        speech_end=capture_time(turn_detector.speech_end_time),
+                        scheduled=should_process,
+                    )
+
+                if not should_process:
                     speech_frames = []
                     continue
 
@@ -541,7 +1372,7 @@ async def handle_conversation(
 
                 # 침묵 후 턴 처리 예약 (바로 처리하지 않음)
                 turn_end_task = asyncio.create_task(
-                    delayed_turn_processing(frames_to_process)
+                    delayed_turn_processing(frames_to_process, turn_count)
                 )
 
     try:
@@ -552,54 +1383,131 @@ async def handle_conversation(
         )
     except Exception as e:
         logger.error(f"Error in handle_conversation: {e}", exc_info=True)
+    finally:
+        # 진행 중인 턴 취소 및 스트림/버퍼 해제
+        if prewarmer:
+            prewarmer.cancel()
+        if restore_task:
+            restore_task.cancel()
+            await asyncio.gather(restore_task, return_exceptions=True)
+        if turn_end_task and not turn_end_task.done():
+            turn_end_task.cancel()
+            await asyncio.gather(turn_end_task, return_exceptions=True)
+        for stream in (vad_stream, audio_stream):
+            try:
+                await stream.aclose()
+            except Exception as e:
+                logger.debug(f"Failed to close stream: {e}")
+        speech_frames = []
+        turn_detector.prefix_buffer = []
+        conversation_history = []
+        if capture:
+            try:
+                await asyncio.get_event_loop().run_in_executor(None, capture.close)
+            except Exception as e:
+                logger.warning(f"Session capture incomplete for {participant.identity}: {e}")
+        logger.info(f"Conversation closed for {participant.identity}")
 
 
-async def play_audio(audio_source: rtc.AudioSource, audio_data: bytes):
-    """MP3 오디오를 LiveKit으로 스트리밍"""
-    try:
-        # edge-tts는 MP3를 출력하므로 변환 필요
-        # 간단한 구현을 위해 pydub 사용 (추후 개선 가능)
-        from pydub import AudioSegment
+def _decode_mp3(audio_data: bytes) -> np.ndarray:
+    # edge-tts는 MP3를 출력하므로 변환 필요
+    # 간단한 구현을 위해 pydub 사용 (추후 개선 가능)
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_mp3(io.BytesIO(audio_data))
+    audio = audio.set_frame_rate(OUTPUT_SAMPLE_RATE).set_channels(1)
 
-        audio = AudioSegment.from_mp3(io.BytesIO(audio_data))
-        audio = audio.set_frame_rate(24000).set_channels(1)
+    # PCM 데이터로 변환
+    return np.array(audio.get_array_of_samples(), dtype=np.int16)
 
-        # PCM 데이터로 변환
-        pcm_data = np.array(audio.get_array_of_samples(), dtype=np.int16)
 
+async def decode_audio(audio_data: bytes) -> np.ndarray:
+    """MP3 → 24kHz mono PCM (이벤트 루프 밖에서 디코딩), 실패 시 None"""
+    try:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _decode_mp3, audio_data)
+    except ImportError:
+        logger.error("pydub not installed. Run: pip install pydub")
+    except Exception as e:
+        logger.error(f"Audio decode error: {e}")
+    return None
+
+
+async def play_pcm(
+    audio_source: rtc.AudioSource,
+    pcm_data: np.ndarray,
+    stop_event: asyncio.Event = None,
+    on_first_frame=None,
+):
+    """PCM 오디오를 LiveKit으로 스트리밍 (stop_event 설정 시 페이드아웃 후 중단)"""
+    try:
         # 프레임 단위로 전송 (20ms = 480 samples at 24kHz)
-        frame_size = 480
+        frame_size = OUTPUT_FRAME_SIZE
         for i in range(0, len(pcm_data), frame_size):
             chunk = pcm_data[i:i + frame_size]
             if len(chunk) < frame_size:
                 chunk = np.pad(chunk, (0, frame_size - len(chunk)))
 
-            frame = rtc.AudioFrame.create(24000, 1, frame_size)
+            stopping = stop_event is not None and stop_event.is_set()
+            if stopping:
+                chunk = fade_out(chunk)
+
+            frame = rtc.AudioFrame.create(OUTPUT_SAMPLE_RATE, 1, frame_size)
             frame_data = np.frombuffer(frame.data, dtype=np.int16)
             np.copyto(frame_data, chunk)
 
             await audio_source.capture_frame(frame)
+            if on_first_frame and i == 0:
+                on_first_frame()
             await asyncio.sleep(0.02)  # 20ms
 
-    except ImportError:
-        logger.error("pydub not installed. Run: pip install pydub")
+            if stopping:
+                break
+
     except Exception as e:
         logger.error(f"Audio playback error: {e}")
 
 
+async def play_audio(audio_source: rtc.AudioSource, audio_data: bytes):
+    """MP3 오디오를 LiveKit으로 스트리밍"""
+    pcm_data = await decode_audio(audio_data)
+    if pcm_data is not None:
+        await play_pcm(audio_source, pcm_data)
+
+
 def prewarm(proc: JobProcess):
     """사전 준비"""
     logger.info("Prewarming Voice Agent...")
-    get_whisper_model()
+    start_time = time.time()
+    rss_before_mb = get_rss_mb()
+    if not get_stt_client():
+        get_whisper_model()
     get_llm_provider()
-    silero.VAD.load()
+    if VAD_BATCHING:
+        if not get_remote_vad():
+            get_batched_vad()
+    else:
+        silero.VAD.load()
+    log_metric(
+        "prewarm_complete",
+        (time.time() - start_time) * 1000,
+        stt_mode="server" if get_stt_client() else "local",
+        rss_before_mb=round(rss_before_mb, 1),
+        rss_after_mb=round(get_rss_mb(), 1)
+    )
     logger.info("Voice Agent prewarmed")
 
 
 if __name__ == "__main__":
+    # Job 프로세스 초기화 시간 제한을 피해 Worker 메인 프로세스에서 한 번 보정
+    if len(sys.argv) > 1 and sys.argv[1] in ("start", "dev"):
+        calibrate_whisper()
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
             prewarm_fnc=prewarm,
+            request_fnc=request_job,
+            load_fnc=compute_worker_load,
+            load_threshold=WORKER_LOAD_THRESHOLD,
         )
     )
@@ -0,0 +1,12 @@
+from .keys import normalize_utterance, make_key
+from .tiered import MemoryLRU, RedisTier, TieredCache
+from .provider import CachedProvider
+
+__all__ = [
+    "normalize_utterance",
+    "make_key",
+    "MemoryLRU",
+    "RedisTier",
+    "TieredCache",
+    "CachedProvider",
+]
@@ -0,0 +1,26 @@
+import hashlib
+import json
+import unicodedata
+
+
+def normalize_utterance(text: str) -> str:
+    """캐시 키용 발화 정규화
+
+    - NFKC: 전각 문자/호환 자모 정리, 한글 음절 조합 형태 통일
+    - 소문자화, 문장부호/기호 제거
+    - 공백 제거: STT 결과의 한국어 띄어쓰기가 일정하지 않음 ("말해 줄래" / "말해줄래")
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(
+        " " if unicodedata.category(ch).startswith(("P", "S")) else ch
+        for ch in text
+    )
+    return "".join(text.split())
+
+
+def make_key(namespace: str, *parts) -> str:
+    """구성 요소를 해시해 고정 길이 키 생성"""
+    digest = hashlib.sha256(
+        json.dumps(parts, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    return f"voice-agent:{namespace}:{digest}"
@@ -0,0 +1,120 @@
+import contextlib
+import hashlib
+import logging
+from typing import AsyncIterator, List, Optional
+
+from llm.base import LLMProvider, ChatMessage, ChatCompletionResponse
+
+from .keys import make_key, normalize_utterance
+from .tiered import TieredCache
+
+logger = logging.getLogger("voice-agent.cache.provider")
+
+
+def is_truncated(usage: Optional[dict], finish_reason: Optional[str], max_tokens: Optional[int]) -> bool:
+    """max_tokens에서 잘린 응답 여부 (키에 max_tokens가 없으므로 예산이 다른 요청에 재사용하면 안 됨)"""
+    if finish_reason == "length":
+        return True
+    completion_tokens = (usage or {}).get("completion_tokens")
+    return bool(max_tokens and completion_tokens and completion_tokens >= max_tokens)
+
+
+class CachedProvider(LLMProvider):
+    """LLMProvider 래퍼 - 동일 질문(정규화 기준) + 동일 문맥이면 저장된 응답 반환
+
+    키 구성: 모델, 시스템 프롬프트 해시, 직전 context_messages개 메시지 해시, 정규화된 사용자 발화
+    (max_tokens는 대화마다 적응적으로 바뀌어 키에서 제외하고, 대신 max_tokens에서 잘린 응답은 저장하지 않음)
+    """
+
+    def __init__(self, provider: LLMProvider, cache: TieredCache, context_messages: int = 2):
+        self.provider = provider
+        self.cache = cache
+        self.context_messages = context_messages
+
+    def cache_key(self, messages: List[ChatMessage]) -> Optional[str]:
+        if not messages or messages[-1].role != "user":
+            return None
+        utterance = normalize_utterance(messages[-1].content)
+        if not utterance:
+            return None
+
+        system = "\n".join(m.content for m in messages if m.role == "system")
+        history = [m for m in messages[:-1] if m.role != "system"]
+        context = history[-self.context_messages:] if self.context_messages > 0 else []
+        context_hash = hashlib.sha256(
+            "\n".join(f"{m.role}:{normalize_utterance(m.content)}" for m in context).encode("utf-8")
+        ).hexdigest()
+
+        return make_key(
+            "llm",
+            self.provider.get_provider_type(),
+            self.provider.get_model_name(),
+            hashlib.sha256(system.encode("utf-8")).hexdigest(),
+            context_hash,
+            utterance,
+        )
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        key = self.cache_key(messages)
+        if key:
+            cached, _ = await self.cache.get(key)
+            if cached is not None:
+                return ChatCompletionResponse(content=cached.decode("utf-8"), model=self.get_model_name())
+
+        response = await self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
+        if key and response.content and not is_truncated(response.usage, None, max_tokens):
+            await self.cache.set(key, response.content.encode("utf-8"))
+        return response
+
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        """스트리밍 채팅 - 적중 시 저장된 응답을 한 번에 반환, 끝까지 받은 응답만 저장 (max_tokens에서 잘리면 제외)"""
+        stats = stats if stats is not None else {}
+        key = self.cache_key(messages)
+        if not key:
+            stats["cache"] = "bypass"
+            stream = self.provider.chat_stream(messages, temperature=temperature, max_tokens=max_tokens, stats=stats)
+            async with contextlib.aclosing(stream):
+                async for chunk in stream:
+                    yield chunk
+            return
+
+        cached, result = await self.cache.get(key)
+        stats["cache"] = result
+        if cached is not None:
+            yield cached.decode("utf-8")
+            return
+
+        parts = []
+        # 소비자가 중간에 닫으면 내부 스트림도 즉시 닫고 저장하지 않음
+        stream = self.provider.chat_stream(messages, temperature=temperature, max_tokens=max_tokens, stats=stats)
+        async with contextlib.aclosing(stream):
+            async for chunk in stream:
+                parts.append(chunk)
+                yield chunk
+
+        content = "".join(parts)
+        if content.strip() and not is_truncated(stats.get("usage"), stats.get("finish_reason"), max_tokens):
+            await self.cache.set(key, content.encode("utf-8"))
+
+    def supports_prewarm(self) -> bool:
+        return self.provider.supports_prewarm()
+
+    async def prewarm(self, messages: List[ChatMessage]) -> bool:
+        return await self.provider.prewarm(messages)
+
+    def get_model_name(self) -> str:
+        return self.provider.get_model_name()
+
+    def get_provider_type(self) -> str:
+        return self.provider.get_provider_type()
@@ -0,0 +1,123 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from transport.backoff import Backoff
+
+logger = logging.getLogger("voice-agent.cache")
+
+
+class MemoryLRU:
+    """프로세스 내 LRU 캐시 (TTL + 항목 수/바이트 상한)"""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 8 * 1024 * 1024, ttl_sec: float = 3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self.bytes = 0
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes):
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_sec, value)
+        self.bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self.bytes -= len(key) + len(value)
+
+
+class RedisTier:
+    """Redis 호환 공유 캐시 계층 (오류 시 일정 시간 비활성화)"""
+
+    def __init__(self, url: str, ttl_sec: float = 3600.0, timeout_sec: float = 0.2, retry_after_sec: float = 30.0):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, socket_timeout=timeout_sec, socket_connect_timeout=timeout_sec)
+        self.ttl_sec = ttl_sec
+        self.backoff = Backoff("Shared cache", "disabling", retry_after_sec, logger)
+
+    def available(self) -> bool:
+        return self.backoff.available()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.available():
+            return None
+        try:
+            return await self.client.get(key)
+        except Exception as e:
+            self.backoff.fail(e)
+            return None
+
+    async def set(self, key: str, value: bytes):
+        if not self.available():
+            return
+        try:
+            await self.client.set(key, value, ex=int(self.ttl_sec))
+        except Exception as e:
+            self.backoff.fail(e)
+
+
+class TieredCache:
+    """메모리 LRU + 선택적 공유 계층"""
+
+    def __init__(self, memory: MemoryLRU, shared: Optional[RedisTier] = None):
+        self.memory = memory
+        self.shared = shared
+        self.hits_memory = 0
+        self.hits_shared = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> tuple[Optional[bytes], str]:
+        """(값, 결과) 반환 - 결과: hit_memory / hit_shared / miss"""
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits_memory += 1
+            return value, "hit_memory"
+
+        if self.shared:
+            value = await self.shared.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                self.hits_shared += 1
+                return value, "hit_shared"
+
+        self.misses += 1
+        return None, "miss"
+
+    async def set(self, key: str, value: bytes):
+        self.memory.set(key, value)
+        if self.shared:
+            await self.shared.set(key, value)
+
+    def hit_rate(self) -> float:
+        total = self.hits_memory + self.hits_shared + self.misses
+        return (self.hits_memory + self.hits_shared) / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "cache_hit_rate": round(self.hit_rate(), 3),
+            "cache_entries": len(self.memory),
+            "cache_bytes": self.memory.bytes,
+        }
@@ -0,0 +1,17 @@
+from .format import (
+    CaptureWriter,
+    CaptureReader,
+    CapturedFrame,
+    capture_filename,
+    VAD_START,
+    VAD_END,
+)
+
+__all__ = [
+    "CaptureWriter",
+    "CaptureReader",
+    "CapturedFrame",
+    "capture_filename",
+    "VAD_START",
+    "VAD_END",
+]
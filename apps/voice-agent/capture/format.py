@@ -0,0 +1,322 @@
+"""
+세션 캡처 파일 포맷 (append-only, 청크 단위 기록)
+
+파일 구조:
+    [헤더] MAGIC(8) + meta_len(u32) + 메타데이터 JSON
+    [레코드]* type(u8) flags(u8) reserved(u16) seq(u32) ts(f64) length(u32) + payload
+
+레코드 종류:
+    AUDIO   seq = 입력 프레임 번호, payload = sample_rate(u32) channels(u16) samples_per_channel(u32) + int16 PCM
+    VAD     seq = 0(START) / 1(END)
+    TURN    seq = 턴 번호, payload = JSON (프레임 범위, 발화 시작/종료 시각)
+    TIMING  seq = 턴 번호, payload = JSON (단계별 시간)
+    GAP     seq = 버퍼 초과로 버린 레코드 수
+
+인덱스 사이드카(<파일>.idx): 턴마다 turn_id(u32) first_seq(u32) last_seq(u32) pad(u32) start(u64) end(u64)
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+logger = logging.getLogger("voice-agent.capture")
+
+MAGIC = b"VACAP\x00\x01\x00"
+_META_LEN = struct.Struct("<I")
+_RECORD = struct.Struct("<BBHIdI")
+_AUDIO = struct.Struct("<IHI")
+_INDEX = struct.Struct("<IIIIQQ")
+
+RECORD_AUDIO = 1
+RECORD_VAD = 2
+RECORD_TURN = 3
+RECORD_TIMING = 4
+RECORD_GAP = 5
+
+VAD_START = 0
+VAD_END = 1
+
+
+def _safe_component(value: str, max_len: int = 48) -> str:
+    """파일명 구성 요소 정리 (경로 구분자/특수 문자 치환, 바뀐 경우 원본 해시를 붙여 충돌 방지)"""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", value)[:max_len] or "_"
+    if safe != value:
+        safe += "-" + hashlib.sha1(value.encode("utf-8")).hexdigest()[:8]
+    return safe
+
+
+def capture_filename(room: str, identity: str, started_at: float) -> str:
+    """캡처 파일명 (방/참가자 이름은 클라이언트가 정하므로 디렉터리 밖을 가리키지 않도록 정리)"""
+    return f"{_safe_component(room)}-{_safe_component(identity)}-{int(started_at)}.vacap"
+
+
+@dataclass
+class CapturedFrame:
+    """transcribe_audio에 그대로 넣을 수 있는 프레임"""
+    data: bytes
+    sample_rate: int
+    num_channels: int
+    samples_per_channel: int
+
+
+@dataclass
+class Record:
+    type: int
+    seq: int
+    ts: float
+    offset: int
+    payload: bytes
+
+
+@dataclass
+class TurnIndexEntry:
+    turn_id: int
+    first_seq: int
+    last_seq: int
+    start_offset: int
+    end_offset: int
+
+
+class CaptureWriter:
+    """세션 캡처 기록기 - 이벤트 루프에서는 큐에 넣기만 하고 기록은 전용 스레드에서 수행"""
+
+    def __init__(
+        self,
+        path: str,
+        metadata: Optional[dict] = None,
+        max_queue: int = 2000,
+        chunk_bytes: int = 64 * 1024,
+    ):
+        self.path = path
+        self.metadata = metadata or {}
+        self.chunk_bytes = chunk_bytes
+        self.dropped = 0
+        self.error: Optional[Exception] = None  # 기록 스레드 오류 (close에서 다시 발생)
+        self._pending_gap = 0
+        self._abort = threading.Event()
+        self._started_at = time.monotonic()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        # 마지막 턴 이후 AUDIO 레코드 seq/위치 (턴 시작 오프셋 계산용, 턴 길이 제한 없이 턴마다 비움)
+        self._audio_seqs: list[int] = []
+        self._audio_offsets: list[int] = []
+        self._thread = threading.Thread(target=self._run, name="session-capture", daemon=True)
+        self._thread.start()
+
+    def now(self) -> float:
+        """캡처 기준 상대 시각 (초)"""
+        return time.monotonic() - self._started_at
+
+    def _put(self, item: tuple):
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            if self._pending_gap:
+                self._queue.put_nowait((RECORD_GAP, self._pending_gap, self.now(), b""))
+                self._pending_gap = 0
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            self._pending_gap += 1
+
+    def audio(self, seq: int, frame):
+        self._put((
+            RECORD_AUDIO,
+            seq,
+            self.now(),
+            _AUDIO.pack(frame.sample_rate, frame.num_channels, frame.samples_per_channel) + bytes(frame.data),
+        ))
+
+    def vad(self, event: int):
+        self._put((RECORD_VAD, event, self.now(), b""))
+
+    def turn(self, turn_id: int, first_seq: int, last_seq: int, **info):
+        payload = {"first_seq": first_seq, "last_seq": last_seq, **info}
+        self._put((RECORD_TURN, turn_id, self.now(), json.dumps(payload).encode("utf-8")))
+
+    def timings(self, turn_id: int, **timings):
+        self._put((RECORD_TIMING, turn_id, self.now(), json.dumps(timings).encode("utf-8")))
+
+    def close(self, timeout_sec: float = 5.0):
+        """남은 레코드 기록 후 종료 (블로킹 - executor에서 호출), 기록 스레드 오류는 다시 발생"""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout_sec)
+            except queue.Full:
+                # 기록이 멈춰 큐가 비지 않음 - 남은 레코드는 버리고 종료
+                logger.warning(f"Capture {self.path}: writer not draining, closing without remaining records")
+                self._abort.set()
+            self._thread.join(timeout_sec)
+            if self._thread.is_alive():
+                logger.warning(f"Capture {self.path}: writer thread did not finish within {timeout_sec:.0f}s")
+        if self.dropped:
+            logger.warning(f"Capture {self.path}: dropped {self.dropped} records")
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        try:
+            self._write_records()
+        except Exception as e:
+            self.error = e
+            logger.error(f"Capture {self.path}: writer failed: {e}", exc_info=True)
+
+    def _write_records(self):
+        meta = json.dumps({"started_at": time.time(), **self.metadata}).encode("utf-8")
+        with open(self.path, "wb") as f, open(self.path + ".idx", "wb") as index:
+            f.write(MAGIC + _META_LEN.pack(len(meta)) + meta)
+            offset = f.tell()
+            chunk = bytearray()
+
+            while True:
+                item = self._queue.get()
+                if item is None or self._abort.is_set():
+                    break
+                record_type, seq, ts, payload = item
+                record_offset = offset + len(chunk)
+                chunk += _RECORD.pack(record_type, 0, 0, seq, ts, len(payload)) + payload
+
+                if record_type == RECORD_AUDIO:
+                    self._audio_seqs.append(seq)
+                    self._audio_offsets.append(record_offset)
+                elif record_type == RECORD_TURN:
+                    info = json.loads(payload)
+                    start_offset = self._find_audio_offset(info["first_seq"], record_offset)
+                    self._drop_audio_offsets(info["last_seq"])
+                    index.write(_INDEX.pack(
+                        seq, info["first_seq"], info["last_seq"], 0,
+                        start_offset, offset + len(chunk),
+                    ))
+
+                # 청크 단위로 기록 (턴 경계에서는 즉시 기록해 인덱스와 일치시킴)
+                if len(chunk) >= self.chunk_bytes or record_type == RECORD_TURN:
+                    f.write(chunk)
+                    offset += len(chunk)
+                    chunk = bytearray()
+                    if record_type == RECORD_TURN:
+                        f.flush()
+                        index.flush()
+
+            f.write(chunk)
+
+    def _find_audio_offset(self, seq: int, default: int) -> int:
+        i = bisect_left(self._audio_seqs, seq)
+        return self._audio_offsets[i] if i < len(self._audio_seqs) else default
+
+    def _drop_audio_offsets(self, last_seq: int):
+        """기록한 턴까지의 위치 제거 (다음 턴은 last_seq 이후 프레임부터 시작)"""
+        end = bisect_right(self._audio_seqs, last_seq)
+        del self._audio_seqs[:end]
+        del self._audio_offsets[:end]
+
+
+class CaptureReader:
+    """mmap 기반 캡처 리더 (턴 단위 임의 접근)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a session capture file: {path}")
+        (meta_len,) = _META_LEN.unpack_from(self._mmap, len(MAGIC))
+        meta_start = len(MAGIC) + _META_LEN.size
+        self.metadata = json.loads(self._mmap[meta_start:meta_start + meta_len])
+        self.data_offset = meta_start + meta_len
+        self.index = self._load_index()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def records(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Record]:
+        offset = self.data_offset if start is None else start
+        end = len(self._mmap) if end is None else min(end, len(self._mmap))
+        while offset + _RECORD.size <= end:
+            record_type, _, _, seq, ts, length = _RECORD.unpack_from(self._mmap, offset)
+            payload_start = offset + _RECORD.size
+            if payload_start + length > len(self._mmap):
+                break  # 기록 중단으로 잘린 마지막 레코드
+            yield Record(record_type, seq, ts, offset, self._mmap[payload_start:payload_start + length])
+            offset = payload_start + length
+
+    def _load_index(self) -> dict[int, TurnIndexEntry]:
+        index = {}
+        index_path = self.path + ".idx"
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                raw = f.read()
+            for i in range(len(raw) // _INDEX.size):
+                turn_id, first_seq, last_seq, _, start, end = _INDEX.unpack_from(raw, i * _INDEX.size)
+                index[turn_id] = TurnIndexEntry(turn_id, first_seq, last_seq, start, end)
+            return index
+
+        # 인덱스가 없으면 전체 스캔으로 재구성
+        audio_offsets = {}
+        for record in self.records():
+            if record.type == RECORD_AUDIO:
+                audio_offsets[record.seq] = record.offset
+            elif record.type == RECORD_TURN:
+                info = json.loads(record.payload)
+                start = audio_offsets.get(info["first_seq"], record.offset)
+                end = record.offset + _RECORD.size + len(record.payload)
+                index[record.seq] = TurnIndexEntry(record.seq, info["first_seq"], info["last_seq"], start, end)
+        return index
+
+    def turns(self) -> list[TurnIndexEntry]:
+        return [self.index[k] for k in sorted(self.index)]
+
+    def turn_records(self, turn_id: int) -> list[Record]:
+        entry = self.index[turn_id]
+        return list(self.records(entry.start_offset, entry.end_offset))
+
+    def turn_info(self, turn_id: int) -> dict:
+        for record in self.turn_records(turn_id):
+            if record.type == RECORD_TURN and record.seq == turn_id:
+                return json.loads(record.payload)
+        return {}
+
+    def turn_frames(self, turn_id: int) -> list[CapturedFrame]:
+        """턴에 사용된 입력 프레임 (first_seq ~ last_seq)"""
+        entry = self.index[turn_id]
+        frames = []
+        for record in self.records(entry.start_offset, entry.end_offset):
+            if record.type != RECORD_AUDIO or not (entry.first_seq <= record.seq <= entry.last_seq):
+                continue
+            sample_rate, channels, samples = _AUDIO.unpack_from(record.payload, 0)
+            frames.append(CapturedFrame(record.payload[_AUDIO.size:], sample_rate, channels, samples))
+        return frames
+
+    def audio_frames(self) -> Iterator[CapturedFrame]:
+        """캡처 전체 입력 프레임 (순서대로)"""
+        for record in self.records():
+            if record.type == RECORD_AUDIO:
+                sample_rate, channels, samples = _AUDIO.unpack_from(record.payload, 0)
+                yield CapturedFrame(record.payload[_AUDIO.size:], sample_rate, channels, samples)
+
+    def vad_events(self, start: Optional[int] = None, end: Optional[int] = None) -> list[tuple[float, int]]:
+        return [(r.ts, r.seq) for r in self.records(start, end) if r.type == RECORD_VAD]
+
+    def turn_timings(self, turn_id: int) -> dict:
+        """턴 처리 후 기록된 단계별 시간 (턴 이후 레코드에서 검색)"""
+        for record in self.records(self.index[turn_id].end_offset):
+            if record.type == RECORD_TIMING and record.seq == turn_id:
+                return json.loads(record.payload)
+        return {}
@@ -0,0 +1,83 @@
+"""
+캡처된 턴 재실행 도구
+캡처 파일의 턴을 transcribe_audio와 Turn Detection 로직으로 다시 실행한다.
+
+실행:
+    python -m capture.replay <capture 파일> --list
+    python -m capture.replay <capture 파일> --turn 3
+"""
+
+import argparse
+import asyncio
+import json
+
+from .format import CaptureReader, VAD_START
+
+
+def detect_turn(reader: CaptureReader, turn_id: int) -> dict:
+    """기록된 VAD 시각으로 Turn Detection 판정 재현"""
+    from agent import TurnDetector, TURN_DETECTION_SILENCE_MS
+
+    info = reader.turn_info(turn_id)
+    detector = TurnDetector()
+    detector.start_speech(now=info["speech_start"])
+    detector.end_speech(now=info["speech_end"])
+
+    # 침묵 대기 중 다시 발화하면 턴은 취소됨
+    cancelled = False
+    silence_deadline = info["speech_end"] + TURN_DETECTION_SILENCE_MS / 1000
+    for ts, event in reader.vad_events(reader.index[turn_id].end_offset):
+        if ts > silence_deadline:
+            break
+        if event == VAD_START:
+            cancelled = True
+            break
+
+    return {
+        "speech_duration_ms": round(detector.get_speech_duration_ms(), 2),
+        "should_process": detector.should_process_turn(),
+        "cancelled_by_speech": cancelled,
+    }
+
+
+async def replay_turn(reader: CaptureReader, turn_id: int) -> dict:
+    from agent import transcribe_audio
+
+    frames = reader.turn_frames(turn_id)
+    text, stt_ms = await transcribe_audio(frames)
+    recorded = reader.turn_timings(turn_id)
+    return {
+        "turn": turn_id,
+        "frames": len(frames),
+        **detect_turn(reader, turn_id),
+        "text": text,
+        "stt_ms": round(stt_ms, 2),
+        "recorded": recorded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured voice-agent turns")
+    parser.add_argument("path")
+    parser.add_argument("--turn", type=int, action="append", help="재실행할 턴 번호 (여러 번 지정 가능)")
+    parser.add_argument("--list", action="store_true", help="턴 목록 출력")
+    args = parser.parse_args()
+
+    with CaptureReader(args.path) as reader:
+        if args.list or not args.turn:
+            print(json.dumps(reader.metadata, ensure_ascii=False))
+            for entry in reader.turns():
+                print(json.dumps({
+                    "turn": entry.turn_id,
+                    "frames": entry.last_seq - entry.first_seq + 1,
+                    **reader.turn_info(entry.turn_id),
+                }, ensure_ascii=False))
+            return
+
+        for turn_id in args.turn:
+            result = asyncio.run(replay_turn(reader, turn_id))
+            print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,12 @@ from .ollama import OllamaProvider
 from .openai import OpenAIProvider
 from .claude import ClaudeProvider
 from .gemini import GeminiProvider
-from .factory import create_llm_provider, get_default_provider
+from .embedded import EmbeddedProvider
+from .limiter import LocalLimiter, RateLimitedProvider, RemoteLimiter, set_queue_key
+from .limit_server import LimitServer
+from .policy import GenerationPolicy, classify_question, estimate_tokens
+from .prewarm import LLMPrewarmer
+from .factory import create_default_provider, create_llm_provider, get_default_provider
 
 __all__ = [
     "LLMProvider",
@@ -13,6 +18,17 @@ __all__ = [
     "OpenAIProvider",
     "ClaudeProvider",
     "GeminiProvider",
+    "EmbeddedProvider",
+    "RateLimitedProvider",
+    "LocalLimiter",
+    "RemoteLimiter",
+    "LimitServer",
+    "set_queue_key",
+    "GenerationPolicy",
+    "classify_question",
+    "estimate_tokens",
+    "LLMPrewarmer",
     "create_llm_provider",
+    "create_default_provider",
     "get_default_provider",
 ]
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional, Literal
+from typing import AsyncIterator, List, Optional, Literal
 
 
 @dataclass
@@ -14,6 +14,8 @@ class ChatCompletionResponse:
     content: str
     model: str
     usage: Optional[dict] = None
+    queue_wait_ms: float = 0.0  # 제한기 대기 시간
+    retries: int = 0
 
 
 class LLMProvider(ABC):
@@ -29,6 +31,37 @@ class LLMProvider(ABC):
         """채팅 완성 요청"""
         pass
 
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        """스트리밍 채팅 (텍스트 조각 순차 반환, stats에 usage, finish_reason 등 기록)
+
+        finish_reason은 max_tokens에 도달해 잘린 경우 "length"로 통일한다.
+
+        기본 구현은 chat() 결과를 한 번에 반환한다.
+        """
+        response = await self.chat(messages, temperature=temperature, max_tokens=max_tokens)
+        if stats is not None and response.usage:
+            stats["usage"] = response.usage
+        if response.content:
+            yield response.content
+
+    def supports_prewarm(self) -> bool:
+        """prewarm 지원 여부"""
+        return False
+
+    async def prewarm(self, messages: List[ChatMessage]) -> bool:
+        """모델 적재 + 프롬프트 접두부(시스템 프롬프트/대화 기록) 미리 평가
+
+        다음 요청이 같은 접두부로 시작하면 새 사용자 발화만 처리하면 된다.
+        요청을 보냈으면 True 반환.
+        """
+        return False
+
     @abstractmethod
     def get_model_name(self) -> str:
         """모델 이름 반환"""
@@ -0,0 +1,106 @@
+"""
+LLM 첫 토큰 시간(TTFT) 측정
+대화 턴을 순서대로 실행하며 사전 준비(prewarm) 유무에 따른 TTFT를 비교한다.
+
+    none     발화 시간만큼 대기 후 요청
+    prewarm  발화 시작 시점에 prewarm, 발화 시간만큼 대기 후 요청
+
+실행 (LLM_PROVIDER 등 환경 변수 사용, --provider로 여러 Provider 비교):
+    python -m llm.bench --turns 5 --speech-sec 2
+    python -m llm.bench --unload   # 턴마다 Ollama 모델 내림 (keep_alive 만료 상황)
+    python -m llm.bench --provider ollama --provider embedded --mode none
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import httpx
+
+from .base import ChatMessage, LLMProvider
+from .factory import create_default_provider
+
+SYSTEM_PROMPT = "당신은 친절한 한국어 음성 어시스턴트입니다. 짧게 대답하세요."
+QUESTIONS = [
+    "안녕하세요, 오늘 기분이 어때요?",
+    "주말에 가볼 만한 곳을 추천해 줄래요?",
+    "거기까지 가는 방법도 알려 주세요.",
+    "비가 오면 대신 뭘 하면 좋을까요?",
+    "고마워요, 마지막으로 한 가지만 더 물어볼게요.",
+]
+
+
+async def unload_ollama(provider: LLMProvider):
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        await client.post(
+            f"{provider.base_url}/api/generate",
+            json={"model": provider.get_model_name(), "keep_alive": 0},
+        )
+
+
+async def first_token_ms(provider: LLMProvider, messages: list[ChatMessage], max_tokens: int) -> float:
+    start = time.perf_counter()
+    stream = provider.chat_stream(messages, max_tokens=max_tokens)
+    try:
+        async for _ in stream:
+            return (time.perf_counter() - start) * 1000
+    finally:
+        await stream.aclose()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(provider: LLMProvider, mode: str, turns: int, speech_sec: float, unload: bool) -> dict:
+    history: list[ChatMessage] = []
+    ttfts = []
+    for i in range(turns):
+        if unload and provider.get_provider_type() == "ollama":
+            await unload_ollama(provider)
+
+        prefix = [ChatMessage(role="system", content=SYSTEM_PROMPT)] + history
+        prewarm = asyncio.create_task(provider.prewarm(prefix)) if mode == "prewarm" else None
+        await asyncio.sleep(speech_sec)  # 사용자 발화 + STT 시간
+
+        question = QUESTIONS[i % len(QUESTIONS)]
+        messages = prefix + [ChatMessage(role="user", content=question)]
+        ttfts.append(await first_token_ms(provider, messages, max_tokens=1))
+        if prewarm:
+            await prewarm
+
+        # 다음 턴 접두부: 실제 응답 대신 고정 문장 (모드 간 조건 동일)
+        history += [
+            ChatMessage(role="user", content=question),
+            ChatMessage(role="assistant", content="네, 좋은 질문이에요. 잠시 생각해 볼게요."),
+        ]
+
+    return {
+        "provider": provider.get_provider_type(),
+        "model": provider.get_model_name(),
+        "mode": mode,
+        "unload": unload,
+        "ttft_ms": [round(t, 1) for t in ttfts],
+        "ttft_median_ms": round(statistics.median(ttfts), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LLM time-to-first-token with and without prewarm")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--speech-sec", type=float, default=2.0)
+    parser.add_argument("--unload", action="store_true", help="턴마다 Ollama 모델 내림")
+    parser.add_argument("--mode", action="append", choices=["none", "prewarm"])
+    parser.add_argument("--provider", action="append", help="LLM_PROVIDER 값 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    for provider_type in args.provider or [os.getenv("LLM_PROVIDER", "ollama")]:
+        os.environ["LLM_PROVIDER"] = provider_type
+        provider = create_default_provider()
+        for mode in args.mode or ["none", "prewarm"]:
+            result = asyncio.run(run(provider, mode, args.turns, args.speech_sec, args.unload))
+            print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import httpx
 
@@ -17,12 +18,12 @@ class ClaudeProvider(LLMProvider):
         self.base_url = "https://api.anthropic.com/v1"
         logger.info(f"Initialized Claude provider: model: {self.model}")
 
-    async def chat(
+    def _build_payload(
         self,
         messages: List[ChatMessage],
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-    ) -> ChatCompletionResponse:
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> dict:
         # system 메시지 추출
         system_prompt = None
         chat_messages = []
@@ -47,17 +48,28 @@ class ClaudeProvider(LLMProvider):
         if temperature is not None:
             payload["temperature"] = temperature
 
-        headers = {
+        return payload
+
+    def _headers(self) -> dict:
+        return {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
         }
 
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        payload = self._build_payload(messages, temperature, max_tokens)
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
                 f"{self.base_url}/messages",
                 json=payload,
-                headers=headers,
+                headers=self._headers(),
             )
             response.raise_for_status()
             result = response.json()
@@ -82,6 +94,51 @@ class ClaudeProvider(LLMProvider):
                 usage=usage,
             )
 
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload(messages, temperature, max_tokens)
+        payload["stream"] = True
+        input_tokens = 0
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/messages",
+                json=payload,
+                headers=self._headers(),
+            ) as response:
+                response.raise_for_status()
+                # SSE: message_start → content_block_delta* → message_delta → message_stop
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[len("data:"):].strip())
+                    event_type = event.get("type")
+
+                    if event_type == "message_start":
+                        input_tokens = event.get("message", {}).get("usage", {}).get("input_tokens", 0)
+                    elif event_type == "content_block_delta":
+                        text = event.get("delta", {}).get("text")
+                        if text:
+                            yield text
+                    elif event_type == "message_delta" and stats is not None:
+                        stop_reason = event.get("delta", {}).get("stop_reason")
+                        if stop_reason:
+                            stats["finish_reason"] = "length" if stop_reason == "max_tokens" else stop_reason
+                        output_tokens = event.get("usage", {}).get("output_tokens", 0)
+                        stats["usage"] = {
+                            "prompt_tokens": input_tokens,
+                            "completion_tokens": output_tokens,
+                            "total_tokens": input_tokens + output_tokens,
+                        }
+                    elif event_type == "message_stop":
+                        break
+
     def get_model_name(self) -> str:
         return self.model
 
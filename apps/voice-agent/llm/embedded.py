@@ -0,0 +1,230 @@
+import asyncio
+import fcntl
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, List, Optional
+
+from .base import LLMProvider, ChatMessage, ChatCompletionResponse
+
+logger = logging.getLogger("voice-agent.llm.embedded")
+
+
+class HostSlots:
+    """호스트 전체 동시 생성 수 제한 (슬롯마다 fcntl 락 파일, 프로세스가 죽으면 커널이 반납)
+
+    Job 프로세스마다 n_threads 스레드로 생성하므로 슬롯 수 × n_threads ≤ 코어 수로 두면
+    방이 늘어도 생성 스레드가 코어를 초과해 서로 밀어내지 않는다.
+    """
+
+    def __init__(self, slots: int, lock_dir: str, poll_sec: float = 0.01):
+        self.slots = max(1, slots)
+        self.lock_dir = lock_dir
+        self.poll_sec = poll_sec
+        os.makedirs(lock_dir, exist_ok=True)
+
+    def try_acquire(self) -> Optional[int]:
+        """빈 슬롯 점유 (락을 잡은 fd 반환, 모두 사용 중이면 None)"""
+        for i in range(self.slots):
+            fd = os.open(os.path.join(self.lock_dir, f"slot-{i}.lock"), os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    def acquire(self, stop: threading.Event) -> Optional[int]:
+        """슬롯이 빌 때까지 대기 (stop 설정 시 None)"""
+        while not stop.is_set():
+            fd = self.try_acquire()
+            if fd is not None:
+                return fd
+            stop.wait(self.poll_sec)
+        return None
+
+    @staticmethod
+    def release(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class EmbeddedProvider(LLMProvider):
+    """프로세스 내 llama.cpp (GGUF) Provider
+
+    - 생성은 전용 스레드 하나에서 순차 실행 (이벤트 루프 비차단, 토큰 단위 스트리밍)
+    - 직전 요청과 공통 접두부는 KV 캐시 재사용, 세션이 번갈아 와도 RAM 캐시에서 접두부 상태 복원
+    - 모델 파일은 mmap으로 적재되어 같은 노드의 Job 프로세스 간 페이지 캐시 공유
+    - 호스트 슬롯(HostSlots)으로 프로세스 간 동시 생성 수 제한 (총 생성 스레드 ≤ 코어 수)
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        n_ctx: int = 4096,
+        n_threads: int = 0,
+        cache_mb: int = 256,
+        chat_format: Optional[str] = None,
+        host_slots: int = 0,
+        slot_dir: str = "/tmp/voice-agent-embedded-slots",
+    ):
+        try:
+            from llama_cpp import Llama, LlamaRAMCache
+        except ImportError as e:
+            raise ImportError("EmbeddedProvider requires llama-cpp-python (pip install -r requirements-embedded.txt)") from e
+
+        self.model_path = model_path
+        self.model = os.path.splitext(os.path.basename(model_path))[0]
+        # 스레드 예산 (0 = 코어 절반, STT와 CPU 공유)
+        self.n_threads = n_threads or max(1, (os.cpu_count() or 2) // 2)
+        # 호스트 동시 생성 수 (0 = 코어 수 / n_threads, slot_dir 미설정 시 제한 없음)
+        self._slots = HostSlots(host_slots or (os.cpu_count() or 1) // self.n_threads, slot_dir) if slot_dir else None
+
+        self._llm = Llama(
+            model_path=model_path,
+            n_ctx=n_ctx,
+            n_threads=self.n_threads,
+            n_threads_batch=self.n_threads,
+            chat_format=chat_format,
+            verbose=False,
+        )
+        self._cache = LlamaRAMCache(capacity_bytes=cache_mb * 1024 * 1024) if cache_mb > 0 else None
+        if self._cache is not None:
+            self._llm.set_cache(self._cache)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedded-llm")
+        logger.info(
+            f"Initialized embedded provider: {model_path}, n_ctx={n_ctx}, threads={self.n_threads}, "
+            f"host_slots={self._slots.slots if self._slots else 'off'}"
+        )
+
+    def _usage(self, completion_tokens: int) -> dict:
+        # 컨텍스트 토큰 수 = 프롬프트 + 생성 토큰
+        total_tokens = self._llm.n_tokens
+        return {
+            "prompt_tokens": max(0, total_tokens - completion_tokens),
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: List[dict],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        emit: Callable[[str], None],
+        stop: threading.Event,
+    ) -> tuple[dict, Optional[str], float]:
+        """생성 스레드에서 실행 - 토큰마다 emit 호출, stop 설정 시 중단 (사용량, 종료 사유, 슬롯 대기 시간 반환)"""
+        wait_start = time.monotonic()
+        slot = self._slots.acquire(stop) if self._slots else None
+        slot_wait_ms = (time.monotonic() - wait_start) * 1000
+        if self._slots and slot is None:
+            # 슬롯 대기 중 소비자가 닫음
+            return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}, None, slot_wait_ms
+        try:
+            usage, finish_reason = self._run_completion(messages, temperature, max_tokens, emit, stop)
+        finally:
+            if slot is not None:
+                self._slots.release(slot)
+        return usage, finish_reason, slot_wait_ms
+
+    def _run_completion(
+        self,
+        messages: List[dict],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        emit: Callable[[str], None],
+        stop: threading.Event,
+    ) -> tuple[dict, Optional[str]]:
+        kwargs = {"messages": messages, "max_tokens": max_tokens, "stream": True}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+
+        # 멀티바이트 문자가 여러 토큰에 걸치면 한 조각으로 합쳐지므로 토큰 수는 근사치
+        completion_tokens = 0
+        finish_reason = None
+        stream = self._llm.create_chat_completion(**kwargs)
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                finish_reason = chunk["choices"][0].get("finish_reason") or finish_reason
+                content = chunk["choices"][0]["delta"].get("content")
+                if content:
+                    completion_tokens += 1
+                    emit(content)
+        finally:
+            stream.close()
+
+        if stop.is_set() and self._cache is not None:
+            # 조기 종료 시에는 llama.cpp가 상태를 저장하지 않으므로 직접 저장 (다음 턴 접두부 복원용)
+            self._cache[self._llm.input_ids.tolist()] = self._llm.save_state()
+        return self._usage(completion_tokens), finish_reason
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        chunks = []
+        stats = {}
+        async for chunk in self.chat_stream(messages, temperature=temperature, max_tokens=max_tokens, stats=stats):
+            chunks.append(chunk)
+        return ChatCompletionResponse(content="".join(chunks), model=self.model, usage=stats.get("usage"))
+
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        future = loop.run_in_executor(
+            self._executor,
+            self._generate,
+            [{"role": m.role, "content": m.content} for m in messages],
+            temperature,
+            max_tokens,
+            lambda content: loop.call_soon_threadsafe(queue.put_nowait, content),
+            stop,
+        )
+        # 토큰 전달과 같은 경로로 종료 신호 (순서 보장)
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                content = await queue.get()
+                if content is None:
+                    break
+                yield content
+            usage, finish_reason, slot_wait_ms = await future
+            if stats is not None:
+                stats["usage"] = usage
+                stats["slot_wait_ms"] = slot_wait_ms
+                if finish_reason:
+                    stats["finish_reason"] = finish_reason
+        finally:
+            # 소비자가 중간에 닫으면 다음 토큰에서 생성 중단
+            stop.set()
+
+    def supports_prewarm(self) -> bool:
+        return True
+
+    async def prewarm(self, messages: List[ChatMessage]) -> bool:
+        """접두부를 평가해 KV 캐시에 적재 (1토큰 생성)"""
+        async for _ in self.chat_stream(messages, max_tokens=1):
+            pass
+        return True
+
+    def get_model_name(self) -> str:
+        return self.model
+
+    def get_provider_type(self) -> str:
+        return "embedded"
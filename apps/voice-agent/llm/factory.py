@@ -1,12 +1,13 @@
 import os
 import logging
-from typing import Optional
 
 from .base import LLMProvider
 from .ollama import OllamaProvider
 from .openai import OpenAIProvider
 from .claude import ClaudeProvider
 from .gemini import GeminiProvider
+from .embedded import EmbeddedProvider
+from .limiter import RateLimitedProvider
 
 logger = logging.getLogger("voice-agent.llm.factory")
 
@@ -22,6 +23,7 @@ def create_llm_provider(
         return OllamaProvider(
             base_url=kwargs.get("base_url", "http://localhost:11434"),
             model=kwargs.get("model", "llama3.2:3b"),
+            keep_alive=kwargs.get("keep_alive"),
         )
     elif provider_type == "openai":
         return OpenAIProvider(
@@ -39,12 +41,39 @@ def create_llm_provider(
             api_key=kwargs.get("api_key", ""),
             model=kwargs.get("model", "gemini-1.5-flash"),
         )
+    elif provider_type == "embedded":
+        return EmbeddedProvider(
+            model_path=kwargs.get("model_path", ""),
+            n_ctx=kwargs.get("n_ctx", 4096),
+            n_threads=kwargs.get("n_threads", 0),
+            cache_mb=kwargs.get("cache_mb", 256),
+            chat_format=kwargs.get("chat_format"),
+            host_slots=kwargs.get("host_slots", 0),
+            slot_dir=kwargs.get("slot_dir", "/tmp/voice-agent-embedded-slots"),
+        )
     else:
         raise ValueError(f"Unknown LLM provider type: {provider_type}")
 
 
+def with_rate_limit(provider: LLMProvider) -> LLMProvider:
+    """환경 변수 기반 동시성/요청률 제한 적용"""
+    return RateLimitedProvider(
+        provider,
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        requests_per_sec=float(os.getenv("LLM_RPS", "0")),
+        tokens_per_min=float(os.getenv("LLM_TPM", "0")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        limiter_socket=os.getenv("LLM_LIMITER_SOCKET", ""),
+    )
+
+
 def get_default_provider() -> LLMProvider:
-    """환경 변수 기반 기본 Provider 생성"""
+    """환경 변수 기반 기본 Provider 생성 (제한기 포함)"""
+    return with_rate_limit(create_default_provider())
+
+
+def create_default_provider() -> LLMProvider:
+    """환경 변수 기반 기본 Provider 생성 (제한기 없음, 벤치마크 등 단일 프로세스 도구용)"""
     provider_type = os.getenv("LLM_PROVIDER", "ollama")
 
     if provider_type == "openai":
@@ -66,10 +95,22 @@ def get_default_provider() -> LLMProvider:
             api_key=os.getenv("GEMINI_API_KEY", ""),
             model=os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
         )
+    elif provider_type == "embedded":
+        return create_llm_provider(
+            "embedded",
+            model_path=os.getenv("EMBEDDED_MODEL_PATH", ""),
+            n_ctx=int(os.getenv("EMBEDDED_N_CTX", "4096")),
+            n_threads=int(os.getenv("EMBEDDED_THREADS", "0")),
+            cache_mb=int(os.getenv("EMBEDDED_CACHE_MB", "256")),
+            chat_format=os.getenv("EMBEDDED_CHAT_FORMAT") or None,
+            host_slots=int(os.getenv("EMBEDDED_HOST_SLOTS", "0")),
+            slot_dir=os.getenv("EMBEDDED_SLOT_DIR", "/tmp/voice-agent-embedded-slots"),
+        )
     else:
         # Default to Ollama
         return create_llm_provider(
             "ollama",
             base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
             model=os.getenv("OLLAMA_MODEL", "llama3.2:3b"),
+            keep_alive=os.getenv("OLLAMA_KEEP_ALIVE") or None,
         )
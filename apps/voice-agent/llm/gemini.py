@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import httpx
 
@@ -17,12 +18,12 @@ class GeminiProvider(LLMProvider):
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
         logger.info(f"Initialized Gemini provider: model: {self.model}")
 
-    async def chat(
+    def _build_payload(
         self,
         messages: List[ChatMessage],
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-    ) -> ChatCompletionResponse:
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> dict:
         # system 메시지와 일반 메시지 분리
         system_instruction = None
         contents = []
@@ -53,6 +54,35 @@ class GeminiProvider(LLMProvider):
         if temperature is not None:
             payload["generationConfig"]["temperature"] = temperature
 
+        return payload
+
+    @staticmethod
+    def _usage(result: dict) -> Optional[dict]:
+        if not result.get("usageMetadata"):
+            return None
+        usage_data = result["usageMetadata"]
+        return {
+            "prompt_tokens": usage_data.get("promptTokenCount", 0),
+            "completion_tokens": usage_data.get("candidatesTokenCount", 0),
+            "total_tokens": usage_data.get("totalTokenCount", 0),
+        }
+
+    @staticmethod
+    def _text(result: dict) -> str:
+        if result.get("candidates"):
+            candidate = result["candidates"][0]
+            if candidate.get("content", {}).get("parts"):
+                return candidate["content"]["parts"][0].get("text", "")
+        return ""
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        payload = self._build_payload(messages, temperature, max_tokens)
+
         url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
 
         async with httpx.AsyncClient(timeout=60.0) as client:
@@ -64,27 +94,45 @@ class GeminiProvider(LLMProvider):
             response.raise_for_status()
             result = response.json()
 
-            content = ""
-            if result.get("candidates"):
-                candidate = result["candidates"][0]
-                if candidate.get("content", {}).get("parts"):
-                    content = candidate["content"]["parts"][0].get("text", "")
-
-            usage = None
-            if result.get("usageMetadata"):
-                usage_data = result["usageMetadata"]
-                usage = {
-                    "prompt_tokens": usage_data.get("promptTokenCount", 0),
-                    "completion_tokens": usage_data.get("candidatesTokenCount", 0),
-                    "total_tokens": usage_data.get("totalTokenCount", 0),
-                }
-
             return ChatCompletionResponse(
-                content=content,
+                content=self._text(result),
                 model=self.model,
-                usage=usage,
+                usage=self._usage(result),
             )
 
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload(messages, temperature, max_tokens)
+
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream(
+                "POST",
+                url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+                # SSE: 각 이벤트가 generateContent 응답 조각
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = json.loads(line[len("data:"):].strip())
+                    if stats is not None and chunk.get("usageMetadata"):
+                        stats["usage"] = self._usage(chunk)
+                    finish_reason = (chunk.get("candidates") or [{}])[0].get("finishReason")
+                    if stats is not None and finish_reason:
+                        stats["finish_reason"] = "length" if finish_reason == "MAX_TOKENS" else finish_reason.lower()
+                    text = self._text(chunk)
+                    if text:
+                        yield text
+
     def get_model_name(self) -> str:
         return self.model
 
@@ -0,0 +1,143 @@
+"""
+공유 LLM 호출 제한 서버
+호스트당 하나의 프로세스가 백엔드별 동시 실행/요청률/토큰률 한도와 방별 공정 큐잉을 관리하고,
+Job 프로세스들은 Unix 소켓 연결 하나를 슬롯 하나로 점유한다 (연결 종료 = 반납).
+
+실행: python -m llm.limit_server
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from transport.framing import read_message, write_message
+
+from .limiter import LocalLimiter, LocalLease
+
+logger = logging.getLogger("voice-agent.llm.limit_server")
+
+LLM_LIMITER_SOCKET = os.getenv("LLM_LIMITER_SOCKET", "/tmp/voice-agent-llm-limiter.sock")
+
+
+class LimitServer:
+    """백엔드별 LocalLimiter를 호스트 단위로 공유하는 서버"""
+
+    def __init__(self, socket_path: str = LLM_LIMITER_SOCKET):
+        self.socket_path = socket_path
+        self._backends: dict[str, LocalLimiter] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._client_tasks: set[asyncio.Task] = set()
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        logger.info(f"LLM limit server listening on {self.socket_path}")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """소켓 닫기 + 연결 처리 취소"""
+        if self._server:
+            self._server.close()
+        tasks = list(self._client_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def backend(self, request: dict) -> LocalLimiter:
+        """백엔드 제한기 조회 (처음 보는 백엔드는 요청에 담긴 한도로 생성)"""
+        name = request.get("backend", "default")
+        limiter = self._backends.get(name)
+        if limiter is None:
+            limits = request.get("limits", {})
+            limiter = LocalLimiter(
+                int(limits.get("max_concurrency", 4)),
+                float(limits.get("rps", 0.0)),
+                float(limits.get("tpm", 0.0)),
+            )
+            self._backends[name] = limiter
+            logger.info(f"LLM limits for {name}: {limits}")
+        return limiter
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        lease: Optional[LocalLease] = None
+        try:
+            request = await read_message(reader)
+            limiter = self.backend(request)
+            if request.get("op") == "pause":
+                # Retry-After를 받은 Job 프로세스의 알림 - 모든 프로세스의 새 요청 보류
+                await limiter.pause(float(request.get("delay_sec", 0.0)))
+                await write_message(writer, {"ok": True})
+                return
+            if request.get("op") == "try_acquire":
+                lease = await limiter.try_acquire()
+            else:
+                lease = await self._acquire_until_disconnect(limiter, request, reader)
+            await write_message(writer, {"ok": lease is not None})
+            if lease is None:
+                return
+
+            # 슬롯 점유 중: 토큰 보정 메시지 처리, 반납 또는 연결 종료까지 유지
+            while True:
+                message = await read_message(reader)
+                op = message.get("op")
+                if op == "adjust":
+                    lease.adjust(float(message.get("delta", 0.0)))
+                elif op == "release":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if lease:
+                lease.release()
+            writer.close()
+            self._client_tasks.discard(task)
+
+    async def _acquire_until_disconnect(
+        self, limiter: LocalLimiter, request: dict, reader: asyncio.StreamReader
+    ) -> Optional[LocalLease]:
+        """슬롯 대기 (대기 중 클라이언트 연결이 끊기면 대기열에서 제거)"""
+        acquire = asyncio.ensure_future(limiter.acquire(request.get("key", "default"), float(request.get("tokens", 0))))
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            await asyncio.wait({acquire, closed}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            closed.cancel()
+            await self._cancel_acquire(acquire)
+            raise
+        # 대기 중에는 클라이언트가 보내는 것이 없으므로 읽기 완료 = 연결 종료
+        disconnected = closed.done()
+        closed.cancel()
+        await asyncio.wait({closed})  # 이후 메시지 읽기 전에 읽기 대기 해제
+        if disconnected:
+            await self._cancel_acquire(acquire)
+            return None
+        return acquire.result()
+
+    @staticmethod
+    async def _cancel_acquire(acquire: asyncio.Future):
+        """대기 취소 (취소 직전에 획득했으면 반납)"""
+        acquire.cancel()
+        await asyncio.wait({acquire})
+        if not acquire.cancelled():
+            acquire.result().release()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(LimitServer().serve_forever())
@@ -0,0 +1,455 @@
+import asyncio
+import contextlib
+import contextvars
+import email.utils
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from transport.backoff import Backoff
+from transport.framing import encode_message, read_message, write_message
+
+from .base import LLMProvider, ChatMessage, ChatCompletionResponse
+
+logger = logging.getLogger("voice-agent.llm.limiter")
+
+# 공정 큐잉 키 (방/참가자 단위) - 호출 측 Task 컨텍스트에서 설정
+_queue_key: contextvars.ContextVar[str] = contextvars.ContextVar("llm_queue_key", default="default")
+
+RETRYABLE_STATUS = {429, 503}
+
+
+def set_queue_key(key: str):
+    """현재 Task의 LLM 공정 큐잉 키 설정"""
+    _queue_key.set(key)
+
+
+class FairLimiter:
+    """동시 실행 제한 + 키별 라운드로빈 대기열"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._queues: "OrderedDict[str, deque[asyncio.Future]]" = OrderedDict()
+
+    def waiting(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def try_acquire(self) -> bool:
+        """대기 없이 슬롯 획득 (대기 중인 요청이 있으면 실패)"""
+        if self.max_concurrency <= 0:
+            return True
+        if self._in_flight < self.max_concurrency and not self._queues:
+            self._in_flight += 1
+            return True
+        return False
+
+    async def acquire(self, key: str):
+        if self.max_concurrency <= 0:
+            return
+        if self._in_flight < self.max_concurrency and not self._queues:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소됨 - 반납
+                self.release()
+            else:
+                queue = self._queues.get(key)
+                if queue and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self._queues[key]
+            raise
+
+    def release(self):
+        if self.max_concurrency <= 0:
+            return
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake()
+
+    def _wake(self):
+        while self._in_flight < self.max_concurrency and self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+
+class TokenBucket:
+    """토큰 버킷 (rate: 초당 충전량, capacity: 최대 보유량)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def take(self, amount: float = 1.0):
+        # 버킷보다 큰 요청은 버킷이 가득 찰 때까지만 대기
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def try_take(self, amount: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def adjust(self, delta: float):
+        """실제 사용량으로 보정 (양수 = 추가 차감)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class LocalLimiter:
+    """한 이벤트 루프 안의 제한 (동시 실행 슬롯 + 요청률/토큰률 버킷 + 백오프 일시 정지)"""
+
+    def __init__(self, max_concurrency: int, requests_per_sec: float = 0.0, tokens_per_min: float = 0.0):
+        self.fair = FairLimiter(max_concurrency)
+        self.rps_bucket = TokenBucket(requests_per_sec, max(1.0, requests_per_sec)) if requests_per_sec > 0 else None
+        self.tpm_bucket = TokenBucket(tokens_per_min / 60.0, tokens_per_min) if tokens_per_min > 0 else None
+        self.resume_at = 0.0
+
+    async def pause(self, delay_sec: float):
+        """Retry-After 동안 새 요청/재시도 보류"""
+        self.resume_at = max(self.resume_at, time.monotonic() + delay_sec)
+
+    def paused(self) -> bool:
+        return time.monotonic() < self.resume_at
+
+    async def wait_resume(self):
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def acquire(self, key: str, tokens: float) -> "LocalLease":
+        """키별 라운드로빈 순서로 슬롯 획득 후 일시 정지/예산 대기"""
+        await self.fair.acquire(key)
+        try:
+            await self.wait_resume()
+            if self.rps_bucket:
+                await self.rps_bucket.take()
+            if self.tpm_bucket:
+                await self.tpm_bucket.take(tokens)
+        except BaseException:
+            self.fair.release()
+            raise
+        return LocalLease(self)
+
+    async def try_acquire(self) -> Optional["LocalLease"]:
+        """대기 없이 슬롯/요청 예산 획득 (불가하면 None)"""
+        if self.paused() or not self.fair.try_acquire():
+            return None
+        if self.rps_bucket and not self.rps_bucket.try_take():
+            self.fair.release()
+            return None
+        return LocalLease(self)
+
+
+class LocalLease:
+    """LocalLimiter 슬롯 (release 전까지 점유)"""
+
+    def __init__(self, limiter: LocalLimiter):
+        self.limiter = limiter
+        self._released = False
+
+    def adjust(self, delta: float):
+        """실제 토큰 사용량으로 보정 (양수 = 추가 차감)"""
+        if self.limiter.tpm_bucket:
+            self.limiter.tpm_bucket.adjust(delta)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.limiter.fair.release()
+
+
+class RemoteLimiter:
+    """호스트 공용 제한 서버(llm.limit_server) 클라이언트
+
+    슬롯 하나 = 서버와의 연결 하나라서, Job 프로세스가 죽어도 연결이 끊기며 슬롯이 반납된다.
+    서버에 연결할 수 없으면 일정 시간 프로세스 내 제한으로 대체한다.
+    Retry-After 일시 정지는 프로세스 내 제한기(fallback)에 기록하고 서버에도 알려 다른 Job 프로세스와 공유한다.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        backend: str,
+        max_concurrency: int,
+        requests_per_sec: float = 0.0,
+        tokens_per_min: float = 0.0,
+        retry_after_sec: float = 10.0,
+    ):
+        self.socket_path = socket_path
+        self.backend = backend
+        self.limits = {"max_concurrency": max_concurrency, "rps": requests_per_sec, "tpm": tokens_per_min}
+        self.fallback = LocalLimiter(max_concurrency, requests_per_sec, tokens_per_min)
+        self.backoff = Backoff(f"LLM limit server ({socket_path})", "using per-process limits", retry_after_sec, logger)
+
+    def available(self) -> bool:
+        return self.backoff.available()
+
+    async def pause(self, delay_sec: float):
+        await self.fallback.pause(delay_sec)
+        if self.available():
+            try:
+                await self._request("pause", delay_sec=delay_sec)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                self.backoff.fail(e)
+
+    def paused(self) -> bool:
+        return self.fallback.paused()
+
+    async def wait_resume(self):
+        await self.fallback.wait_resume()
+
+    async def acquire(self, key: str, tokens: float):
+        if self.available():
+            try:
+                return await self._request("acquire", key, tokens)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                self.backoff.fail(e)
+        return await self.fallback.acquire(key, tokens)
+
+    async def try_acquire(self):
+        if self.available():
+            try:
+                return await self._request("try_acquire")
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                self.backoff.fail(e)
+        return await self.fallback.try_acquire()
+
+    async def _request(
+        self, op: str, key: str = "", tokens: float = 0.0, delay_sec: float = 0.0
+    ) -> Optional["RemoteLease"]:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            await write_message(writer, {
+                "op": op,
+                "backend": self.backend,
+                "key": key,
+                "tokens": tokens,
+                "delay_sec": delay_sec,
+                "limits": self.limits,
+            })
+            response = await read_message(reader)
+        except BaseException:
+            # 대기 중 취소되면 연결을 끊어 서버 대기열에서 제거
+            writer.close()
+            raise
+        if op == "pause" or not response.get("ok"):
+            writer.close()
+            return None
+        return RemoteLease(writer)
+
+
+class RemoteLease:
+    """제한 서버 슬롯 (연결 종료 = 반납)"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    def _send(self, message: dict):
+        # 작은 제어 메시지라 drain 없이 버퍼에 기록
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(message))
+
+    def adjust(self, delta: float):
+        self._send({"op": "adjust", "delta": delta})
+
+    def release(self):
+        if not self.writer.is_closing():
+            self._send({"op": "release"})
+            self.writer.close()
+
+
+class RateLimitedProvider(LLMProvider):
+    """LLMProvider 래퍼 - 동시성/요청률/토큰률 제한, 공정 큐잉, Retry-After 백오프"""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int = 4,
+        requests_per_sec: float = 0.0,
+        tokens_per_min: float = 0.0,
+        max_retries: int = 2,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 10.0,
+        limiter_socket: str = "",
+    ):
+        self.provider = provider
+        if limiter_socket:
+            # 호스트의 모든 Job 프로세스가 백엔드별 한도 하나를 공유
+            self.limiter = RemoteLimiter(
+                limiter_socket,
+                f"{provider.get_provider_type()}:{provider.get_model_name()}",
+                max_concurrency,
+                requests_per_sec,
+                tokens_per_min,
+            )
+        else:
+            self.limiter = LocalLimiter(max_concurrency, requests_per_sec, tokens_per_min)
+        self.max_retries = max_retries
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        logger.info(
+            f"Rate limiting {provider.get_provider_type()}: max_concurrency={max_concurrency}, "
+            f"rps={requests_per_sec or 'off'}, tpm={tokens_per_min or 'off'}, "
+            f"scope={'host (' + limiter_socket + ')' if limiter_socket else 'process'}"
+        )
+
+    @staticmethod
+    def estimate_tokens(messages: List[ChatMessage], max_tokens: Optional[int]) -> int:
+        """요청 토큰 추정 (한국어 기준 대략 2자당 1토큰) + 출력 예산"""
+        prompt_chars = sum(len(m.content) for m in messages)
+        return prompt_chars // 2 + (max_tokens or 256)
+
+    async def _should_retry(self, error: httpx.HTTPStatusError, attempt: int) -> bool:
+        """재시도 가능 여부 판단 후 제한기에 백오프 시각 설정"""
+        if error.response.status_code not in RETRYABLE_STATUS or attempt >= self.max_retries:
+            return False
+        delay = self._retry_delay(error.response, attempt)
+        await self.limiter.pause(delay)
+        logger.warning(
+            f"LLM {error.response.status_code} from {self.provider.get_provider_type()}, "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+        )
+        return True
+
+    @staticmethod
+    def _reconcile(lease, usage: Optional[dict], estimated_tokens: int):
+        if usage and usage.get("total_tokens"):
+            lease.adjust(usage["total_tokens"] - estimated_tokens)
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        start_time = time.time()
+        estimated_tokens = self.estimate_tokens(messages, max_tokens)
+
+        lease = await self.limiter.acquire(_queue_key.get(), estimated_tokens)
+        try:
+            queue_wait_ms = (time.time() - start_time) * 1000
+
+            attempt = 0
+            while True:
+                await self.limiter.wait_resume()
+                try:
+                    response = await self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
+                    break
+                except httpx.HTTPStatusError as e:
+                    if not await self._should_retry(e, attempt):
+                        raise
+                    attempt += 1
+            self._reconcile(lease, response.usage, estimated_tokens)
+        finally:
+            lease.release()
+
+        response.queue_wait_ms = queue_wait_ms
+        response.retries = attempt
+        return response
+
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        """스트리밍 채팅 - 스트림이 끝날 때까지 슬롯 점유, 첫 조각 이전 오류만 재시도"""
+        stats = stats if stats is not None else {}
+        start_time = time.time()
+        estimated_tokens = self.estimate_tokens(messages, max_tokens)
+
+        lease = await self.limiter.acquire(_queue_key.get(), estimated_tokens)
+        try:
+            stats["queue_wait_ms"] = (time.time() - start_time) * 1000
+
+            attempt = 0
+            while True:
+                await self.limiter.wait_resume()
+                received = False
+                stream = self.provider.chat_stream(
+                    messages, temperature=temperature, max_tokens=max_tokens, stats=stats
+                )
+                try:
+                    async with contextlib.aclosing(stream):
+                        async for chunk in stream:
+                            received = True
+                            yield chunk
+                    break
+                except httpx.HTTPStatusError as e:
+                    if received or not await self._should_retry(e, attempt):
+                        raise
+                    attempt += 1
+            stats["retries"] = attempt
+            self._reconcile(lease, stats.get("usage"), estimated_tokens)
+        finally:
+            lease.release()
+
+    def supports_prewarm(self) -> bool:
+        return self.provider.supports_prewarm()
+
+    async def prewarm(self, messages: List[ChatMessage]) -> bool:
+        """사전 준비 요청 - 여유 슬롯/예산이 없거나 백오프 중이면 대기하지 않고 생략"""
+        if self.limiter.paused():
+            return False
+        lease = await self.limiter.try_acquire()
+        if lease is None:
+            return False
+        try:
+            return await self.provider.prewarm(messages)
+        finally:
+            lease.release()
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Retry-After 헤더 우선, 없으면 지수 백오프"""
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(self.backoff_max_sec, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    parsed = email.utils.parsedate_to_datetime(retry_after)
+                    return min(self.backoff_max_sec, max(0.0, parsed.timestamp() - time.time()))
+                except (TypeError, ValueError):
+                    pass
+        return min(self.backoff_max_sec, self.backoff_base_sec * (2 ** attempt))
+
+    def get_model_name(self) -> str:
+        return self.provider.get_model_name()
+
+    def get_provider_type(self) -> str:
+        return self.provider.get_provider_type()
@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import httpx
 
@@ -11,22 +12,26 @@ logger = logging.getLogger("voice-agent.llm.ollama")
 class OllamaProvider(LLMProvider):
     """Ollama LLM Provider"""
 
-    def __init__(self, base_url: str, model: str):
+    def __init__(self, base_url: str, model: str, keep_alive: Optional[str] = None):
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self.keep_alive = keep_alive  # 마지막 요청 후 모델 유지 시간 (예: "10m", 미설정 시 서버 기본값)
         logger.info(f"Initialized Ollama provider: {self.base_url}, model: {self.model}")
 
-    async def chat(
+    def _build_payload(
         self,
         messages: List[ChatMessage],
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-    ) -> ChatCompletionResponse:
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> dict:
         payload = {
             "model": self.model,
             "messages": [{"role": m.role, "content": m.content} for m in messages],
-            "stream": False,
+            "stream": stream,
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
 
         if temperature is not None or max_tokens is not None:
             payload["options"] = {}
@@ -35,6 +40,26 @@ class OllamaProvider(LLMProvider):
             if max_tokens is not None:
                 payload["options"]["num_predict"] = max_tokens
 
+        return payload
+
+    @staticmethod
+    def _usage(result: dict) -> Optional[dict]:
+        if not result.get("eval_count"):
+            return None
+        return {
+            "prompt_tokens": result.get("prompt_eval_count", 0),
+            "completion_tokens": result.get("eval_count", 0),
+            "total_tokens": result.get("prompt_eval_count", 0) + result.get("eval_count", 0),
+        }
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        payload = self._build_payload(messages, temperature, max_tokens, stream=False)
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
                 f"{self.base_url}/api/chat",
@@ -43,20 +68,51 @@ class OllamaProvider(LLMProvider):
             response.raise_for_status()
             result = response.json()
 
-            usage = None
-            if result.get("eval_count"):
-                usage = {
-                    "prompt_tokens": result.get("prompt_eval_count", 0),
-                    "completion_tokens": result.get("eval_count", 0),
-                    "total_tokens": result.get("prompt_eval_count", 0) + result.get("eval_count", 0),
-                }
-
             return ChatCompletionResponse(
                 content=result["message"]["content"],
                 model=self.model,
-                usage=usage,
+                usage=self._usage(result),
             )
 
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True)
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream("POST", f"{self.base_url}/api/chat", json=payload) as response:
+                response.raise_for_status()
+                # NDJSON: 줄마다 message.content 조각, 마지막 줄에 done + 사용량
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    content = chunk.get("message", {}).get("content", "")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        if stats is not None:
+                            stats["usage"] = self._usage(chunk)
+                            if chunk.get("done_reason"):
+                                stats["finish_reason"] = chunk["done_reason"]
+                        break
+
+    def supports_prewarm(self) -> bool:
+        return True
+
+    async def prewarm(self, messages: List[ChatMessage]) -> bool:
+        """모델 적재 + 접두부 평가 (1토큰만 생성, 러너의 KV 캐시에 접두부가 남음)"""
+        payload = self._build_payload(messages, temperature=None, max_tokens=1, stream=False)
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            response = await client.post(f"{self.base_url}/api/chat", json=payload)
+            response.raise_for_status()
+        return True
+
     def get_model_name(self) -> str:
         return self.model
 
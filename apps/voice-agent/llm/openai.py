@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import httpx
 
@@ -17,12 +18,12 @@ class OpenAIProvider(LLMProvider):
         self.base_url = (base_url or "https://api.openai.com/v1").rstrip("/")
         logger.info(f"Initialized OpenAI provider: model: {self.model}")
 
-    async def chat(
+    def _build_payload(
         self,
         messages: List[ChatMessage],
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
-    ) -> ChatCompletionResponse:
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> dict:
         payload = {
             "model": self.model,
             "messages": [{"role": m.role, "content": m.content} for m in messages],
@@ -33,34 +34,85 @@ class OpenAIProvider(LLMProvider):
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
 
-        headers = {
+        return payload
+
+    def _headers(self) -> dict:
+        return {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
 
+    @staticmethod
+    def _usage(result: dict) -> Optional[dict]:
+        if not result.get("usage"):
+            return None
+        return {
+            "prompt_tokens": result["usage"]["prompt_tokens"],
+            "completion_tokens": result["usage"]["completion_tokens"],
+            "total_tokens": result["usage"]["total_tokens"],
+        }
+
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> ChatCompletionResponse:
+        payload = self._build_payload(messages, temperature, max_tokens)
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
                 f"{self.base_url}/chat/completions",
                 json=payload,
-                headers=headers,
+                headers=self._headers(),
             )
             response.raise_for_status()
             result = response.json()
 
-            usage = None
-            if result.get("usage"):
-                usage = {
-                    "prompt_tokens": result["usage"]["prompt_tokens"],
-                    "completion_tokens": result["usage"]["completion_tokens"],
-                    "total_tokens": result["usage"]["total_tokens"],
-                }
-
             return ChatCompletionResponse(
                 content=result["choices"][0]["message"]["content"],
                 model=result.get("model", self.model),
-                usage=usage,
+                usage=self._usage(result),
             )
 
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stats: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload(messages, temperature, max_tokens)
+        payload["stream"] = True
+        if self.base_url.startswith("https://api.openai.com"):
+            # 호환 서버 중 일부는 stream_options를 거부하므로 OpenAI에만 사용량 요청
+            payload["stream_options"] = {"include_usage": True}
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self._headers(),
+            ) as response:
+                response.raise_for_status()
+                # SSE: "data: {...}" 줄, 종료 시 "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if stats is not None and chunk.get("usage"):
+                        stats["usage"] = self._usage(chunk)
+                    for choice in chunk.get("choices", []):
+                        if stats is not None and choice.get("finish_reason"):
+                            stats["finish_reason"] = choice["finish_reason"]
+                        content = choice.get("delta", {}).get("content")
+                        if content:
+                            yield content
+
     def get_model_name(self) -> str:
         return self.model
 
@@ -0,0 +1,145 @@
+"""
+음성 응답 생성 정책
+질문 유형과 최근 응답 길이로 max_tokens 예산을 정하고,
+완결된 문장 수 또는 시간 예산을 넘으면 스트림을 조기 종료한다.
+"""
+
+import re
+import time
+from collections import deque
+from typing import Optional
+
+# 문장 종결: 마침표/물음표/느낌표/말줄임 (+ 닫는 따옴표/괄호) 뒤 공백 또는 줄바꿈
+_SENTENCE_END = re.compile(r"[.!?。…]+[\"'”’)\]]*(?=\s)|\n+(?=\S)")
+_TERMINATORS = (".", "!", "?", "。", "…")
+
+# 한국어 키워드는 활용형이 붙으므로 부분 일치, 영어는 단어 단위 ("show"의 "how" 제외)
+_EXPLAIN_PATTERN = re.compile(r"설명|왜|어떻게|방법|차이|자세히|알려|\b(?:explain|how|why)\b")
+_SHORT_MAX_CHARS = 12
+
+QUESTION_BUDGETS = {
+    "short": 60,     # 인사, 짧은 확인
+    "normal": 120,
+    "explain": 240,  # 설명/방법 요청
+}
+
+
+def classify_question(text: str) -> str:
+    """질문 유형 분류 (short / normal / explain)"""
+    normalized = text.strip().lower()
+    if _EXPLAIN_PATTERN.search(normalized):
+        return "explain"
+    if len(normalized) <= _SHORT_MAX_CHARS:
+        return "short"
+    return "normal"
+
+
+def estimate_tokens(text: str) -> int:
+    """생성 토큰 추정 (사용량이 오지 않은 조기 종료용, 한국어 기준 대략 2자당 1토큰)"""
+    return max(1, len(text) // 2) if text else 0
+
+
+class ReplyLimiter:
+    """턴 하나의 스트림 조각을 받아 문장/시간 예산 안의 텍스트만 통과"""
+
+    def __init__(self, question_type: str, max_tokens: int, max_sentences: int, time_budget_ms: float):
+        self.question_type = question_type
+        self.max_tokens = max_tokens
+        self.max_sentences = max_sentences
+        self.time_budget_ms = time_budget_ms
+        self.started_at: Optional[float] = None  # 첫 토큰 시각 (대기열/TTFT는 예산에서 제외)
+        self.text = ""
+        self.sentences = 0
+        self._scan_pos = 0  # 이미 센 문장 종결 위치
+        self.truncated: Optional[str] = None  # sentences / time / max_tokens
+
+    def remaining_sec(self) -> Optional[float]:
+        """남은 시간 예산 (제한 없음 또는 첫 토큰 전이면 None)"""
+        if self.time_budget_ms <= 0 or self.started_at is None:
+            return None
+        return max(0.0, self.time_budget_ms / 1000 - (time.monotonic() - self.started_at))
+
+    def feed(self, delta: str) -> tuple[str, bool]:
+        """(전달할 텍스트, 중단 여부) 반환 - 첫 조각에서 시간 예산 시작"""
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        start = len(self.text)
+        self.text += delta
+
+        if self.max_sentences > 0:
+            # 종결 부호 뒤 공백이 다음 조각으로 오는 경우도 있어 마지막으로 센 위치부터 검색
+            for match in _SENTENCE_END.finditer(self.text, self._scan_pos):
+                self._scan_pos = match.end()
+                self.sentences += 1
+                if self.sentences >= self.max_sentences:
+                    self.text = self.text[:match.end()].rstrip()
+                    self.truncated = "sentences"
+                    return self.text[start:], True
+
+        if self.remaining_sec() == 0.0:
+            self.stop_for_time()
+            return self.text[start:], True
+        return delta, False
+
+    def stop_for_time(self):
+        """시간 예산 초과 - 완결된 문장이 있으면 거기까지만 유지"""
+        self.truncated = "time"
+        if self.text.rstrip().endswith(_TERMINATORS):
+            return
+        last_end = None
+        for match in _SENTENCE_END.finditer(self.text):
+            last_end = match.end()
+        if last_end:
+            self.text = self.text[:last_end].rstrip()
+
+    def finish(self, completion_tokens: Optional[int], finish_reason: Optional[str] = None) -> int:
+        """스트림 종료 처리 - 생성 토큰 수 반환 (사용량이 없으면 추정)"""
+        tokens = completion_tokens if completion_tokens else estimate_tokens(self.text)
+        if self.truncated is None and (
+            finish_reason == "length" or (completion_tokens and completion_tokens >= self.max_tokens)
+        ):
+            self.truncated = "max_tokens"
+        return tokens
+
+
+class GenerationPolicy:
+    """대화 단위 생성 정책 (최근 응답 길이를 반영한 적응형 토큰 예산)"""
+
+    def __init__(
+        self,
+        max_sentences: int = 3,
+        time_budget_ms: float = 8000.0,
+        min_tokens: int = 40,
+        max_tokens: int = 400,
+        history: int = 5,
+    ):
+        self.max_sentences = max_sentences
+        self.time_budget_ms = time_budget_ms
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.recent_tokens: deque = deque(maxlen=history)
+        self.turns = 0
+        self.truncated_turns = 0
+        self.generated_tokens = 0
+
+    def budget(self, question_type: str) -> int:
+        """유형 기본값과 최근 응답 길이(평균의 1.5배)를 절반씩 반영"""
+        base = QUESTION_BUDGETS.get(question_type, QUESTION_BUDGETS["normal"])
+        if self.recent_tokens:
+            adaptive = 1.5 * sum(self.recent_tokens) / len(self.recent_tokens)
+            base = (base + adaptive) / 2
+        return int(min(self.max_tokens, max(self.min_tokens, base)))
+
+    def start(self, user_message: str) -> ReplyLimiter:
+        question_type = classify_question(user_message)
+        return ReplyLimiter(question_type, self.budget(question_type), self.max_sentences, self.time_budget_ms)
+
+    def record(self, limiter: ReplyLimiter, tokens: int):
+        self.turns += 1
+        self.generated_tokens += tokens
+        if limiter.truncated:
+            self.truncated_turns += 1
+        self.recent_tokens.append(tokens)
+
+    def truncation_rate(self) -> float:
+        return self.truncated_turns / self.turns if self.turns else 0.0
@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Callable, List, Optional
+
+from .base import LLMProvider, ChatMessage
+
+logger = logging.getLogger("voice-agent.llm.prewarm")
+
+
+def prefix_key(messages: List[ChatMessage]) -> str:
+    digest = hashlib.sha256()
+    for m in messages:
+        digest.update(f"{m.role}\x00{m.content}\x01".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMPrewarmer:
+    """발화 시작 시 LLM 사전 준비 (대화 단위)
+
+    - 진행 중인 요청이 있거나 min_interval_sec 이내면 생략
+    - 같은 접두부를 reuse_sec 이내에 이미 준비했으면 생략
+    - cancel()로 진행 중인 요청 취소 (대화 종료 시)
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        on_metric: Optional[Callable[..., None]] = None,
+        min_interval_sec: float = 5.0,
+        reuse_sec: float = 60.0,
+    ):
+        self.provider = provider
+        self.on_metric = on_metric
+        self.min_interval_sec = min_interval_sec
+        self.reuse_sec = reuse_sec
+        self._task: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self._warm_key: Optional[str] = None
+        self._warm_at = 0.0
+        self._pending_key: Optional[str] = None
+
+    def trigger(self, messages: List[ChatMessage]) -> bool:
+        """사전 준비 시작 (시작했으면 True)"""
+        if not self.provider.supports_prewarm():
+            return False
+        if self._task and not self._task.done():
+            return False
+
+        now = time.monotonic()
+        key = prefix_key(messages)
+        if key == self._warm_key and now - self._warm_at < self.reuse_sec:
+            return False
+        if now - self._started_at < self.min_interval_sec:
+            return False
+
+        self._started_at = now
+        self._pending_key = key
+        self._task = asyncio.create_task(self._run(list(messages), key))
+        return True
+
+    def state(self, messages: List[ChatMessage]) -> str:
+        """요청 직전 접두부 준비 상태 (warm / in_flight / cold)"""
+        key = prefix_key(messages)
+        if key == self._warm_key and time.monotonic() - self._warm_at < self.reuse_sec:
+            return "warm"
+        if self._task and not self._task.done() and key == self._pending_key:
+            return "in_flight"
+        return "cold"
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    async def _run(self, messages: List[ChatMessage], key: str):
+        start_time = time.time()
+        result = "skipped"
+        try:
+            if await self.provider.prewarm(messages):
+                self._warm_key = key
+                self._warm_at = time.monotonic()
+                result = "warmed"
+        except asyncio.CancelledError:
+            result = "cancelled"
+            raise
+        except Exception as e:
+            result = "error"
+            logger.warning(f"LLM prewarm failed: {e}")
+        finally:
+            if self.on_metric:
+                self.on_metric(
+                    "llm_prewarm",
+                    (time.time() - start_time) * 1000,
+                    provider=self.provider.get_provider_type(),
+                    model=self.provider.get_model_name(),
+                    messages=len(messages),
+                    result=result,
+                )
@@ -0,0 +1,10 @@
+from .load import CpuSampler, JobLoadReporter, LoadEstimator, StageLatencyWindow
+from .loop import LoopMonitor
+
+__all__ = [
+    "CpuSampler",
+    "JobLoadReporter",
+    "LoadEstimator",
+    "LoopMonitor",
+    "StageLatencyWindow",
+]
@@ -0,0 +1,236 @@
+"""
+Worker 부하 추정
+Job 프로세스는 STT 대기열/단계별 지연/이벤트 루프 지연을 스냅샷 파일로 기록하고,
+Worker 메인 프로세스는 이를 합산해 LiveKit load_fnc 용 부하 점수(0~1)를 계산한다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger("voice-agent.monitoring.load")
+
+
+def percentile(values: list, q: float) -> float:
+    """단순 백분위수 (q: 0~100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return float(ordered[index])
+
+
+class StageLatencyWindow:
+    """최근 N초 동안의 단계별 지연 시간"""
+
+    def __init__(self, window_sec: float = 60.0, max_samples: int = 512):
+        self.window_sec = window_sec
+        self.samples = deque(maxlen=max_samples)
+
+    def add(self, duration_ms: float):
+        self.samples.append((time.time(), duration_ms))
+
+    def values(self) -> list:
+        cutoff = time.time() - self.window_sec
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+        return [ms for _, ms in self.samples]
+
+    def p95(self) -> float:
+        return percentile(self.values(), 95)
+
+
+class JobLoadReporter:
+    """Job 프로세스 부하 스냅샷 기록기"""
+
+    # log_metric 이벤트 → 부하 추정 단계
+    STAGE_EVENTS = {
+        "stt_transcription": "stt",
+        "llm_response": "llm",
+        "tts_synthesis": "tts",
+    }
+
+    def __init__(self, stats_dir: str, interval_sec: float = 1.0, lag_source: Optional[Callable[[], float]] = None):
+        self.stats_dir = stats_dir
+        self.interval_sec = interval_sec
+        # 이벤트 루프 지연은 LoopMonitor 측정값 사용 (없으면 0)
+        self.lag_source = lag_source
+        self.stt_pending = 0
+        self.stages = {stage: StageLatencyWindow() for stage in self.STAGE_EVENTS.values()}
+        self.loop_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def ensure_started(self):
+        """현재 이벤트 루프에서 주기적 기록 시작 (중복 호출 무시)"""
+        if self._task is None or self._task.done():
+            os.makedirs(self.stats_dir, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    def record_stage(self, event: str, duration_ms: float):
+        stage = self.STAGE_EVENTS.get(event)
+        if stage:
+            self.stages[stage].add(duration_ms)
+
+    def stt_started(self):
+        self.stt_pending += 1
+
+    def stt_finished(self):
+        self.stt_pending = max(0, self.stt_pending - 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "timestamp": time.time(),
+            "stt_pending": self.stt_pending,
+            "loop_lag_ms": round(self.loop_lag_ms, 2),
+            "p95_ms": {stage: round(w.p95(), 2) for stage, w in self.stages.items()},
+        }
+
+    async def _run(self):
+        path = os.path.join(self.stats_dir, f"{os.getpid()}.json")
+        tmp_path = path + ".tmp"
+        try:
+            while True:
+                await asyncio.sleep(self.interval_sec)
+                self.loop_lag_ms = self.lag_source() if self.lag_source else 0.0
+
+                try:
+                    with open(tmp_path, "w") as f:
+                        json.dump(self.snapshot(), f)
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    logger.debug(f"Failed to write load snapshot: {e}")
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def read_cpu_times() -> tuple[int, int]:
+    """/proc/stat 누적 (idle, total) jiffies"""
+    with open("/proc/stat") as f:
+        fields = [int(v) for v in f.readline().split()[1:]]
+    return fields[3] + (fields[4] if len(fields) > 4 else 0), sum(fields)
+
+
+class CpuSampler:
+    """고정 주기 CPU 사용률 샘플링 (백그라운드 스레드 - 호출 빈도와 무관한 측정 구간)"""
+
+    def __init__(self, interval_sec: float = 1.0, read_times: Callable[[], tuple[int, int]] = read_cpu_times):
+        self.interval_sec = interval_sec
+        self.read_times = read_times
+        self._last: Optional[tuple[int, int]] = None
+        self._usage: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self):
+        """한 구간 측정 (직전 샘플 대비 사용률 갱신)"""
+        try:
+            idle, total = self.read_times()
+        except (OSError, ValueError, IndexError):
+            return
+        last, self._last = self._last, (idle, total)
+        if last is not None and total > last[1]:
+            self._usage = 1.0 - (idle - last[0]) / (total - last[1])
+
+    def usage(self) -> float:
+        """마지막 구간 사용률 (첫 구간 전이거나 /proc/stat이 없으면 loadavg 사용)"""
+        if self._usage is not None:
+            return self._usage
+        try:
+            return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+        except OSError:
+            return 0.0
+
+    def _run(self):
+        self.sample()
+        while not self._stop.wait(self.interval_sec):
+            self.sample()
+
+
+class LoadEstimator:
+    """Worker 메인 프로세스 부하 점수 계산 (0 = 유휴, 1 = 포화)"""
+
+    def __init__(
+        self,
+        stats_dir: str,
+        stt_queue_limit: int = 4,
+        stage_slo_ms: Optional[dict] = None,
+        loop_lag_limit_ms: float = 100.0,
+        stale_sec: float = 5.0,
+        cpu_sampler: Optional[CpuSampler] = None,
+    ):
+        self.stats_dir = stats_dir
+        self.stt_queue_limit = max(1, stt_queue_limit)
+        self.stage_slo_ms = stage_slo_ms or {"stt": 1500.0, "llm": 3000.0, "tts": 1500.0}
+        self.loop_lag_limit_ms = loop_lag_limit_ms
+        self.stale_sec = stale_sec
+        self.cpu_sampler = cpu_sampler or CpuSampler()
+        self.last_components: dict = {}
+
+    def read_snapshots(self) -> list:
+        """유효한 Job 스냅샷 수집 (오래된 파일은 정리)"""
+        snapshots = []
+        if not os.path.isdir(self.stats_dir):
+            return snapshots
+
+        now = time.time()
+        for name in os.listdir(self.stats_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.stats_dir, name)
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if now - data.get("timestamp", 0) > self.stale_sec:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(data)
+        return snapshots
+
+    def cpu_usage(self) -> float:
+        """CPU 사용률 (백그라운드 샘플러의 최근 구간 값 - load_fnc/request_fnc 호출이 측정 구간을 바꾸지 않음)"""
+        self.cpu_sampler.start()
+        return self.cpu_sampler.usage()
+
+    def get_load(self) -> float:
+        """가장 포화된 자원 기준 부하 점수"""
+        snapshots = self.read_snapshots()
+
+        stt_pending = sum(s.get("stt_pending", 0) for s in snapshots)
+        loop_lag = max([s.get("loop_lag_ms", 0.0) for s in snapshots] or [0.0])
+
+        stage_ratio = 0.0
+        for stage, slo_ms in self.stage_slo_ms.items():
+            p95 = max([s.get("p95_ms", {}).get(stage, 0.0) for s in snapshots] or [0.0])
+            stage_ratio = max(stage_ratio, p95 / slo_ms if slo_ms > 0 else 0.0)
+
+        self.last_components = {
+            "jobs": len(snapshots),
+            "stt_queue": stt_pending / self.stt_queue_limit,
+            "latency": stage_ratio,
+            "loop_lag": loop_lag / self.loop_lag_limit_ms if self.loop_lag_limit_ms > 0 else 0.0,
+            "cpu": self.cpu_usage(),
+        }
+        load = max(v for k, v in self.last_components.items() if k != "jobs")
+        return min(1.0, max(0.0, load))
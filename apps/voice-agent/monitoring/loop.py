@@ -0,0 +1,167 @@
+"""
+이벤트 루프 지연 감시 + 샘플링 프로파일러
+- 하트비트 Task로 루프 지연을 연속 측정하고 백분위수를 주기적으로 보고
+- 감시 스레드가 임계값보다 오래 멈춘 루프의 스택을 캡처
+- 요청 시 일정 시간 동안 루프 스레드를 샘플링해 collapsed stack 파일 생성
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Callable, Optional
+
+from .load import percentile
+
+logger = logging.getLogger("voice-agent.monitoring.loop")
+
+
+def _collapse(frame) -> str:
+    """프레임 → flamegraph collapsed 형식 (root;...;leaf)"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class LoopMonitor:
+    """이벤트 루프 지연 감시기"""
+
+    def __init__(
+        self,
+        on_metric: Callable[..., None],
+        interval_ms: float = 50.0,
+        stall_threshold_ms: float = 100.0,
+        report_interval_sec: float = 10.0,
+        profile_dir: str = "/tmp/voice-agent-profiles",
+        profile_hz: float = 100.0,
+        profile_duration_sec: float = 30.0,
+    ):
+        self.on_metric = on_metric
+        self.interval_sec = interval_ms / 1000
+        self.stall_threshold_sec = stall_threshold_ms / 1000
+        self.report_interval_sec = report_interval_sec
+        self.profile_dir = profile_dir
+        self.profile_hz = profile_hz
+        self.profile_duration_sec = profile_duration_sec
+        self.lag_samples = deque(maxlen=4096)
+        self.recent_lag = deque(maxlen=4096)  # (측정 시각, 지연) - 보고 주기와 무관하게 유지 (부하 추정용)
+        self.stall_count = 0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._tasks: list = []
+        self._stop = threading.Event()
+        self._profiling = threading.Lock()
+
+    def start(self):
+        """현재 이벤트 루프에서 감시 시작"""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._tasks = [
+            loop.create_task(self._heartbeat()),
+            loop.create_task(self._report()),
+        ]
+        threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True).start()
+
+        try:
+            loop.add_signal_handler(signal.SIGUSR2, self.start_profile)
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.debug("SIGUSR2 profiler trigger unavailable in this process")
+
+    def stop(self):
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def lag_percentiles(self) -> dict:
+        values = list(self.lag_samples)
+        return {
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(max(values or [0.0]), 2),
+        }
+
+    def recent_lag_ms(self, window_sec: float = 5.0, q: float = 95) -> float:
+        """최근 window_sec 동안의 루프 지연 백분위수"""
+        cutoff = time.monotonic() - window_sec
+        return percentile([lag for ts, lag in self.recent_lag if ts >= cutoff], q)
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval_sec
+            await asyncio.sleep(self.interval_sec)
+            now = time.monotonic()
+            self._last_beat = now
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self.lag_samples.append(lag_ms)
+            self.recent_lag.append((now, lag_ms))
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval_sec)
+            stats = self.lag_percentiles()
+            self.lag_samples.clear()
+            self.on_metric("event_loop_lag", stats["p95_ms"], stalls=self.stall_count, **stats)
+            self.stall_count = 0
+
+    def _watchdog(self):
+        """루프가 임계값 이상 멈추면 현재 실행 중인 콜백의 스택 기록 (멈춤당 1회)"""
+        reported_beat = None
+        while not self._stop.wait(self.stall_threshold_sec / 2):
+            beat = self._last_beat
+            stalled_sec = time.monotonic() - beat - self.interval_sec
+            if stalled_sec < self.stall_threshold_sec or beat == reported_beat:
+                continue
+            reported_beat = beat
+            self.stall_count += 1
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(f"Event loop blocked for {stalled_sec * 1000:.0f}ms+, stack:\n{stack}")
+
+    def start_profile(self, duration_sec: Optional[float] = None) -> Optional[str]:
+        """루프 스레드 샘플링 프로파일 시작 (백그라운드, 결과는 collapsed stack 파일)"""
+        duration_sec = duration_sec or self.profile_duration_sec
+        if not self._profiling.acquire(blocking=False):
+            logger.info("Loop profile already running")
+            return None
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"loop-{os.getpid()}-{int(time.time())}.collapsed")
+        threading.Thread(
+            target=self._sample, args=(duration_sec, path), name="loop-profiler", daemon=True
+        ).start()
+        logger.info(f"Loop profile started for {duration_sec:.0f}s -> {path}")
+        return path
+
+    def _sample(self, duration_sec: float, path: str):
+        try:
+            stacks = Counter()
+            period = 1.0 / self.profile_hz
+            deadline = time.monotonic() + duration_sec
+            while time.monotonic() < deadline and not self._stop.is_set():
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+                time.sleep(period)
+
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            logger.info(f"Loop profile written: {path} ({sum(stacks.values())} samples)")
+        finally:
+            self._profiling.release()
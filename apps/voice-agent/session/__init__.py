@@ -0,0 +1,9 @@
+from .registry import ConversationSession, SessionRegistry
+from .store import ConversationState, ConversationStateStore
+
+__all__ = [
+    "ConversationSession",
+    "SessionRegistry",
+    "ConversationState",
+    "ConversationStateStore",
+]
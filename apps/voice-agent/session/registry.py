@@ -0,0 +1,152 @@
+"""
+대화 세션 레지스트리
+(참가자, 트랙) 단위로 handle_conversation Task를 관리하고,
+퇴장/구독 해제 시 결정적으로 취소해 스트림/버퍼/기록을 회수한다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger("voice-agent.session.registry")
+
+
+@dataclass
+class ConversationSession:
+    participant_identity: str
+    track_sid: str
+    started_at: float = field(default_factory=time.time)
+    task: Optional[asyncio.Task] = None
+    # handle_conversation이 등록하는 자원 사용량 조회 함수
+    resource_stats: Optional[Callable[[], dict]] = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.participant_identity, self.track_sid)
+
+    def is_active(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def stats(self) -> dict:
+        stats = {"live_tasks": 1 if self.is_active() else 0}
+        if self.resource_stats:
+            try:
+                extra = self.resource_stats()
+                stats.update(extra)
+                stats["live_tasks"] += extra.get("live_tasks", 0)
+            except Exception as e:
+                logger.debug(f"Failed to collect session stats: {e}")
+        return stats
+
+
+class SessionRegistry:
+    """참가자/트랙별 대화 세션 관리"""
+
+    def __init__(
+        self,
+        on_metric: Callable[..., None],
+        report_interval_sec: float = 30.0,
+        process_stats: Optional[Callable[[], dict]] = None,
+    ):
+        self.on_metric = on_metric
+        self.report_interval_sec = report_interval_sec
+        self.process_stats = process_stats
+        self._sessions: dict[tuple[str, str], ConversationSession] = {}
+        self._report_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def start(
+        self,
+        participant_identity: str,
+        track_sid: str,
+        run: Callable[[ConversationSession], Awaitable[None]],
+    ) -> Optional[ConversationSession]:
+        """세션 시작 (같은 트랙 재구독은 무시)
+
+        참가자당 활성 세션은 하나: 새 트랙을 시작하면 같은 참가자의 다른 트랙 세션은 모두 종료한다
+        (reason="replaced" - 마이크 전환/재게시 시 이전 트랙 세션이 남지 않도록).
+        """
+        key = (participant_identity, track_sid)
+        existing = self._sessions.get(key)
+        if existing and existing.is_active():
+            logger.info(f"Session already running for {participant_identity}/{track_sid}, ignoring resubscribe")
+            return None
+
+        for other_key in [k for k in self._sessions if k[0] == participant_identity and k != key]:
+            self._cancel(self._sessions[other_key], reason="replaced")
+
+        session = ConversationSession(participant_identity, track_sid)
+        self._sessions[key] = session
+        session.task = asyncio.create_task(self._run(session, run))
+
+        if self._report_task is None or self._report_task.done():
+            self._report_task = asyncio.create_task(self._report())
+        return session
+
+    def close(self, participant_identity: str, track_sid: Optional[str] = None, reason: str = "closed") -> int:
+        """참가자(또는 특정 트랙)의 세션 취소, 취소한 세션 수 반환"""
+        targets = [
+            s for k, s in self._sessions.items()
+            if k[0] == participant_identity and (track_sid is None or k[1] == track_sid)
+        ]
+        for session in targets:
+            self._cancel(session, reason)
+        return len(targets)
+
+    async def close_all(self, reason: str = "shutdown"):
+        sessions = list(self._sessions.values())
+        for session in sessions:
+            self._cancel(session, reason)
+        await asyncio.gather(*[s.task for s in sessions if s.task], return_exceptions=True)
+        if self._report_task:
+            self._report_task.cancel()
+
+    def _cancel(self, session: ConversationSession, reason: str):
+        # 취소 완료 전에 같은 트랙 재구독이 들어와도 새 세션을 시작할 수 있도록 즉시 등록 해제
+        if self._sessions.get(session.key) is session:
+            del self._sessions[session.key]
+        if session.is_active():
+            logger.info(f"Closing session {session.participant_identity}/{session.track_sid}: {reason}")
+            session.task.cancel()
+
+    async def _run(self, session: ConversationSession, run: Callable[[ConversationSession], Awaitable[None]]):
+        try:
+            await run(session)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error in handle_conversation task: {e}", exc_info=True)
+        finally:
+            if self._sessions.get(session.key) is session:
+                del self._sessions[session.key]
+            self.on_metric(
+                "session_closed",
+                (time.time() - session.started_at) * 1000,
+                participant=session.participant_identity,
+                track_sid=session.track_sid,
+                active_sessions=len(self._sessions),
+                **(self.process_stats() if self.process_stats else {})
+            )
+
+    async def _report(self):
+        """세션별 자원 사용량 주기 보고"""
+        while self._sessions:
+            await asyncio.sleep(self.report_interval_sec)
+            for session in list(self._sessions.values()):
+                self.on_metric(
+                    "session_resources",
+                    (time.time() - session.started_at) * 1000,
+                    participant=session.participant_identity,
+                    track_sid=session.track_sid,
+                    **session.stats()
+                )
+            self.on_metric(
+                "session_registry",
+                0,
+                active_sessions=len(self._sessions),
+                **(self.process_stats() if self.process_stats else {})
+            )
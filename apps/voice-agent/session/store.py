@@ -0,0 +1,208 @@
+"""
+대화 상태 저장소 (Redis write-behind)
+Worker 재시작/재배포/Job 이동 후 다시 들어온 참가자의 대화 기록을 복원한다.
+
+- 쓰기: 턴마다 키별 최신 상태만 메모리에 남기고, 백그라운드에서 모아 파이프라인 한 번으로 기록 (턴 경로 밖)
+- 읽기: 재입장 시 압축 직렬화 형태(버전 바이트 + zlib JSON)로 가져오고, 처음 사용할 때 해석
+- 키는 공용 세션 서비스(libs/redis session.service.ts)와 같은 session: 접두사 사용
+"""
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+from typing import Callable, Optional
+
+from transport.backoff import Backoff
+
+logger = logging.getLogger("voice-agent.session.store")
+
+KEY_PREFIX = "session:conversation:"
+FORMAT_VERSION = 1
+
+_ROLE_CODES = {"user": "u", "assistant": "a", "system": "s"}
+_ROLE_NAMES = {code: role for role, code in _ROLE_CODES.items()}
+
+
+def encode_state(history: list[dict], turns: int, updated_at: float) -> bytes:
+    """대화 상태 → 압축 직렬화 (역할은 한 글자 코드)"""
+    payload = {
+        "t": turns,
+        "at": round(updated_at, 3),
+        "h": [[_ROLE_CODES.get(m["role"], m["role"]), m["content"]] for m in history],
+    }
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return bytes([FORMAT_VERSION]) + zlib.compress(body)
+
+
+class ConversationState:
+    """저장된 대화 상태 (처음 접근할 때 해석)"""
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._payload: Optional[dict] = None
+
+    def _decode(self) -> dict:
+        if self._payload is None:
+            if not self.raw or self.raw[0] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported conversation state format: {self.raw[:1]!r}")
+            self._payload = json.loads(zlib.decompress(self.raw[1:]))
+        return self._payload
+
+    @property
+    def history(self) -> list[dict]:
+        return [{"role": _ROLE_NAMES.get(role, role), "content": content} for role, content in self._decode()["h"]]
+
+    @property
+    def turns(self) -> int:
+        return self._decode()["t"]
+
+    @property
+    def updated_at(self) -> float:
+        return self._decode()["at"]
+
+
+class ConversationStateStore:
+    """참가자별 대화 상태 저장소 (Job 프로세스 단위, 오류 시 일정 시간 쓰기 보류)"""
+
+    def __init__(
+        self,
+        url: str,
+        ttl_sec: float = 3600.0,
+        flush_interval_ms: float = 250.0,
+        max_batch: int = 64,
+        timeout_sec: float = 0.5,
+        retry_after_sec: float = 10.0,
+        on_metric: Optional[Callable[..., None]] = None,
+        report_interval_sec: float = 30.0,
+    ):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, socket_timeout=timeout_sec, socket_connect_timeout=timeout_sec)
+        self.ttl_sec = ttl_sec
+        self.flush_interval_sec = flush_interval_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.on_metric = on_metric
+        self.report_interval_sec = report_interval_sec
+
+        # 키 → (대화 기록 스냅샷, 턴 수, 갱신 시각) - 같은 키는 최신 상태만 유지
+        self._pending: dict[str, tuple[list, int, float]] = {}
+        self._dirty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.backoff = Backoff("Conversation state store", "suspending writes", retry_after_sec, logger)
+
+        self.totals = {"saves": 0, "flushes": 0, "written": 0, "bytes": 0, "errors": 0, "flush_ms": 0.0}
+        self._window_stats = dict(self.totals)
+        self._last_report = time.monotonic()
+
+    @staticmethod
+    def key(room: str, identity: str) -> str:
+        return f"{KEY_PREFIX}{room}:{identity}"
+
+    def available(self) -> bool:
+        return self.backoff.available()
+
+    def _fail(self, e: Exception):
+        self.backoff.fail(e)
+        self.totals["errors"] += 1
+
+    async def load(self, room: str, identity: str) -> Optional[ConversationState]:
+        """저장된 상태 조회 (없으면 None, 조회 실패/쓰기 보류 중이면 예외 - 저장된 기록 여부를 알 수 없음)"""
+        key = self.key(room, identity)
+        if key in self._pending:
+            history, turns, updated_at = self._pending[key]
+            return ConversationState(encode_state(history, turns, updated_at))
+        if not self.available():
+            raise ConnectionError("Conversation state store unavailable")
+        try:
+            raw = await self.client.get(key)
+        except Exception as e:
+            self._fail(e)
+            raise
+        return ConversationState(raw) if raw else None
+
+    def save(self, room: str, identity: str, history: list[dict], turns: int):
+        """상태 기록 예약 (직렬화/네트워크는 백그라운드 flush에서)"""
+        self._pending[self.key(room, identity)] = (list(history), turns, time.time())
+        self.totals["saves"] += 1
+        self._dirty.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await self._dirty.wait()
+            if not self.available():
+                await asyncio.sleep(self.backoff.remaining_sec())
+                continue
+            # 짧은 시간 동안 모아서 한 번에 기록 (배치가 차면 즉시)
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self) -> int:
+        """대기 중인 상태를 파이프라인 한 번으로 기록, 기록한 키 수 반환"""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            self._dirty.clear()
+            self._full.clear()
+            if not batch:
+                return 0
+
+            start_time = time.time()
+            values = {key: encode_state(*state) for key, state in batch.items()}
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for key, value in values.items():
+                        pipe.set(key, value, ex=int(self.ttl_sec))
+                    await pipe.execute()
+            except Exception as e:
+                self._fail(e)
+                # 실패한 상태는 그 사이 새로 들어온 상태가 없을 때만 되돌림
+                for key, state in batch.items():
+                    self._pending.setdefault(key, state)
+                self._dirty.set()
+                return 0
+
+            self.totals["flushes"] += 1
+            self.totals["written"] += len(values)
+            self.totals["bytes"] += sum(len(v) for v in values.values())
+            self.totals["flush_ms"] += (time.time() - start_time) * 1000
+            self._maybe_report()
+            return len(values)
+
+    async def close(self):
+        """남은 상태 기록 후 연결 종료"""
+        # flush 진행 중에 취소하면 꺼낸 상태를 잃으므로 잠금을 잡은 뒤 취소
+        async with self._flush_lock:
+            if self._task:
+                self._task.cancel()
+        if self._pending and self.available():
+            await self.flush()
+        await self.client.aclose()
+
+    def _maybe_report(self):
+        now = time.monotonic()
+        if not self.on_metric or now - self._last_report < self.report_interval_sec:
+            return
+        delta = {k: self.totals[k] - self._window_stats[k] for k in self.totals}
+        self._window_stats = dict(self.totals)
+        self._last_report = now
+        self.on_metric(
+            "session_state_flush",
+            delta["flush_ms"],
+            saves=delta["saves"],
+            flushes=delta["flushes"],
+            written=delta["written"],
+            avg_batch_size=round(delta["written"] / delta["flushes"], 2) if delta["flushes"] else 0.0,
+            avg_bytes=round(delta["bytes"] / delta["written"], 1) if delta["written"] else 0.0,
+            errors=delta["errors"],
+            pending=len(self._pending),
+        )
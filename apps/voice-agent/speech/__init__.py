@@ -0,0 +1,12 @@
+from .vad import BatchedVAD, BatchedVADStream, EnergyGate
+from .vad_client import RemoteVAD, RemoteVADStream
+from .vad_server import VADServer
+
+__all__ = [
+    "BatchedVAD",
+    "BatchedVADStream",
+    "EnergyGate",
+    "RemoteVAD",
+    "RemoteVADStream",
+    "VADServer",
+]
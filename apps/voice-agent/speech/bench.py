@@ -0,0 +1,95 @@
+"""
+VAD CPU 사용량 비교 (캡처 오디오 재생)
+같은 캡처 오디오를 N명의 참가자가 보내는 것으로 가정하고 참가자-분당 CPU 시간을 측정한다.
+
+    baseline  참가자마다 livekit silero VADStream
+    batched   BatchedVAD (게이트 없음)
+    gated     BatchedVAD + EnergyGate
+
+실행:
+    python -m speech.bench <capture 파일> --participants 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from capture import CaptureReader
+
+from .vad import BatchedVAD, EnergyGate
+
+
+async def _drive(streams, frames) -> int:
+    """모든 스트림에 프레임을 넣고 이벤트를 끝까지 소비 (발화 시작 이벤트 수 반환)"""
+    from livekit.agents import vad as agents_vad
+
+    async def consume(stream):
+        starts = 0
+        async for event in stream:
+            if event.type == agents_vad.VADEventType.START_OF_SPEECH:
+                starts += 1
+        return starts
+
+    consumers = [asyncio.create_task(consume(s)) for s in streams]
+    for frame in frames:
+        for stream in streams:
+            stream.push_frame(frame)
+        await asyncio.sleep(0)
+    for stream in streams:
+        stream.end_input()
+    return sum(await asyncio.gather(*consumers))
+
+
+async def run_variant(name: str, frames, participants: int, audio_sec: float) -> dict:
+    if name == "baseline":
+        from livekit.plugins import silero
+
+        vad = silero.VAD.load()
+    else:
+        vad = BatchedVAD.load(gate=EnergyGate() if name == "gated" else None, batch_wait_ms=0)
+
+    streams = [vad.stream() for _ in range(participants)]
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    speech_starts = await _drive(streams, frames)
+    cpu_ms = (time.process_time() - cpu_start) * 1000
+
+    result = {
+        "variant": name,
+        "participants": participants,
+        "speech_starts": speech_starts,
+        "cpu_ms": round(cpu_ms, 1),
+        "wall_ms": round((time.perf_counter() - wall_start) * 1000, 1),
+        "cpu_ms_per_participant_min": round(cpu_ms / (audio_sec * participants / 60), 2),
+    }
+    if isinstance(vad, BatchedVAD):
+        result["gated_ratio"] = round(vad.totals["gated"] / max(1, vad.totals["windows"]), 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare VAD CPU time per participant-minute")
+    parser.add_argument("path")
+    parser.add_argument("--participants", type=int, default=4)
+    parser.add_argument("--variant", action="append", choices=["baseline", "batched", "gated"])
+    args = parser.parse_args()
+
+    from livekit import rtc
+
+    with CaptureReader(args.path) as reader:
+        frames = [
+            rtc.AudioFrame(f.data, f.sample_rate, f.num_channels, f.samples_per_channel)
+            for f in reader.audio_frames()
+        ]
+    if not frames:
+        raise SystemExit("No audio frames in capture")
+    audio_sec = sum(f.samples_per_channel / f.sample_rate for f in frames)
+
+    for name in args.variant or ["baseline", "batched", "gated"]:
+        result = asyncio.run(run_variant(name, frames, args.participants, audio_sec))
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+배치 Silero VAD 프론트엔드
+
+- 에너지/영교차율 게이트: 명백한 무음 윈도우는 모델 추론 생략
+- BatchedVAD에 연결된 모든 스트림의 윈도우를 모아 홉마다 한 번의 ONNX 호출로 추론
+  (Job 프로세스 안에서는 같은 방의 참가자끼리만 묶이므로, 호스트의 모든 방을 묶으려면
+  speech.vad_server를 실행하고 RemoteVAD로 연결)
+- 스트림 인터페이스(push_frame / async iteration / aclose)는 livekit VADStream과 동일
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+from livekit import rtc
+from livekit.agents import vad as agents_vad
+
+logger = logging.getLogger("voice-agent.speech.vad")
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 512  # 32ms
+CONTEXT_SAMPLES = 64
+STATE_SHAPE = (2, 128)
+EXP_FILTER_ALPHA = 0.35  # livekit silero 플러그인과 동일한 확률 평활화
+
+
+class EnergyGate:
+    """벡터화된 에너지/영교차율 무음 판정 ([B, N] 윈도우 → [B] bool)"""
+
+    def __init__(self, threshold_db: float = -50.0, zcr_max: float = 0.35, noise_margin_db: float = 10.0):
+        self.threshold_db = threshold_db
+        self.zcr_max = zcr_max
+        self.noise_margin_db = noise_margin_db
+
+    def silent(self, windows: np.ndarray) -> np.ndarray:
+        rms = np.sqrt(np.mean(windows * windows, axis=1))
+        level_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+        zcr = np.mean(np.signbit(windows[:, 1:]) != np.signbit(windows[:, :-1]), axis=1)
+        # 매우 작은 에너지 또는 약한 에너지 + 높은 영교차율(광대역 잡음)
+        return (level_db < self.threshold_db) | (
+            (level_db < self.threshold_db + self.noise_margin_db) & (zcr > self.zcr_max)
+        )
+
+
+class FrameConverter:
+    """입력 프레임 → 16kHz 모노 int16 PCM (필요 시 리샘플)"""
+
+    def __init__(self):
+        self._resampler: Optional[rtc.AudioResampler] = None
+
+    def convert(self, frame) -> list[np.ndarray]:
+        if frame.sample_rate != SAMPLE_RATE:
+            if self._resampler is None:
+                self._resampler = rtc.AudioResampler(
+                    input_rate=frame.sample_rate,
+                    output_rate=SAMPLE_RATE,
+                    quality=rtc.AudioResamplerQuality.QUICK,  # VAD에는 낮은 품질로 충분
+                )
+            frames = self._resampler.push(frame)
+        else:
+            frames = [frame]
+
+        chunks = []
+        for f in frames:
+            pcm = np.frombuffer(f.data, dtype=np.int16)
+            if f.num_channels > 1:
+                pcm = pcm.reshape(-1, f.num_channels).mean(axis=1).astype(np.int16)
+            chunks.append(pcm)
+        return chunks
+
+
+def event_to_dict(event: agents_vad.VADEvent) -> dict:
+    """VAD 이벤트 직렬화 (공유 VAD 서버 → 클라이언트)"""
+    return {
+        "type": "start" if event.type == agents_vad.VADEventType.START_OF_SPEECH else "end",
+        "samples_index": event.samples_index,
+        "timestamp": event.timestamp,
+        "speech_duration": event.speech_duration,
+        "silence_duration": event.silence_duration,
+        "probability": event.probability,
+        "speaking": event.speaking,
+    }
+
+
+def event_from_dict(data: dict) -> agents_vad.VADEvent:
+    return agents_vad.VADEvent(
+        type=(
+            agents_vad.VADEventType.START_OF_SPEECH if data["type"] == "start"
+            else agents_vad.VADEventType.END_OF_SPEECH
+        ),
+        samples_index=data["samples_index"],
+        timestamp=data["timestamp"],
+        speech_duration=data["speech_duration"],
+        silence_duration=data["silence_duration"],
+        frames=[],
+        probability=data["probability"],
+        speaking=data["speaking"],
+    )
+
+
+class BatchedVADStream:
+    """참가자별 VAD 스트림 (추론은 BatchedVAD가 일괄 수행)"""
+
+    def __init__(self, vad: "BatchedVAD"):
+        self._vad = vad
+        self._pending: list[np.ndarray] = []
+        self._pending_samples = 0
+        self._converter = FrameConverter()
+        self._input_ended = False
+        self._closed = False
+        self._events: asyncio.Queue = asyncio.Queue()
+
+        # 모델 상태 (스트림마다 독립)
+        self.context = np.zeros(CONTEXT_SAMPLES, dtype=np.float32)
+        self.state = np.zeros(STATE_SHAPE, dtype=np.float32)
+        self.silent_run = 0  # 연속 무음 윈도우 수
+
+        # 발화 판정 상태
+        self.speaking = False
+        self._probability = -1.0
+        self._speech_duration = 0.0
+        self._silence_duration = 0.0
+        self._samples_index = 0
+
+    def push_frame(self, frame):
+        if self._closed or self._input_ended:
+            return
+        for pcm in self._converter.convert(frame):
+            self.push_pcm(pcm)
+
+    def push_pcm(self, pcm: np.ndarray):
+        """16kHz 모노 int16 PCM 추가"""
+        if self._closed or self._input_ended or not len(pcm):
+            return
+        self._pending.append(pcm.astype(np.float32) / 32767.0)
+        self._pending_samples += len(pcm)
+        if self._pending_samples >= WINDOW_SAMPLES:
+            self._vad.wake()
+
+    def end_input(self):
+        self._input_ended = True
+        self._vad.wake()
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._vad.remove(self)
+        self._events.put_nowait(None)
+
+    def has_window(self) -> bool:
+        return self._pending_samples >= WINDOW_SAMPLES
+
+    def take_window(self) -> np.ndarray:
+        buffer = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+        window, rest = buffer[:WINDOW_SAMPLES], buffer[WINDOW_SAMPLES:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_samples = len(rest)
+        return window
+
+    def finished(self) -> bool:
+        return self._input_ended and not self.has_window()
+
+    def update(self, probability: float, activation_threshold: float, min_speech: float, min_silence: float):
+        """윈도우 확률로 발화 시작/종료 판정 (livekit silero 플러그인과 같은 규칙)"""
+        window_duration = WINDOW_SAMPLES / SAMPLE_RATE
+        if self._probability < 0:
+            self._probability = probability
+        else:
+            self._probability = EXP_FILTER_ALPHA * self._probability + (1 - EXP_FILTER_ALPHA) * probability
+        self._samples_index += WINDOW_SAMPLES
+
+        event_type = None
+        if self._probability >= activation_threshold:
+            self._speech_duration += window_duration
+            self._silence_duration = 0.0
+            if not self.speaking and self._speech_duration >= min_speech:
+                self.speaking = True
+                event_type = agents_vad.VADEventType.START_OF_SPEECH
+        else:
+            self._silence_duration += window_duration
+            self._speech_duration = 0.0
+            if self.speaking and self._silence_duration >= min_silence:
+                self.speaking = False
+                event_type = agents_vad.VADEventType.END_OF_SPEECH
+
+        if event_type is not None:
+            self._events.put_nowait(agents_vad.VADEvent(
+                type=event_type,
+                samples_index=self._samples_index,
+                timestamp=self._samples_index / SAMPLE_RATE,
+                speech_duration=self._speech_duration,
+                silence_duration=self._silence_duration,
+                frames=[],
+                probability=self._probability,
+                speaking=self.speaking,
+            ))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._events.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class BatchedVAD:
+    """공용 Silero VAD - 연결된 스트림의 준비된 윈도우를 모아 홉마다 한 번에 추론
+
+    게이트로 추론을 생략한 구간에서도 컨텍스트 샘플은 갱신하고, RNN 상태는 마지막 추론 값을 유지한다.
+    (LSTM 셀 상태는 무음에서도 수렴하지 않아 정확히 재현할 수 없고, 초기값으로 되돌리면
+    무음 뒤 발화 확률이 크게 낮아져 순차 Silero와 발화 경계가 어긋난다)
+    """
+
+    def __init__(
+        self,
+        session,
+        on_metric: Optional[Callable[..., None]] = None,
+        activation_threshold: float = 0.5,
+        min_speech_duration: float = 0.05,
+        min_silence_duration: float = 0.55,
+        gate: Optional[EnergyGate] = None,
+        hangover_ms: float = 300.0,
+        batch_wait_ms: float = 4.0,
+        report_interval_sec: float = 30.0,
+    ):
+        self.session = session
+        self.on_metric = on_metric
+        self.activation_threshold = activation_threshold
+        self.min_speech_duration = min_speech_duration
+        self.min_silence_duration = min_silence_duration
+        self.gate = gate
+        self.hangover_windows = int(hangover_ms / (WINDOW_SAMPLES / SAMPLE_RATE * 1000))
+        self.batch_wait_ms = batch_wait_ms
+        self.report_interval_sec = report_interval_sec
+
+        self._streams: list[BatchedVADStream] = []
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad-batch")
+        self._sr = np.array(SAMPLE_RATE, dtype=np.int64)
+
+        self.totals = {"windows": 0, "gated": 0, "batches": 0, "cpu_ms": 0.0}
+        self._window_stats = dict(self.totals)
+        self._last_report = time.monotonic()
+
+    @classmethod
+    def load(cls, **kwargs) -> "BatchedVAD":
+        """livekit silero 플러그인에 포함된 ONNX 모델로 생성"""
+        from livekit.plugins.silero import onnx_model
+
+        return cls(onnx_model.new_inference_session(force_cpu=True), **kwargs)
+
+    def stream(self) -> BatchedVADStream:
+        stream = BatchedVADStream(self)
+        self._streams.append(stream)
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        return stream
+
+    def wake(self):
+        self._ready.set()
+
+    def remove(self, stream: BatchedVADStream):
+        if stream in self._streams:
+            self._streams.remove(stream)
+        self._ready.set()
+
+    def _infer(self, inputs: np.ndarray, states: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]:
+        """executor 스레드에서 실행 (스레드 CPU 시간 함께 반환)"""
+        cpu_start = time.thread_time()
+        out, new_states = self.session.run(None, {"input": inputs, "state": states, "sr": self._sr})
+        return out.reshape(-1), new_states, (time.thread_time() - cpu_start) * 1000
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._streams:
+            await self._ready.wait()
+            self._ready.clear()
+            if self.batch_wait_ms > 0:
+                # 다른 참가자의 프레임이 도착할 시간을 잠깐 허용해 한 홉으로 묶음
+                await asyncio.sleep(self.batch_wait_ms / 1000)
+
+            try:
+                # 스트림당 한 윈도우씩 라운드 단위로 처리 (RNN 상태는 스트림 내에서 순차적)
+                while True:
+                    ready = [s for s in self._streams if s.has_window()]
+                    if not ready:
+                        break
+                    await self._process(ready, loop)
+            except Exception as e:
+                logger.error(f"Batched VAD inference failed: {e}", exc_info=True)
+
+            for stream in [s for s in self._streams if s.finished()]:
+                await stream.aclose()
+            self._maybe_report()
+
+    async def _process(self, ready: list[BatchedVADStream], loop: asyncio.AbstractEventLoop):
+        cpu_start = time.thread_time()
+        windows = np.stack([s.take_window() for s in ready])
+        probabilities = np.zeros(len(ready), dtype=np.float32)
+
+        run = np.ones(len(ready), dtype=bool)
+        if self.gate:
+            silent = self.gate.silent(windows)
+            for i, stream in enumerate(ready):
+                stream.silent_run = stream.silent_run + 1 if silent[i] else 0
+                # 무음 직후 hangover 동안은 모델이 감쇠를 관찰하도록 추론 유지
+                run[i] = stream.silent_run <= self.hangover_windows
+
+        cpu_ms = (time.thread_time() - cpu_start) * 1000
+        indices = np.flatnonzero(run)
+        if len(indices):
+            batch = [ready[i] for i in indices]
+            inputs = np.concatenate(
+                [np.stack([s.context for s in batch]), windows[indices]], axis=1
+            )
+            states = np.stack([s.state for s in batch], axis=1)
+            out, new_states, infer_cpu_ms = await loop.run_in_executor(self._executor, self._infer, inputs, states)
+            probabilities[indices] = out
+            cpu_ms += infer_cpu_ms
+            for j, stream in enumerate(batch):
+                stream.state = new_states[:, j].copy()
+            self.totals["batches"] += 1
+
+        cpu_start = time.thread_time()
+        for i, stream in enumerate(ready):
+            stream.context = windows[i, -CONTEXT_SAMPLES:].copy()
+            stream.update(
+                float(probabilities[i]),
+                self.activation_threshold,
+                self.min_speech_duration,
+                self.min_silence_duration,
+            )
+        cpu_ms += (time.thread_time() - cpu_start) * 1000
+
+        self.totals["windows"] += len(ready)
+        self.totals["gated"] += int(len(ready) - len(indices))
+        self.totals["cpu_ms"] += cpu_ms
+
+    @staticmethod
+    def cpu_ms_per_participant_minute(cpu_ms: float, windows: int) -> float:
+        audio_minutes = windows * WINDOW_SAMPLES / SAMPLE_RATE / 60
+        return cpu_ms / audio_minutes if audio_minutes else 0.0
+
+    def _maybe_report(self):
+        now = time.monotonic()
+        if not self.on_metric or now - self._last_report < self.report_interval_sec:
+            return
+        delta = {k: self.totals[k] - self._window_stats[k] for k in self.totals}
+        self._window_stats = dict(self.totals)
+        self._last_report = now
+        if not delta["windows"]:
+            return
+        self.on_metric(
+            "vad_batch",
+            delta["cpu_ms"],
+            streams=len(self._streams),
+            windows=delta["windows"],
+            gated_ratio=round(delta["gated"] / delta["windows"], 3),
+            avg_batch_size=round((delta["windows"] - delta["gated"]) / delta["batches"], 2) if delta["batches"] else 0.0,
+            cpu_ms_per_participant_min=round(self.cpu_ms_per_participant_minute(delta["cpu_ms"], delta["windows"]), 2),
+        )
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+
+from transport.backoff import Backoff
+from transport.framing import read_message
+
+from .vad import FrameConverter, event_from_dict
+from .vad_server import encode_pcm
+
+logger = logging.getLogger("voice-agent.speech.vad_client")
+
+
+class RemoteVAD:
+    """공유 VAD 서버(speech.vad_server) 클라이언트 (silero.VAD / BatchedVAD 대체)
+
+    서버에 연결할 수 없거나 스트림 도중 연결이 끊기면 프로세스 내 VAD로 대체하고,
+    retry_after_sec 동안은 새 스트림도 바로 프로세스 내 VAD를 사용한다.
+    서버가 멈춰 보내지 못한 오디오가 max_buffer_bytes를 넘어도 연결을 끊고 대체한다 (밀린 오디오는 버림).
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        fallback: Callable[[], object],
+        connect_timeout: float = 1.0,
+        retry_after_sec: float = 10.0,
+        max_buffer_bytes: int = 64 * 1024,
+    ):
+        self.socket_path = socket_path
+        self.fallback = fallback  # 지연 생성 (.stream()을 가진 VAD 반환)
+        self.connect_timeout = connect_timeout
+        self.max_buffer_bytes = max_buffer_bytes  # 16kHz int16 기준 약 2초
+        self.backoff = Backoff(f"VAD server ({socket_path})", "using in-process VAD", retry_after_sec, logger)
+
+    def available(self) -> bool:
+        return self.backoff.available()
+
+    def stream(self) -> "RemoteVADStream":
+        return RemoteVADStream(self)
+
+
+class RemoteVADStream:
+    """서버 스트림 (연결 전 프레임은 버퍼링, 실패 시 프로세스 내 스트림으로 전환)"""
+
+    def __init__(self, vad: RemoteVAD):
+        self._vad = vad
+        self._converter = FrameConverter()
+        self._buffered: list[np.ndarray] = []
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._local = None
+        self._stall_error: Optional[Exception] = None
+        self._input_ended = False
+        self._closed = False
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def push_frame(self, frame):
+        if self._closed or self._input_ended:
+            return
+        for pcm in self._converter.convert(frame):
+            if self._writer is not None and not self._stalled():
+                # 작은 오디오 청크라 drain 없이 버퍼에 기록 (쌓인 양은 _stalled에서 확인)
+                self._writer.write(encode_pcm(pcm))
+            elif self._local is not None:
+                self._local.push_pcm(pcm)
+            else:
+                self._buffered.append(pcm)
+
+    def _stalled(self) -> bool:
+        """서버가 읽지 않아 쓰기 버퍼가 상한을 넘으면 연결을 끊음 (_run이 프로세스 내 VAD로 전환)"""
+        pending = self._writer.transport.get_write_buffer_size()
+        if pending <= self._vad.max_buffer_bytes:
+            return False
+        self._stall_error = ConnectionError(f"VAD server stalled with {pending} bytes unsent")
+        self._writer.transport.abort()
+        self._writer = None
+        return True
+
+    def end_input(self):
+        if self._input_ended:
+            return
+        self._input_ended = True
+        if self._writer is not None:
+            self._writer.write(encode_pcm(np.zeros(0, dtype=np.int16)))
+        elif self._local is not None:
+            self._local.end_input()
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        await self._shutdown()
+        self._events.put_nowait(None)
+
+    async def _shutdown(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._local is not None:
+            await self._local.aclose()
+
+    async def _run(self):
+        try:
+            if self._vad.available():
+                try:
+                    if await self._run_remote():
+                        return
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+                    self._vad.backoff.fail(self._stall_error or e)
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            await self._run_local()
+        finally:
+            if not self._closed:
+                self._closed = True
+                await self._shutdown()
+                self._events.put_nowait(None)
+
+    async def _run_remote(self) -> bool:
+        """서버 스트림 처리 (서버가 스트림 종료를 알리면 True)"""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(self._vad.socket_path), timeout=self._vad.connect_timeout
+        )
+        self._writer = writer
+        for pcm in self._buffered:
+            writer.write(encode_pcm(pcm))
+        self._buffered = []
+        if self._input_ended:
+            writer.write(encode_pcm(np.zeros(0, dtype=np.int16)))
+
+        while True:
+            message = await read_message(reader)
+            if message.get("type") == "done":
+                return True
+            self._events.put_nowait(event_from_dict(message))
+
+    async def _run_local(self):
+        # 서버 도중 실패 시 이미 보낸 오디오는 다시 보내지 않고 이후 프레임부터 처리
+        self._local = self._vad.fallback().stream()
+        for pcm in self._buffered:
+            self._local.push_pcm(pcm)
+        self._buffered = []
+        if self._input_ended:
+            self._local.end_input()
+        async for event in self._local:
+            self._events.put_nowait(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._events.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
@@ -0,0 +1,143 @@
+"""
+공유 VAD 추론 서버
+Job 프로세스마다 BatchedVAD를 두면 같은 방의 참가자끼리만 배치되므로,
+호스트당 하나의 프로세스가 BatchedVAD를 소유하고 모든 방의 스트림을 한 홉으로 묶는다.
+
+연결 하나 = VAD 스트림 하나
+- 클라이언트 → 서버: 4바이트 길이 + 16kHz 모노 int16 PCM (길이 0 = 입력 종료)
+- 서버 → 클라이언트: 길이 접두 JSON 이벤트, 스트림이 끝나면 {"type": "done"} 후 연결 종료
+
+실행: python -m speech.vad_server
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from transport.framing import write_message
+
+from .vad import BatchedVAD, EnergyGate, event_to_dict
+
+logger = logging.getLogger("voice-agent.speech.vad_server")
+
+VAD_SERVER_SOCKET = os.getenv("VAD_SERVER_SOCKET", "/tmp/voice-agent-vad.sock")
+
+_PCM_HEADER = struct.Struct(">I")
+MAX_PCM_BYTES = 64 * 1024
+
+
+def encode_pcm(pcm: np.ndarray) -> bytes:
+    """길이 접두 PCM 청크 직렬화 (빈 청크 = 입력 종료)"""
+    data = np.ascontiguousarray(pcm, dtype=np.int16).tobytes()
+    return _PCM_HEADER.pack(len(data)) + data
+
+
+async def read_pcm(reader: asyncio.StreamReader) -> Optional[np.ndarray]:
+    """길이 접두 PCM 청크 수신 (입력 종료면 None)"""
+    (length,) = _PCM_HEADER.unpack(await reader.readexactly(_PCM_HEADER.size))
+    if length > MAX_PCM_BYTES or length % 2:
+        raise ValueError(f"Invalid VAD chunk: {length} bytes")
+    if length == 0:
+        return None
+    return np.frombuffer(await reader.readexactly(length), dtype=np.int16)
+
+
+class VADServer:
+    """BatchedVAD 공유 서버 (호스트의 모든 Job 프로세스 스트림을 함께 배치)"""
+
+    def __init__(self, vad_factory: Callable[[], BatchedVAD], socket_path: str = VAD_SERVER_SOCKET):
+        self.vad_factory = vad_factory
+        self.socket_path = socket_path
+        self.vad: Optional[BatchedVAD] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._client_tasks: set[asyncio.Task] = set()
+
+    async def start(self):
+        """모델 로드 후 소켓 바인딩 (BatchedVAD는 이벤트 루프 안에서 생성)"""
+        self.vad = self.vad_factory()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        logger.info(f"VAD server listening on {self.socket_path}")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """소켓 닫기 + 연결 처리 취소"""
+        if self._server:
+            self._server.close()
+        tasks = list(self._client_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        stream = self.vad.stream()
+        send_task = asyncio.create_task(self._send_events(stream, writer))
+        try:
+            while True:
+                pcm = await read_pcm(reader)
+                if pcm is None:
+                    stream.end_input()
+                    break
+                stream.push_pcm(pcm)
+            # 남은 윈도우 처리 후 스트림이 닫히면 done 전송
+            await send_task
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            await stream.aclose()
+            send_task.cancel()
+            await asyncio.gather(send_task, return_exceptions=True)
+            writer.close()
+            self._client_tasks.discard(task)
+
+    @staticmethod
+    async def _send_events(stream, writer: asyncio.StreamWriter):
+        try:
+            async for event in stream:
+                await write_message(writer, event_to_dict(event))
+            await write_message(writer, {"type": "done"})
+        except ConnectionError:
+            pass
+
+
+def _log_metric(event: str, duration_ms: float, **kwargs):
+    """메트릭 로그 출력 (agent.log_metric과 같은 형식)"""
+    metric = {"event": event, "duration_ms": round(float(duration_ms), 2), "timestamp": time.time(), **kwargs}
+    logger.info(f"METRIC: {json.dumps(metric)}")
+
+
+def _load_batched_vad() -> BatchedVAD:
+    gate_enabled = os.getenv("VAD_GATE_ENABLED", "true").lower() == "true"
+    return BatchedVAD.load(
+        on_metric=_log_metric,
+        gate=EnergyGate(float(os.getenv("VAD_GATE_DB", "-50")), float(os.getenv("VAD_GATE_ZCR", "0.35"))) if gate_enabled else None,
+        hangover_ms=float(os.getenv("VAD_GATE_HANGOVER_MS", "300")),
+        batch_wait_ms=float(os.getenv("VAD_BATCH_WAIT_MS", "4")),
+        report_interval_sec=float(os.getenv("VAD_METRICS_INTERVAL_SEC", "30")),
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(VADServer(_load_batched_vad).serve_forever())
@@ -0,0 +1,11 @@
+from .client import STTClient, STTResult
+from .server import STTServer
+from .calibration import WhisperCalibrator, CalibrationResult
+
+__all__ = [
+    "STTClient",
+    "STTResult",
+    "STTServer",
+    "WhisperCalibrator",
+    "CalibrationResult",
+]
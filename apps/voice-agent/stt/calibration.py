@@ -0,0 +1,375 @@
+"""
+Whisper 추론 설정 보정 (compute_type / cpu_threads / num_workers)
+머신에서 처음 시작할 때 기준 음성으로 후보 설정을 측정해 목표 지연(RTF) 안에서 처리량이 가장 높은 설정을 고르고,
+CPU 모델별로 결과 파일에 저장해 이후 시작에서는 측정 없이 재사용한다.
+Worker 시작 시에는 백그라운드 스레드에서 측정하고 (시작을 막지 않음), 결과가 저장되기 전까지는 기본 설정을 쓴다.
+
+기준 음성(WHISPER_CALIBRATION_CLIP)은 실제 한국어 발화여야 한다 - 비음성은 디코딩 비용이 실제 발화와 달라
+결과가 대표성이 없으므로, 설정하지 않으면 측정하지 않고 기본 설정을 쓴다.
+
+실행 (결과를 미리 만들어 두거나 다시 측정):
+    python -m stt.calibration --model base --clip reference-ko.wav
+    python -m stt.calibration --model base --clip reference-ko.wav --force
+"""
+
+import argparse
+import fcntl
+import json
+import logging
+import os
+import platform
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("voice-agent.stt.calibration")
+
+WHISPER_CALIBRATION_FILE = os.getenv(
+    "WHISPER_CALIBRATION_FILE", os.path.expanduser("~/.cache/voice-agent/whisper-calibration.json")
+)
+WHISPER_CALIBRATION_COMPUTE_TYPES = os.getenv("WHISPER_CALIBRATION_COMPUTE_TYPES", "int8,int8_float32,float32")
+WHISPER_CALIBRATION_THREADS = os.getenv("WHISPER_CALIBRATION_THREADS", "")  # 비우면 코어 수의 1/4, 1/2, 전체
+WHISPER_CALIBRATION_WORKERS = os.getenv("WHISPER_CALIBRATION_WORKERS", "1,2")
+WHISPER_CALIBRATION_TARGET_RTF = float(os.getenv("WHISPER_CALIBRATION_TARGET_RTF", "0.5"))  # 처리 시간 / 음성 길이
+WHISPER_CALIBRATION_MAX_SEC = float(os.getenv("WHISPER_CALIBRATION_MAX_SEC", "300"))  # 측정 시간 상한
+WHISPER_CALIBRATION_CLIP = os.getenv("WHISPER_CALIBRATION_CLIP", "")  # 기준 음성 파일 (비우면 보정 생략)
+WHISPER_CALIBRATION_RETRY_SEC = float(os.getenv("WHISPER_CALIBRATION_RETRY_SEC", "86400"))  # 실패 후 재측정 대기
+
+SAMPLE_RATE = 16000
+REFERENCE_CLIP_SEC = 6.0
+
+# 운영과 같은 인식 옵션 + 디코딩 길이 상한 (후보 간 디코딩 비용을 비슷하게 유지)
+DEFAULT_TRANSCRIBE_OPTIONS = dict(
+    language="ko",
+    beam_size=5,
+    vad_filter=False,
+    log_prob_threshold=-2.0,
+    condition_on_previous_text=False,
+)
+MAX_NEW_TOKENS = 64
+
+
+@dataclass
+class CalibrationResult:
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    rtf: float          # 동시 요청 num_workers개일 때 요청당 처리 시간 / 음성 길이
+    throughput: float   # 벽시계 1초당 처리한 음성 초
+    cpu_model: str = ""
+    source: str = "calibrated"  # calibrated / cache
+    calibrated_at: float = 0.0
+    calibration_ms: float = 0.0
+    candidates: List[dict] = field(default_factory=list)
+
+
+def cpu_model() -> str:
+    """CPU 모델명 (/proc/cpuinfo, 없으면 platform)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name.strip() in ("model name", "Hardware", "cpu model") and value.strip():
+                    return value.strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine() or "unknown"
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def reference_clip(path: str, duration_sec: float = REFERENCE_CLIP_SEC) -> np.ndarray:
+    """기준 음성 파일 (16kHz float32, 앞 duration_sec초)"""
+    from faster_whisper.audio import decode_audio
+
+    audio = decode_audio(path, sampling_rate=SAMPLE_RATE)[: int(duration_sec * SAMPLE_RATE)]
+    if len(audio) < SAMPLE_RATE:
+        raise ValueError(f"Calibration clip too short: {path}")
+    return audio
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def load_whisper_model(model_size: str, device: str, compute_type: str, cpu_threads: int, num_workers: int):
+    """기본 모델 팩토리 (faster-whisper)"""
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+def supported_compute_types(device: str) -> set:
+    """장치에서 지원하는 compute_type (CTranslate2)"""
+    import ctranslate2
+
+    return set(ctranslate2.get_supported_compute_types(device))
+
+
+class WhisperCalibrator:
+    """CPU 모델별 Whisper 설정 보정 및 결과 캐시
+
+    model_factory(model_size, device, compute_type, cpu_threads, num_workers)는 transcribe()를 가진 모델을,
+    supported_types는 측정 가능한 compute_type 목록을 대체한다 (기본: faster-whisper / CTranslate2).
+    실패도 결과 파일에 기록해 retry_after_sec 동안은 다시 측정하지 않는다.
+    """
+
+    def __init__(
+        self,
+        model_size: str,
+        device: str = "cpu",
+        cache_path: str = WHISPER_CALIBRATION_FILE,
+        clip_path: str = WHISPER_CALIBRATION_CLIP,
+        compute_types: Optional[List[str]] = None,
+        thread_options: Optional[List[int]] = None,
+        worker_options: Optional[List[int]] = None,
+        target_rtf: float = WHISPER_CALIBRATION_TARGET_RTF,
+        max_sec: float = WHISPER_CALIBRATION_MAX_SEC,
+        transcribe_options: Optional[dict] = None,
+        repeats: int = 2,
+        model_factory: Callable[..., object] = load_whisper_model,
+        supported_types: Optional[Iterable[str]] = None,
+        retry_after_sec: float = WHISPER_CALIBRATION_RETRY_SEC,
+    ):
+        self.model_size = model_size
+        self.device = device
+        self.cache_path = cache_path
+        self.clip_path = clip_path
+        self.cpus = available_cpus()
+        self.cpu_model = cpu_model()
+        self.compute_types = compute_types or [c.strip() for c in WHISPER_CALIBRATION_COMPUTE_TYPES.split(",") if c.strip()]
+        self.thread_options = thread_options or _parse_ints(WHISPER_CALIBRATION_THREADS) or sorted(
+            {max(1, self.cpus // 4), max(1, self.cpus // 2), self.cpus}
+        )
+        self.worker_options = worker_options or _parse_ints(WHISPER_CALIBRATION_WORKERS) or [1]
+        self.target_rtf = target_rtf
+        self.max_sec = max_sec
+        self.transcribe_options = {**(transcribe_options or DEFAULT_TRANSCRIBE_OPTIONS), "max_new_tokens": MAX_NEW_TOKENS}
+        self.repeats = max(1, repeats)
+        self.model_factory = model_factory
+        self.supported_types = set(supported_types) if supported_types is not None else None
+        self.retry_after_sec = retry_after_sec
+
+    def key(self) -> str:
+        """결과 캐시 키 (CPU 모델 + 사용 가능 코어 수 + 모델 + 후보 동시성)"""
+        workers = ",".join(str(w) for w in self.worker_options)
+        return f"{self.cpu_model}|cpus={self.cpus}|{self.model_size}|{self.device}|workers={workers}"
+
+    def candidates(self) -> List[tuple[str, int, int]]:
+        """(compute_type, cpu_threads, num_workers) 후보 - 스레드 합이 코어 수를 넘는 조합은 제외"""
+        supported = self.supported_types if self.supported_types is not None else supported_compute_types(self.device)
+        result = []
+        for compute_type in self.compute_types:
+            if compute_type not in supported:
+                logger.info(f"Skipping unsupported compute_type on {self.device}: {compute_type}")
+                continue
+            for workers in self.worker_options:
+                for threads in self.thread_options:
+                    if threads * workers <= self.cpus or (threads == 1 and workers == 1):
+                        result.append((compute_type, threads, workers))
+        return result
+
+    def _read_cache(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load_cached(self) -> Optional[CalibrationResult]:
+        entry = self._read_cache().get(self.key())
+        if not entry or entry.get("failed"):
+            return None
+        try:
+            return CalibrationResult(**{**entry, "source": "cache"})
+        except TypeError:
+            logger.warning(f"Ignoring malformed calibration entry: {self.key()}")
+            return None
+
+    def recently_failed(self) -> bool:
+        """retry_after_sec 이내에 측정이 실패했는지"""
+        entry = self._read_cache().get(self.key())
+        return bool(entry and entry.get("failed") and time.time() - entry.get("failed_at", 0.0) < self.retry_after_sec)
+
+    def _save(self, result: CalibrationResult):
+        self._write_entry(asdict(result))
+
+    def _save_failure(self, error: str):
+        self._write_entry({"failed": True, "failed_at": time.time(), "error": error, "cpu_model": self.cpu_model})
+
+    def _write_entry(self, entry: dict):
+        entries = self._read_cache()
+        entries[self.key()] = entry
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def get_or_calibrate(self, force: bool = False, blocking: bool = True) -> Optional[CalibrationResult]:
+        """저장된 결과 반환, 없으면 측정 (같은 파일을 쓰는 프로세스 간 잠금 - 한 번만 측정)
+
+        blocking=False면 다른 프로세스가 측정 중일 때 기다리지 않고 None 반환.
+        최근 실패가 기록되어 있거나 기준 음성이 없으면 측정하지 않고 None 반환 (force여도 기준 음성은 필요).
+        측정이 실패하면 실패를 기록하고 예외를 다시 던진다.
+        """
+        if not force:
+            cached = self.load_cached()
+            if cached or self.recently_failed():
+                return cached
+        if not self.clip_path:
+            logger.info("WHISPER_CALIBRATION_CLIP not set, skipping Whisper calibration (using defaults)")
+            return None
+
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(f"{self.cache_path}.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info("Whisper calibration is running in another process, using defaults")
+                return None
+            try:
+                if not force:
+                    cached = self.load_cached()
+                    if cached or self.recently_failed():
+                        return cached
+                try:
+                    result = self.calibrate()
+                    if result is None:
+                        raise RuntimeError("no calibration candidate succeeded")
+                except Exception as e:
+                    self._save_failure(str(e))
+                    raise
+                self._save(result)
+                return result
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def start_background(
+        self,
+        on_done: Optional[Callable[[Optional[CalibrationResult], Optional[Exception]], None]] = None,
+    ) -> threading.Thread:
+        """백그라운드 스레드에서 get_or_calibrate (잠금 비차단), 끝나면 on_done(결과, 오류) 호출"""
+
+        def run():
+            result, error = None, None
+            try:
+                result = self.get_or_calibrate(blocking=False)
+            except Exception as e:
+                error = e
+                logger.warning(f"Whisper calibration failed, using defaults: {e}")
+            if on_done:
+                on_done(result, error)
+
+        thread = threading.Thread(target=run, name="whisper-calibration", daemon=True)
+        thread.start()
+        return thread
+
+    def calibrate(self) -> Optional[CalibrationResult]:
+        """후보 측정 후 목표 RTF 이하에서 처리량 최대 설정 선택 (없으면 RTF 최소)"""
+        audio = reference_clip(self.clip_path)
+        clip_sec = len(audio) / SAMPLE_RATE
+        start_time = time.time()
+        measured = []
+
+        candidates = self.candidates()
+        logger.info(f"Calibrating Whisper {self.model_size} on {self.cpu_model} ({self.cpus} cpus): {len(candidates)} candidates")
+        for compute_type, threads, workers in candidates:
+            if time.time() - start_time > self.max_sec:
+                logger.warning(f"Calibration time budget exceeded, {len(candidates) - len(measured)} candidates skipped")
+                break
+            try:
+                measured.append(self.measure(audio, compute_type, threads, workers))
+            except Exception as e:
+                logger.warning(f"Calibration candidate failed ({compute_type}, {threads}, {workers}): {e}")
+            else:
+                logger.info(f"Calibration candidate: {measured[-1]}")
+
+        if not measured:
+            return None
+        within = [m for m in measured if m["rtf"] <= self.target_rtf]
+        if within:
+            best = max(within, key=lambda m: (m["throughput"], -m["cpu_threads"] * m["num_workers"]))
+        else:
+            best = min(measured, key=lambda m: m["rtf"])
+
+        return CalibrationResult(
+            compute_type=best["compute_type"],
+            cpu_threads=best["cpu_threads"],
+            num_workers=best["num_workers"],
+            rtf=best["rtf"],
+            throughput=best["throughput"],
+            cpu_model=self.cpu_model,
+            source="calibrated",
+            calibrated_at=time.time(),
+            calibration_ms=round((time.time() - start_time) * 1000, 1),
+            candidates=measured,
+        )
+
+    def measure(self, audio: np.ndarray, compute_type: str, cpu_threads: int, num_workers: int) -> dict:
+        """후보 하나 측정 - num_workers개 동시 요청 라운드를 반복해 가장 빠른 라운드 사용"""
+        model = self.model_factory(self.model_size, self.device, compute_type, cpu_threads, num_workers)
+        clip_sec = len(audio) / SAMPLE_RATE
+
+        def run_once() -> float:
+            started = time.perf_counter()
+            segments, _ = model.transcribe(audio, **self.transcribe_options)
+            for _ in segments:  # 세그먼트는 지연 생성
+                pass
+            return time.perf_counter() - started
+
+        run_once()  # 첫 호출 초기화 비용 제외
+        rounds = []
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for _ in range(self.repeats):
+                started = time.perf_counter()
+                latencies = list(executor.map(lambda _: run_once(), range(num_workers)))
+                rounds.append((time.perf_counter() - started, statistics.mean(latencies)))
+        wall_sec, latency_sec = min(rounds)
+        del model
+
+        return {
+            "compute_type": compute_type,
+            "cpu_threads": cpu_threads,
+            "num_workers": num_workers,
+            "rtf": round(latency_sec / clip_sec, 3),
+            "throughput": round(num_workers * clip_sec / wall_sec, 3),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Whisper compute_type and thread counts for this CPU")
+    parser.add_argument("--model", default=os.getenv("WHISPER_MODEL_SIZE", "base"))
+    parser.add_argument("--device", default=os.getenv("WHISPER_DEVICE", "cpu"))
+    parser.add_argument("--clip", default=WHISPER_CALIBRATION_CLIP, help="기준 음성 파일 (실제 한국어 발화)")
+    parser.add_argument("--force", action="store_true", help="저장된 결과를 무시하고 다시 측정")
+    args = parser.parse_args()
+    if not args.clip:
+        parser.error("--clip 또는 WHISPER_CALIBRATION_CLIP이 필요합니다")
+
+    calibrator = WhisperCalibrator(args.model, device=args.device, clip_path=args.clip)
+    result = calibrator.get_or_calibrate(force=args.force)
+    print(json.dumps({"key": calibrator.key(), **(asdict(result) if result else {})}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    main()
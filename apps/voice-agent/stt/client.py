@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from transport.backoff import Backoff
+from transport.framing import read_message, write_message
+
+logger = logging.getLogger("voice-agent.stt.client")
+
+
+@dataclass
+class STTResult:
+    text: str
+    language: str
+    queue_ms: float = 0.0
+    inference_ms: float = 0.0
+
+
+class STTClient:
+    """공유 STT 서버 클라이언트 (model.transcribe 대체)
+
+    연결 실패/시간 초과 시 예외를 던지고 retry_after_sec 동안 available()이 False가 되며,
+    그동안 호출 측은 프로세스 내 Whisper를 사용한다.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0, retry_after_sec: float = 10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.backoff = Backoff(f"STT server ({socket_path})", "using in-process Whisper", retry_after_sec, logger)
+
+    def available(self) -> bool:
+        return self.backoff.available()
+
+    async def transcribe(self, audio: np.ndarray, **options) -> STTResult:
+        """float32 16kHz 오디오를 공유 메모리로 전달해 인식 요청"""
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        try:
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+            response = await asyncio.wait_for(
+                self._request({"shm": shm.name, "samples": len(audio), "options": options}),
+                timeout=self.timeout,
+            )
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            self.backoff.fail(e)
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if not response.get("ok"):
+            raise RuntimeError(f"STT server error: {response.get('error')}")
+
+        return STTResult(
+            text=response.get("text", ""),
+            language=response.get("language", options.get("language", "")),
+            queue_ms=response.get("queue_ms", 0.0),
+            inference_ms=response.get("inference_ms", 0.0),
+        )
+
+    async def _request(self, message: dict) -> dict:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            await write_message(writer, message)
+            return await read_message(reader)
+        finally:
+            writer.close()
@@ -0,0 +1,212 @@
+"""
+공유 STT 추론 서버
+호스트당 하나의 프로세스가 Whisper 모델을 소유하고,
+Job 프로세스들은 Unix 소켓 + 공유 메모리로 발화를 전달한다.
+
+실행: python -m stt.server
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional
+
+import numpy as np
+
+from transport.framing import read_message, write_message
+
+from .calibration import WhisperCalibrator
+
+logger = logging.getLogger("voice-agent.stt.server")
+
+STT_SERVER_SOCKET = os.getenv("STT_SERVER_SOCKET", "/tmp/voice-agent-stt.sock")
+STT_SERVER_WORKERS = int(os.getenv("STT_SERVER_WORKERS", "2"))  # 동시 추론 수
+STT_SERVER_CPU_THREADS = int(os.getenv("STT_SERVER_CPU_THREADS", "0"))  # 0 = CTranslate2 기본값
+
+
+class _Job:
+    def __init__(self, audio: np.ndarray, options: dict):
+        self.audio = audio
+        self.options = options
+        self.enqueued_at = time.time()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class STTServer:
+    """Whisper 모델 공유 서버 (요청 큐 + 중앙 스케줄링)"""
+
+    def __init__(
+        self,
+        model_factory: Callable[[], object],
+        socket_path: str = STT_SERVER_SOCKET,
+        workers: int = STT_SERVER_WORKERS,
+    ):
+        self.model_factory = model_factory
+        self.socket_path = socket_path
+        self.workers = max(1, workers)
+        self._model = None
+        self._queue: asyncio.Queue = None
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt")
+        self._in_flight: asyncio.Semaphore = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._job_tasks: set[asyncio.Task] = set()
+
+    async def start(self):
+        """모델 로드 후 소켓 바인딩"""
+        loop = asyncio.get_running_loop()
+        self._model = await loop.run_in_executor(self._executor, self.model_factory)
+        self._queue = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(self.workers)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+        logger.info(f"STT server listening on {self.socket_path} (workers={self.workers})")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """소켓 닫기 + 디스패치/진행 중 요청 취소"""
+        if self._server:
+            self._server.close()
+        tasks = [t for t in (self._dispatch_task, *self._job_tasks) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while self._queue and not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(ConnectionError("STT server shutting down"))
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    audio = self._read_shared_audio(request["shm"], int(request["samples"]))
+                    job = _Job(audio, request.get("options", {}))
+                    await self._queue.put(job)
+                    text, language, queue_ms, inference_ms = await job.future
+                    response = {
+                        "ok": True,
+                        "text": text,
+                        "language": language,
+                        "queue_ms": round(queue_ms, 2),
+                        "inference_ms": round(inference_ms, 2),
+                    }
+                except Exception as e:
+                    logger.error(f"STT request failed: {e}")
+                    response = {"ok": False, "error": str(e)}
+
+                await write_message(writer, response)
+        finally:
+            writer.close()
+
+    def _read_shared_audio(self, name: str, samples: int) -> np.ndarray:
+        """공유 메모리에서 float32 오디오 복사 (세그먼트 해제는 클라이언트 담당)"""
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            # 서버는 세그먼트를 소유하지 않으므로 resource tracker의 자동 unlink 방지
+            resource_tracker.unregister(shm._name, "shared_memory")
+            return np.ndarray((samples,), dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+
+    async def _dispatch_loop(self):
+        """도착 순서대로 요청을 꺼내 빈 추론 워커에 디스패치 (동시 추론 수 = workers)"""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._in_flight.acquire()
+            except asyncio.CancelledError:
+                job.future.set_exception(ConnectionError("STT server shutting down"))
+                raise
+            task = asyncio.create_task(self._run_job(job))
+            self._job_tasks.add(task)
+            task.add_done_callback(self._job_tasks.discard)
+
+    async def _run_job(self, job: _Job):
+        loop = asyncio.get_running_loop()
+        started_at = time.time()
+        try:
+            text, language = await loop.run_in_executor(self._executor, self._transcribe, job)
+            if not job.future.done():
+                job.future.set_result((
+                    text,
+                    language,
+                    (started_at - job.enqueued_at) * 1000,
+                    (time.time() - started_at) * 1000,
+                ))
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            if not job.future.done():
+                job.future.set_exception(ConnectionError("STT server shutting down"))
+            self._in_flight.release()
+
+    def _transcribe(self, job: _Job) -> tuple[str, str]:
+        segments, info = self._model.transcribe(job.audio, **job.options)
+        text = " ".join([seg.text.strip() for seg in segments])
+        return text, getattr(info, "language", job.options.get("language", ""))
+
+
+def _load_whisper_model():
+    from faster_whisper import WhisperModel
+
+    model_size = os.getenv("WHISPER_MODEL_SIZE", "base")
+    device = os.getenv("WHISPER_DEVICE", "cpu")
+    compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+    cpu_threads = STT_SERVER_CPU_THREADS
+
+    # 스레드 수를 직접 지정하지 않았으면 CPU 모델별 보정 결과 사용 (동시 추론 수는 STT_SERVER_WORKERS 고정)
+    # 저장 결과가 없으면 기본 설정으로 바로 시작하고 백그라운드에서 측정 (다음 시작부터 적용)
+    if os.getenv("WHISPER_CALIBRATION", "true").lower() == "true" and cpu_threads == 0:
+        calibrator = WhisperCalibrator(model_size, device=device, worker_options=[STT_SERVER_WORKERS])
+        calibration = calibrator.load_cached()
+        if calibration is None:
+            calibrator.start_background()
+        if calibration:
+            compute_type, cpu_threads = calibration.compute_type, calibration.cpu_threads
+            logger.info(
+                f"Whisper calibration ({calibration.source}): compute_type={compute_type}, "
+                f"cpu_threads={cpu_threads}, rtf={calibration.rtf}, throughput={calibration.throughput}"
+            )
+
+    logger.info(f"Loading Whisper model for STT server: {model_size}")
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=STT_SERVER_WORKERS,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(STTServer(_load_whisper_model).serve_forever())
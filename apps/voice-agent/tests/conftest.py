@@ -0,0 +1,30 @@
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+# 테스트는 apps/voice-agent 기준 패키지 import (python -m pytest tests)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def redis_url():
+    """로컬 Redis 대역 (fakeredis TCP 서버) 주소"""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def unused_redis_url():
+    """연결이 거부되는 Redis 주소 (장애 상황)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"redis://127.0.0.1:{port}/0"
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from cache import CachedProvider, MemoryLRU, RedisTier, TieredCache
+from llm import ChatCompletionResponse, ChatMessage, LLMProvider
+
+
+def test_lru_evicts_least_recently_used():
+    lru = MemoryLRU(max_entries=2)
+    lru.set("a", b"1")
+    lru.set("b", b"2")
+    assert lru.get("a") == b"1"  # a가 최근 사용
+    lru.set("c", b"3")
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1" and lru.get("c") == b"3"
+
+
+def test_lru_byte_limit_and_oversized_values():
+    lru = MemoryLRU(max_entries=100, max_bytes=30)
+    lru.set("k1", b"x" * 10)
+    lru.set("k2", b"x" * 10)
+    lru.set("k3", b"x" * 10)  # 36바이트 → k1 제거
+    assert lru.get("k1") is None and len(lru) == 2 and lru.bytes == 24
+    lru.set("big", b"x" * 100)  # 상한보다 큰 값은 저장하지 않음
+    assert lru.get("big") is None and len(lru) == 2
+    lru.set("k2", b"y")  # 덮어쓰기 시 바이트 재계산
+    assert lru.bytes == 12 + 3
+
+
+def test_lru_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    lru = MemoryLRU(ttl_sec=10)
+    lru.set("a", b"1")
+    now[0] += 9
+    assert lru.get("a") == b"1"
+    now[0] += 2
+    assert lru.get("a") is None and lru.bytes == 0
+
+
+def test_shared_hit_is_promoted_to_memory(redis_url):
+    async def main():
+        writer = TieredCache(MemoryLRU(), RedisTier(redis_url))
+        reader = TieredCache(MemoryLRU(), RedisTier(redis_url))  # 다른 Job 프로세스
+        await writer.set("q", b"answer")
+        results = [await reader.get("q"), await reader.get("q"), await reader.get("other")]
+        await writer.shared.client.aclose()
+        await reader.shared.client.aclose()
+        return reader, results
+
+    reader, results = asyncio.run(main())
+    assert results == [(b"answer", "hit_shared"), (b"answer", "hit_memory"), (None, "miss")]
+    assert reader.hit_rate() == 2 / 3
+    assert reader.stats()["cache_entries"] == 1
+
+
+def test_shared_outage_falls_through_to_memory(unused_redis_url):
+    async def main():
+        cache = TieredCache(MemoryLRU(), RedisTier(unused_redis_url, timeout_sec=0.2, retry_after_sec=30))
+        await cache.set("q", b"answer")  # 공유 계층 실패해도 메모리에는 기록
+        miss = await cache.get("missing")
+        hit = await cache.get("q")
+        await cache.shared.client.aclose()
+        return cache, miss, hit
+
+    cache, miss, hit = asyncio.run(main())
+    assert miss == (None, "miss") and hit == (b"answer", "hit_memory")
+    assert not cache.shared.available()
+
+
+class CountingProvider(LLMProvider):
+    """호출 수를 세고 요청마다 정해진 종료 사유로 스트리밍하는 Provider 대역"""
+
+    def __init__(self, finish_reason="stop", completion_tokens=5):
+        self.calls = 0
+        self.finish_reason = finish_reason
+        self.completion_tokens = completion_tokens
+
+    async def chat(self, messages, temperature=None, max_tokens=None):
+        self.calls += 1
+        usage = {"completion_tokens": self.completion_tokens}
+        return ChatCompletionResponse(content=f"응답 {self.calls}", model="fake", usage=usage)
+
+    async def chat_stream(self, messages, temperature=None, max_tokens=None, stats=None):
+        self.calls += 1
+        yield f"응답 {self.calls}"
+        stats["usage"] = {"completion_tokens": self.completion_tokens}
+        if self.finish_reason:
+            stats["finish_reason"] = self.finish_reason
+
+    def get_model_name(self):
+        return "fake"
+
+    def get_provider_type(self):
+        return "fake"
+
+
+def ask_twice(provider, max_tokens=60, stream=True):
+    cached = CachedProvider(provider, TieredCache(MemoryLRU()))
+    messages = [ChatMessage(role="system", content="시스템"), ChatMessage(role="user", content="날씨 알려줘")]
+
+    async def ask():
+        if not stream:
+            return (await cached.chat(messages, max_tokens=max_tokens)).content
+        return "".join([chunk async for chunk in cached.chat_stream(messages, max_tokens=max_tokens, stats={})])
+
+    async def main():
+        return [await ask(), await ask()]
+
+    return asyncio.run(main())
+
+
+def test_complete_reply_is_cached():
+    provider = CountingProvider()
+    assert ask_twice(provider) == ["응답 1", "응답 1"] and provider.calls == 1
+
+
+def test_truncated_replies_are_not_cached():
+    # 종료 사유가 length이거나, 종료 사유 없이 생성 토큰이 max_tokens에 도달한 경우
+    for provider in (CountingProvider("length"), CountingProvider(None, completion_tokens=60)):
+        assert ask_twice(provider) == ["응답 1", "응답 2"]
+    provider = CountingProvider(None, completion_tokens=60)
+    assert ask_twice(provider, stream=False) == ["응답 1", "응답 2"]
@@ -0,0 +1,153 @@
+import fcntl
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from stt import WhisperCalibrator
+from stt import calibration
+
+# compute_type별 추론 시간 (6초 기준 음성, 초)
+LATENCY_SEC = {"int8": 0.01, "int8_float32": 0.02, "float32": 0.04}
+
+
+class FakeTranscriber:
+    def __init__(self, compute_type):
+        self.compute_type = compute_type
+
+    def transcribe(self, audio, **options):
+        time.sleep(LATENCY_SEC[self.compute_type])
+        return iter([SimpleNamespace(text="안녕하세요")]), SimpleNamespace(language="ko")
+
+
+class FakeFactory:
+    """모델 생성 기록 (fail_types의 compute_type은 생성 실패)"""
+
+    def __init__(self, fail_types=()):
+        self.created = []
+        self.fail_types = set(fail_types)
+
+    def __call__(self, model_size, device, compute_type, cpu_threads, num_workers):
+        self.created.append((compute_type, cpu_threads, num_workers))
+        if compute_type in self.fail_types:
+            raise RuntimeError(f"{compute_type} not available")
+        return FakeTranscriber(compute_type)
+
+
+@pytest.fixture(autouse=True)
+def reference_audio(monkeypatch):
+    """기준 음성 파일 대신 6초 오디오 (디코딩 없이)"""
+    monkeypatch.setattr(calibration, "reference_clip", lambda path: np.zeros(6 * calibration.SAMPLE_RATE, np.float32))
+
+
+def make_calibrator(tmp_path, factory, **options):
+    defaults = dict(
+        cache_path=str(tmp_path / "calibration.json"),
+        clip_path="reference-ko.wav",
+        compute_types=["int8", "int8_float32", "float32"],
+        supported_types=["int8", "float32"],
+        thread_options=[1],
+        worker_options=[1],
+        target_rtf=0.5,
+        repeats=1,
+        model_factory=factory,
+    )
+    return WhisperCalibrator("base", **{**defaults, **options})
+
+
+def test_calibrates_once_and_reuses_cache(tmp_path):
+    factory = FakeFactory()
+    result = make_calibrator(tmp_path, factory).get_or_calibrate()
+
+    assert result.source == "calibrated" and result.compute_type == "int8"
+    # 지원하지 않는 compute_type은 측정하지 않음
+    assert sorted(factory.created) == [("float32", 1, 1), ("int8", 1, 1)]
+    assert {c["compute_type"] for c in result.candidates} == {"int8", "float32"}
+
+    cached = make_calibrator(tmp_path, factory).get_or_calibrate()
+    assert cached.source == "cache" and cached.compute_type == "int8"
+    assert len(factory.created) == 2
+
+
+def test_cache_key_separates_models_and_concurrency(tmp_path):
+    factory = FakeFactory()
+    base = make_calibrator(tmp_path, factory)
+    base.get_or_calibrate()
+
+    other_workers = make_calibrator(tmp_path, factory, worker_options=[1, 2])
+    other_model = WhisperCalibrator("small", cache_path=base.cache_path, clip_path=base.clip_path, model_factory=factory)
+    assert len({base.key(), other_workers.key(), other_model.key()}) == 3
+    assert base.cpu_model in base.key() and f"cpus={base.cpus}" in base.key()
+    assert other_workers.load_cached() is None and other_model.load_cached() is None
+
+    other_workers.get_or_calibrate()
+    with open(base.cache_path) as f:
+        assert set(json.load(f)) == {base.key(), other_workers.key()}
+
+
+def test_non_blocking_skips_while_another_process_calibrates(tmp_path):
+    factory = FakeFactory()
+    calibrator = make_calibrator(tmp_path, factory)
+    with open(f"{calibrator.cache_path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # 다른 프로세스가 측정 중
+        start = time.monotonic()
+        assert calibrator.get_or_calibrate(blocking=False) is None
+        assert time.monotonic() - start < 0.5
+    assert factory.created == []
+
+
+def test_failure_is_recorded_and_falls_back(tmp_path):
+    factory = FakeFactory(fail_types={"int8", "float32"})
+    calibrator = make_calibrator(tmp_path, factory, retry_after_sec=60)
+    with pytest.raises(RuntimeError):
+        calibrator.get_or_calibrate()
+
+    # 실패 기록 후에는 기본 설정 (None), 재시도 대기 시간 동안 다시 측정하지 않음
+    assert calibrator.load_cached() is None and calibrator.recently_failed()
+    assert calibrator.get_or_calibrate() is None
+    assert len(factory.created) == 2
+
+    expired = make_calibrator(tmp_path, FakeFactory(), retry_after_sec=0)
+    assert not expired.recently_failed()
+    assert expired.get_or_calibrate().compute_type == "int8"
+
+
+def test_background_calibration_reports_result_and_errors(tmp_path, monkeypatch):
+    done = []
+    on_done = lambda result, error: done.append((result, error))
+    make_calibrator(tmp_path, FakeFactory()).start_background(on_done).join(5)
+    assert done[0][0].compute_type == "int8" and done[0][1] is None
+
+    def unsupported(device):
+        raise RuntimeError("ctranslate2 missing")
+
+    monkeypatch.setattr(calibration, "supported_compute_types", unsupported)
+    failing = make_calibrator(tmp_path / "other", FakeFactory(), supported_types=None)
+    failing.start_background(on_done).join(5)
+    assert done[1][0] is None and "ctranslate2 missing" in str(done[1][1])
+    assert failing.recently_failed()
+
+
+def test_skips_without_reference_clip(tmp_path):
+    factory = FakeFactory()
+    calibrator = make_calibrator(tmp_path, factory, clip_path="")
+    assert calibrator.get_or_calibrate() is None and calibrator.get_or_calibrate(force=True) is None
+    # 설정 누락은 실패로 기록하지 않음 (기준 음성을 설정하면 바로 측정)
+    assert factory.created == [] and not calibrator.recently_failed()
+
+
+def test_worker_takes_no_jobs_while_calibrating(monkeypatch):
+    agent = pytest.importorskip("agent")
+    monkeypatch.setattr(agent, "get_load_estimator", lambda: SimpleNamespace(get_load=lambda: 0.1))
+    running = threading.Event()
+    thread = threading.Thread(target=running.wait, daemon=True)
+    thread.start()
+    monkeypatch.setattr(agent, "_calibration_thread", thread)
+
+    assert agent.compute_worker_load() >= agent.WORKER_LOAD_THRESHOLD
+    running.set()
+    thread.join(5)
+    assert agent.compute_worker_load() == 0.1
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from capture import CaptureReader, CaptureWriter, VAD_END, VAD_START, capture_filename
+from capture.format import RECORD_AUDIO, CapturedFrame
+
+
+def make_frame(value: int, samples: int = 480) -> CapturedFrame:
+    return CapturedFrame(bytes([value % 256]) * (samples * 2), 48000, 1, samples)
+
+
+def write_session(path, turns=2, frames_per_turn=5, max_queue=2000):
+    """턴마다 VAD 시작/끝 + 프레임 + 턴 레코드 + 단계별 시간 기록"""
+    writer = CaptureWriter(str(path), metadata={"room": "room-1"}, max_queue=max_queue, chunk_bytes=4096)
+    seq = 0
+    for turn_id in range(1, turns + 1):
+        speech_start = writer.now()
+        writer.vad(VAD_START)
+        first_seq = seq
+        for _ in range(frames_per_turn):
+            writer.audio(seq, make_frame(seq))
+            seq += 1
+        speech_end = writer.now()
+        writer.vad(VAD_END)
+        writer.turn(turn_id, first_seq, seq - 1, speech_start=speech_start, speech_end=speech_end)
+        writer.timings(turn_id, stt_ms=120.0, llm_ms=800.0)
+    writer.close()
+    return writer
+
+
+def test_roundtrip_turn_frames_and_timings(tmp_path):
+    path = tmp_path / "session.vacap"
+    writer = write_session(path)
+    assert writer.dropped == 0 and writer.error is None
+
+    with CaptureReader(str(path)) as reader:
+        assert reader.metadata["room"] == "room-1"
+        assert [e.turn_id for e in reader.turns()] == [1, 2]
+        frames = reader.turn_frames(2)
+        assert len(frames) == 5
+        assert frames[0].data == make_frame(5).data and frames[0].sample_rate == 48000
+        info = reader.turn_info(2)
+        assert info["first_seq"] == 5 and info["speech_start"] <= info["speech_end"]
+        assert reader.turn_timings(1) == {"stt_ms": 120.0, "llm_ms": 800.0}
+        assert len(list(reader.audio_frames())) == 10
+
+
+def test_index_is_rebuilt_without_sidecar(tmp_path):
+    path = tmp_path / "session.vacap"
+    write_session(path)
+    with CaptureReader(str(path)) as reader:
+        expected = {e.turn_id: (e.first_seq, e.last_seq, e.start_offset, e.end_offset) for e in reader.turns()}
+
+    os.unlink(str(path) + ".idx")
+    with CaptureReader(str(path)) as reader:
+        rebuilt = {e.turn_id: (e.first_seq, e.last_seq, e.start_offset, e.end_offset) for e in reader.turns()}
+        assert len(reader.turn_frames(1)) == 5
+    assert rebuilt == expected
+
+
+def test_long_turn_keeps_first_frame(tmp_path):
+    # 10ms 프레임 5000개 (50초) 한 턴 - 턴 시작 위치가 밀려나지 않아야 함
+    path = tmp_path / "session.vacap"
+    writer = write_session(path, turns=2, frames_per_turn=5000, max_queue=20000)
+    assert writer.dropped == 0
+    with CaptureReader(str(path)) as reader:
+        first_audio = next(r for r in reader.records() if r.type == RECORD_AUDIO)
+        assert reader.index[1].start_offset == first_audio.offset
+        frames = reader.turn_frames(2)
+        assert len(frames) == 5000 and frames[0].data == make_frame(5000).data
+        assert len(reader.turn_frames(1)) == 5000
+
+
+def test_close_does_not_block_when_writer_died(tmp_path):
+    writer = CaptureWriter(str(tmp_path / "missing-dir" / "session.vacap"), max_queue=2)
+    writer._thread.join(2)
+    # 기록 스레드가 죽은 뒤 큐가 가득 차도 close는 멈추지 않고 오류를 알림
+    writer._queue.put_nowait((1, 0, 0.0, b""))
+    writer._queue.put_nowait((1, 1, 0.0, b""))
+    writer.audio(2, make_frame(2))
+    start = time.monotonic()
+    with pytest.raises(FileNotFoundError):
+        writer.close(timeout_sec=1.0)
+    assert time.monotonic() - start < 0.5
+    assert writer.dropped == 1
+
+
+@pytest.mark.parametrize("identity", ["../../etc/passwd", "user/../x", "사용자", "a" * 200])
+def test_capture_filename_stays_in_directory(tmp_path, identity):
+    name = capture_filename("room/../1", identity, 1700000000.5)
+    assert os.path.dirname(os.path.join(str(tmp_path), name)) == str(tmp_path)
+    assert "/" not in name and not name.startswith(".")
+    assert name.endswith("-1700000000.vacap") and len(name) < 160
+
+
+def test_capture_filename_distinguishes_sanitized_identities():
+    assert capture_filename("room", "a/b", 0) != capture_filename("room", "a_b", 0)
+    assert capture_filename("room", "alice", 0) == "room-alice-0.vacap"
+
+
+def test_replay_turn_uses_recorded_frames(tmp_path, monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+    from capture import replay
+
+    path = tmp_path / "session.vacap"
+    write_session(path)
+    received = []
+
+    async def fake_transcribe(frames):
+        received.append(frames)
+        return "다시 인식", 12.5
+
+    monkeypatch.setattr(agent, "transcribe_audio", fake_transcribe)
+    with CaptureReader(str(path)) as reader:
+        first = asyncio.run(replay.replay_turn(reader, 1))
+        last = asyncio.run(replay.replay_turn(reader, 2))
+
+    assert [f.data for f in received[0]] == [make_frame(i).data for i in range(5)]
+    assert first["text"] == "다시 인식" and first["frames"] == 5
+    assert first["recorded"] == {"stt_ms": 120.0, "llm_ms": 800.0}
+    # 턴 1은 침묵 대기 시간 안에 턴 2 발화가 시작돼 취소된 것으로 재현, 마지막 턴은 취소 없음
+    assert first["cancelled_by_speech"]
+    assert not last["cancelled_by_speech"]
@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from llm import ChatMessage
+from llm.embedded import HostSlots
+
+
+def write_tiny_gguf(path, embedding=64, layers=2, heads=4):
+    """무작위 가중치 llama 구조 GGUF (바이트 폴백 토큰 + 채팅 템플릿)"""
+    gguf = pytest.importorskip("gguf")
+    tokens, scores, types = [b"<unk>", b"<s>", b"</s>"], [0.0] * 3, [2, 3, 3]
+    for b in range(256):
+        tokens.append(f"<0x{b:02X}>".encode())
+        scores.append(0.0)
+        types.append(6)
+    for i, piece in enumerate(["▁", "▁안녕", "하세요", "니다", "."]):
+        tokens.append(piece.encode())
+        scores.append(-1.0 - i * 0.01)
+        types.append(1)
+
+    writer = gguf.GGUFWriter(str(path), "llama")
+    writer.add_context_length(512)
+    writer.add_embedding_length(embedding)
+    writer.add_block_count(layers)
+    writer.add_feed_forward_length(embedding * 2)
+    writer.add_head_count(heads)
+    writer.add_head_count_kv(heads)
+    writer.add_layer_norm_rms_eps(1e-5)
+    writer.add_rope_dimension_count(embedding // heads)
+    writer.add_vocab_size(len(tokens))
+    writer.add_tokenizer_model("llama")
+    writer.add_token_list(tokens)
+    writer.add_token_scores(scores)
+    writer.add_token_types(types)
+    writer.add_bos_token_id(1)
+    writer.add_eos_token_id(2)
+    writer.add_unk_token_id(0)
+    writer.add_chat_template(
+        "{% for m in messages %}<|{{ m['role'] }}|>{{ m['content'] }}\n{% endfor %}"
+        "{% if add_generation_prompt %}<|assistant|>{% endif %}"
+    )
+
+    rng = np.random.default_rng(0)
+
+    def weights(*shape):
+        return (rng.standard_normal(shape) * 0.05).astype(np.float32)
+
+    ones = np.ones(embedding, np.float32)
+    writer.add_tensor("token_embd.weight", weights(len(tokens), embedding))
+    writer.add_tensor("output_norm.weight", ones)
+    writer.add_tensor("output.weight", weights(len(tokens), embedding))
+    for i in range(layers):
+        writer.add_tensor(f"blk.{i}.attn_norm.weight", ones)
+        for name in ("attn_q", "attn_k", "attn_v", "attn_output"):
+            writer.add_tensor(f"blk.{i}.{name}.weight", weights(embedding, embedding))
+        writer.add_tensor(f"blk.{i}.ffn_norm.weight", ones)
+        writer.add_tensor(f"blk.{i}.ffn_gate.weight", weights(embedding * 2, embedding))
+        writer.add_tensor(f"blk.{i}.ffn_up.weight", weights(embedding * 2, embedding))
+        writer.add_tensor(f"blk.{i}.ffn_down.weight", weights(embedding, embedding * 2))
+    writer.write_header_to_file()
+    writer.write_kv_data_to_file()
+    writer.write_tensors_to_file()
+    writer.close()
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    pytest.importorskip("llama_cpp")
+    path = tmp_path_factory.mktemp("gguf") / "tiny.gguf"
+    write_tiny_gguf(path)
+    return str(path)
+
+
+def make_provider(model_path, slot_dir, **options):
+    from llm.embedded import EmbeddedProvider
+
+    return EmbeddedProvider(model_path, n_ctx=256, n_threads=1, cache_mb=0, slot_dir=str(slot_dir), **options)
+
+
+MESSAGES = [ChatMessage(role="system", content="짧게"), ChatMessage(role="user", content="안녕하세요")]
+
+
+def test_streams_tokens_and_reports_length(tiny_model, tmp_path):
+    provider = make_provider(tiny_model, tmp_path)
+
+    async def main():
+        stats = {}
+        chunks = [c async for c in provider.chat_stream(MESSAGES, temperature=0.0, max_tokens=8, stats=stats)]
+        return chunks, stats
+
+    chunks, stats = asyncio.run(main())
+    assert len(chunks) > 1 and all(chunks)
+    assert 0 < stats["usage"]["completion_tokens"] <= 8
+    assert stats["usage"]["prompt_tokens"] > 0
+    assert stats["finish_reason"] == "length"
+
+
+def test_early_close_releases_slot(tiny_model, tmp_path):
+    provider = make_provider(tiny_model, tmp_path, host_slots=1)
+
+    async def main():
+        stream = provider.chat_stream(MESSAGES, temperature=0.0, max_tokens=64)
+        async with contextlib.aclosing(stream):
+            async for _ in stream:
+                break
+        # 닫힌 생성이 슬롯을 반납해야 다음 요청이 진행됨
+        return await asyncio.wait_for(provider.chat(MESSAGES, temperature=0.0, max_tokens=4), timeout=10)
+
+    response = asyncio.run(main())
+    assert response.content and response.usage["completion_tokens"] > 0
+
+
+def test_generation_waits_for_host_slot(tiny_model, tmp_path):
+    provider = make_provider(tiny_model, tmp_path, host_slots=1)
+    other = HostSlots(1, str(tmp_path))  # 같은 호스트의 다른 Job 프로세스
+    held = other.try_acquire()
+    threading.Timer(0.2, other.release, args=(held,)).start()
+
+    async def main():
+        stats = {}
+        start = time.monotonic()
+        chunks = [c async for c in provider.chat_stream(MESSAGES, temperature=0.0, max_tokens=4, stats=stats)]
+        return chunks, stats, time.monotonic() - start
+
+    chunks, stats, elapsed = asyncio.run(main())
+    assert chunks and elapsed >= 0.2
+    assert stats["slot_wait_ms"] >= 150
+
+
+def test_host_slots_limit_and_cancel(tmp_path):
+    slots = HostSlots(2, str(tmp_path), poll_sec=0.005)
+    first, second = slots.try_acquire(), slots.try_acquire()
+    assert first is not None and second is not None
+    assert slots.try_acquire() is None
+
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+    assert slots.acquire(stop) is None  # 대기 중 중단
+
+    slots.release(first)
+    third = slots.acquire(threading.Event())
+    assert third is not None
+    slots.release(second)
+    slots.release(third)
@@ -0,0 +1,106 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from tts import FillerBank, apply_fade, fade_out
+
+SAMPLE_RATE = 24000
+
+
+def constant_clip(samples: int, value: int = 10000) -> np.ndarray:
+    return np.full(samples, value, dtype=np.int16)
+
+
+def test_apply_fade_ramps_edges_only():
+    pcm = constant_clip(SAMPLE_RATE // 10)
+    faded = apply_fade(pcm, SAMPLE_RATE, fade_ms=5.0)
+    fade = int(SAMPLE_RATE * 0.005)
+
+    assert faded.dtype == np.int16 and len(faded) == len(pcm)
+    assert faded[0] == 0 and faded[-1] == 0
+    assert np.all(np.diff(faded[:fade].astype(np.int32)) >= 0)
+    assert np.all(np.diff(faded[-fade:].astype(np.int32)) <= 0)
+    np.testing.assert_array_equal(faded[fade:-fade], pcm[fade:-fade])
+    # 원본은 변경하지 않음
+    assert pcm[0] == 10000
+
+
+def test_apply_fade_short_clip_does_not_overlap():
+    pcm = constant_clip(6)
+    faded = apply_fade(pcm, SAMPLE_RATE, fade_ms=5.0)
+    # 페이드 길이는 클립 절반까지만 (앞뒤 램프가 겹치지 않음)
+    assert list(faded) == [0, 5000, 10000, 10000, 5000, 0]
+    assert len(apply_fade(np.zeros(0, dtype=np.int16), SAMPLE_RATE)) == 0
+    assert list(apply_fade(constant_clip(1), SAMPLE_RATE)) == [10000]
+
+
+def test_fade_out_reaches_silence():
+    chunk = constant_clip(480, value=-12000)
+    faded = fade_out(chunk)
+    assert faded.dtype == np.int16
+    assert faded[0] == -12000 and faded[-1] == 0
+    assert np.all(np.diff(np.abs(faded.astype(np.int32))) <= 0)
+
+
+def test_filler_bank_skips_failed_clips():
+    async def synthesize(text):
+        if text == "실패":
+            raise RuntimeError("tts down")
+        return text.encode("utf-8")
+
+    async def decode(audio):
+        return None if audio == "빈".encode("utf-8") else constant_clip(SAMPLE_RATE // 10)
+
+    bank = FillerBank(["음...", "실패", "빈", "  "], sample_rate=SAMPLE_RATE)
+    assert not bank.ready and bank.pick() is None
+    asyncio.run(bank.load(synthesize, decode))
+
+    assert bank.ready and len(bank.clips) == 1
+    clip = bank.pick()
+    assert clip[0] == 0 and clip[len(clip) // 2] == 10000
+
+
+def test_overlapping_loads_synthesize_once():
+    calls = []
+
+    async def synthesize(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return text.encode("utf-8")
+
+    async def decode(audio):
+        return constant_clip(SAMPLE_RATE // 10)
+
+    async def main():
+        bank = FillerBank(["음...", "잠시만요"], sample_rate=SAMPLE_RATE)
+        await asyncio.gather(bank.load(synthesize, decode), bank.load(synthesize, decode))
+        return bank
+
+    bank = asyncio.run(main())
+    assert calls == ["음...", "잠시만요"] and len(bank.clips) == 2
+
+
+def test_agent_reuses_and_cancels_filler_load(monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+
+    started = asyncio.Event()
+
+    async def slow_tts(text):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(agent, "_filler_bank", FillerBank(["음..."], sample_rate=SAMPLE_RATE))
+    monkeypatch.setattr(agent, "_filler_load_task", None)
+    monkeypatch.setattr(agent, "text_to_speech", slow_tts)
+
+    async def main():
+        task = agent.start_filler_load()
+        assert agent.start_filler_load() is task  # 진행 중이면 재사용
+        await started.wait()
+        await agent.stop_filler_load()  # Job 종료 콜백
+        return task
+
+    task = asyncio.run(main())
+    assert task.cancelled()
@@ -0,0 +1,197 @@
+import asyncio
+import time
+
+import httpx
+
+from llm import ChatCompletionResponse, ChatMessage, LimitServer, RateLimitedProvider, set_queue_key
+from llm.base import LLMProvider
+
+
+class FakeBackend:
+    """여러 Job 프로세스가 공유하는 백엔드 (전체 동시 실행 수와 처리 순서 기록)"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.order = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, backend: FakeBackend, delay_sec: float = 0.02):
+        self.backend = backend
+        self.delay_sec = delay_sec
+
+    async def chat(self, messages, temperature=None, max_tokens=None):
+        backend = self.backend
+        backend.active += 1
+        backend.max_active = max(backend.max_active, backend.active)
+        backend.order.append(messages[0].content)
+        try:
+            await backend.gate.wait()
+            await asyncio.sleep(self.delay_sec)
+        finally:
+            backend.active -= 1
+        return ChatCompletionResponse(content="ok", model="fake")
+
+    async def chat_stream(self, messages, temperature=None, max_tokens=None, stats=None):
+        response = await self.chat(messages, temperature, max_tokens)
+        yield response.content
+
+    def get_model_name(self):
+        return "fake"
+
+    def get_provider_type(self):
+        return "fake"
+
+
+def make_processes(socket_path, backend, count, max_concurrency):
+    """Job 프로세스마다 별도 제한기 (같은 제한 서버 공유)"""
+    return [
+        RateLimitedProvider(FakeProvider(backend), max_concurrency=max_concurrency, limiter_socket=socket_path)
+        for _ in range(count)
+    ]
+
+
+async def ask(provider, room, text):
+    set_queue_key(room)
+    return await provider.chat([ChatMessage(role="user", content=text)])
+
+
+def test_rooms_across_processes_share_one_cap(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+
+    async def main():
+        server = LimitServer(socket_path)
+        await server.start()
+        backend = FakeBackend()
+        processes = make_processes(socket_path, backend, 4, max_concurrency=2)
+        try:
+            await asyncio.gather(*[
+                ask(processes[i % 4], f"room-{i % 4}", f"q{i}") for i in range(12)
+            ])
+        finally:
+            await server.close()
+        return backend
+
+    backend = asyncio.run(main())
+    assert backend.max_active == 2
+    assert len(backend.order) == 12
+
+
+def test_round_robin_between_rooms(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+
+    async def main():
+        server = LimitServer(socket_path)
+        await server.start()
+        backend = FakeBackend()
+        busy, room_a, room_b = make_processes(socket_path, backend, 3, max_concurrency=1)
+        backend.gate.clear()
+        try:
+            tasks = [asyncio.create_task(ask(busy, "room-busy", "hold"))]
+            await asyncio.sleep(0.05)
+            # room-a가 먼저 3개를 쌓아도 room-b의 요청이 사이에 처리됨
+            for i in range(3):
+                tasks.append(asyncio.create_task(ask(room_a, "room-a", f"a{i}")))
+                await asyncio.sleep(0.01)
+            tasks.append(asyncio.create_task(ask(room_b, "room-b", "b0")))
+            await asyncio.sleep(0.05)
+            backend.gate.set()
+            await asyncio.gather(*tasks)
+        finally:
+            await server.close()
+        return backend
+
+    backend = asyncio.run(main())
+    assert backend.order == ["hold", "a0", "b0", "a1", "a2"]
+
+
+def test_cancelled_and_dead_clients_release_slots(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+
+    async def main():
+        server = LimitServer(socket_path)
+        await server.start()
+        backend = FakeBackend()
+        first, second = make_processes(socket_path, backend, 2, max_concurrency=1)
+        backend.gate.clear()
+        try:
+            holder = asyncio.create_task(ask(first, "room-a", "held"))
+            waiter = asyncio.create_task(ask(second, "room-b", "cancelled"))
+            await asyncio.sleep(0.05)
+            # 대기 중 취소 → 대기열에서 제거, 점유 중 취소(프로세스 종료와 같음) → 슬롯 반납
+            waiter.cancel()
+            holder.cancel()
+            await asyncio.gather(holder, waiter, return_exceptions=True)
+            backend.gate.set()
+            await asyncio.wait_for(ask(second, "room-b", "after"), timeout=2)
+        finally:
+            await server.close()
+        return backend
+
+    backend = asyncio.run(main())
+    assert backend.order == ["held", "after"]
+
+
+def test_falls_back_to_process_limits_without_server(tmp_path):
+    async def main():
+        backend = FakeBackend()
+        (provider,) = make_processes(str(tmp_path / "missing.sock"), backend, 1, max_concurrency=1)
+        response = await ask(provider, "room-a", "q")
+        return provider, response
+
+    provider, response = asyncio.run(main())
+    assert response.content == "ok"
+    assert not provider.limiter.available()
+
+
+
+class RateLimitedOnce(FakeProvider):
+    """첫 요청에 429 + Retry-After 응답"""
+
+    def __init__(self, backend, retry_after="0.2"):
+        super().__init__(backend)
+        self.retry_after = retry_after
+        self.calls = []
+
+    async def chat(self, messages, temperature=None, max_tokens=None):
+        self.calls.append(time.monotonic())
+        if len(self.calls) == 1:
+            request = httpx.Request("POST", "http://llm/chat")
+            response = httpx.Response(429, headers={"retry-after": self.retry_after}, request=request)
+            raise httpx.HTTPStatusError("rate limited", request=request, response=response)
+        return await super().chat(messages, temperature, max_tokens)
+
+    def supports_prewarm(self):
+        return True
+
+    async def prewarm(self, messages):
+        return True
+
+
+def test_retry_after_pauses_the_shared_limiter(tmp_path):
+    socket_path = str(tmp_path / "limiter.sock")
+
+    async def main():
+        server = LimitServer(socket_path)
+        await server.start()
+        backend = FakeBackend()
+        limited = RateLimitedOnce(backend)
+        provider = RateLimitedProvider(limited, max_concurrency=2, limiter_socket=socket_path)
+        other = RateLimitedProvider(RateLimitedOnce(backend), max_concurrency=2, limiter_socket=socket_path)
+        try:
+            task = asyncio.create_task(ask(provider, "room-a", "q"))
+            await asyncio.sleep(0.05)
+            # 재시도 대기 중: 같은 프로세스와 다른 Job 프로세스 모두 사전 준비 생략
+            paused = provider.limiter.paused(), await provider.prewarm([]), await other.prewarm([])
+            response = await task
+        finally:
+            await server.close()
+        return limited.calls, paused, response
+
+    calls, paused, response = asyncio.run(main())
+    assert response.retries == 1
+    assert calls[1] - calls[0] >= 0.18
+    assert paused == (True, False, False)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from monitoring import CpuSampler, JobLoadReporter, LoadEstimator, LoopMonitor
+
+
+class FakeCpuTimes:
+    """호출마다 정해진 (idle, total) 값을 돌려주는 /proc/stat 대역"""
+
+    def __init__(self, samples):
+        self.samples = list(samples)
+
+    def __call__(self):
+        return self.samples.pop(0)
+
+
+def write_snapshot(stats_dir, pid, timestamp=None, **fields):
+    data = {"pid": pid, "timestamp": timestamp or time.time(), "stt_pending": 0, "loop_lag_ms": 0.0, "p95_ms": {}}
+    data.update(fields)
+    with open(os.path.join(stats_dir, f"{pid}.json"), "w") as f:
+        json.dump(data, f)
+
+
+class FixedCpuSampler:
+    """고정 CPU 사용률 (백그라운드 스레드 없음)"""
+
+    def __init__(self, usage):
+        self.value = usage
+
+    def start(self):
+        pass
+
+    def usage(self):
+        return self.value
+
+
+def make_estimator(stats_dir, usage=0.1):
+    return LoadEstimator(
+        str(stats_dir),
+        stt_queue_limit=4,
+        stage_slo_ms={"stt": 1000, "llm": 2000},
+        loop_lag_limit_ms=100,
+        cpu_sampler=FixedCpuSampler(usage),
+    )
+
+
+def test_cpu_usage_is_independent_of_call_count():
+    sampler = CpuSampler(read_times=FakeCpuTimes([(0, 0), (50, 100), (60, 200)]))
+    sampler.sample()
+    sampler.sample()
+    # load_fnc / request_fnc가 연달아 읽어도 같은 구간 값
+    assert sampler.usage() == pytest.approx(0.5)
+    assert sampler.usage() == pytest.approx(0.5)
+    sampler.sample()
+    assert sampler.usage() == pytest.approx(0.9)
+
+
+def test_cpu_sampler_runs_on_fixed_interval():
+    reads = []
+
+    def read_times():
+        reads.append(time.monotonic())
+        return len(reads) * 10, len(reads) * 100
+
+    sampler = CpuSampler(interval_sec=0.05, read_times=read_times)
+    sampler.start()
+    time.sleep(0.3)
+    sampler.stop()
+    assert 3 <= len(reads) <= 8
+    assert sampler.usage() == pytest.approx(0.9)
+
+
+def test_idle_worker_accepts(tmp_path):
+    estimator = make_estimator(tmp_path)
+    write_snapshot(tmp_path, 1, stt_pending=1, p95_ms={"stt": 200, "llm": 500})
+    assert estimator.get_load() == pytest.approx(0.25)
+    assert estimator.last_components["jobs"] == 1
+
+
+def test_overload_from_any_saturated_resource(tmp_path):
+    estimator = make_estimator(tmp_path)
+    write_snapshot(tmp_path, 1, stt_pending=3)
+    write_snapshot(tmp_path, 2, stt_pending=2)
+    assert estimator.get_load() == 1.0
+    assert estimator.last_components["stt_queue"] == pytest.approx(1.25)
+
+    for name in os.listdir(tmp_path):
+        os.unlink(tmp_path / name)
+    write_snapshot(tmp_path, 3, p95_ms={"llm": 2400})
+    assert estimator.get_load() == 1.0
+
+    assert make_estimator(tmp_path, usage=0.95).get_load() >= 0.95
+
+
+def test_stale_snapshots_are_ignored(tmp_path):
+    estimator = make_estimator(tmp_path)
+    write_snapshot(tmp_path, 1, timestamp=time.time() - 60, stt_pending=10)
+    assert estimator.get_load() == pytest.approx(0.1)
+    assert not os.path.exists(tmp_path / "1.json")
+
+
+def test_reporter_uses_loop_monitor_lag(tmp_path):
+    async def main():
+        monitor = LoopMonitor(lambda *args, **kwargs: None, interval_ms=10, report_interval_sec=60)
+        reporter = JobLoadReporter(str(tmp_path), interval_sec=0.05, lag_source=lambda: monitor.recent_lag_ms(q=100))
+        monitor.start()
+        reporter.ensure_started()
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)  # 루프 블로킹
+        await asyncio.sleep(0.15)
+        with open(tmp_path / f"{os.getpid()}.json") as f:
+            return json.load(f)
+
+    snapshot = asyncio.run(main())
+    assert snapshot["loop_lag_ms"] >= 100
+
+
+def test_request_job_rejects_when_overloaded(tmp_path, monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+
+    class FakeRequest:
+        def __init__(self):
+            self.result = None
+
+        async def accept(self):
+            self.result = "accepted"
+
+        async def reject(self):
+            self.result = "rejected"
+
+    estimator = make_estimator(tmp_path)
+    monkeypatch.setattr(agent, "get_load_estimator", lambda: estimator)
+    monkeypatch.setattr(agent, "log_metric", lambda *args, **kwargs: None)
+
+    req = FakeRequest()
+    asyncio.run(agent.request_job(req))
+    assert req.result == "accepted"
+
+    write_snapshot(tmp_path, 1, stt_pending=8)
+    req = FakeRequest()
+    asyncio.run(agent.request_job(req))
+    assert req.result == "rejected"
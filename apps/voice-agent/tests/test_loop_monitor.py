@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+
+from monitoring import LoopMonitor
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+def run_with_block(tmp_path, block_sec, **options):
+    """감시 시작 후 루프를 block_sec 동안 막고, 보고된 메트릭과 감시기 반환"""
+    metrics = []
+
+    async def main():
+        monitor = LoopMonitor(
+            lambda event, value, **kw: metrics.append((event, value, kw)),
+            interval_ms=10,
+            stall_threshold_ms=50,
+            report_interval_sec=0.3,
+            profile_dir=str(tmp_path),
+            **options,
+        )
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_call(block_sec)
+        await asyncio.sleep(0.35)
+        monitor.stop()
+        return monitor
+
+    return asyncio.run(main()), metrics
+
+
+def test_reports_lag_and_stall_with_stack(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING, logger="voice-agent.monitoring.loop"):
+        monitor, metrics = run_with_block(tmp_path, 0.2)
+
+    event, p95_ms, fields = metrics[0]
+    assert event == "event_loop_lag"
+    assert fields["max_ms"] >= 150
+    assert fields["stalls"] == 1
+    assert monitor.recent_lag_ms(q=100) >= 150
+    # 멈춤 당시 루프 스레드에서 실행 중이던 함수가 스택에 기록됨
+    assert "blocking_call" in caplog.text
+
+
+def test_no_stall_when_loop_is_responsive(tmp_path):
+    monitor, metrics = run_with_block(tmp_path, 0.0)
+    _, _, fields = metrics[0]
+    assert fields["stalls"] == 0
+    assert fields["max_ms"] < 50
+
+
+def test_profile_writes_collapsed_stacks(tmp_path):
+    async def main():
+        monitor = LoopMonitor(lambda *a, **kw: None, profile_dir=str(tmp_path), profile_hz=200)
+        monitor.start()
+        path = monitor.start_profile(duration_sec=0.2)
+        assert monitor.start_profile(duration_sec=0.2) is None  # 동시 실행 방지
+        blocking_call(0.15)
+        await asyncio.sleep(0.15)
+        monitor.stop()
+        return path
+
+    path = asyncio.run(main())
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert any("blocking_call" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
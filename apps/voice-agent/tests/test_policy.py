@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import pytest
+
+from llm import ChatCompletionResponse, GenerationPolicy, LLMProvider, classify_question
+from llm.policy import ReplyLimiter
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("안녕", "short"),
+    ("이거 어떻게 해요?", "explain"),
+    ("두 방법의 차이를 알려줘", "explain"),
+    ("How do I reset it?", "explain"),
+    ("why?", "explain"),
+    ("Show me the weather", "normal"),
+    ("show me", "short"),
+    ("Somehow the meeting got moved to Friday", "normal"),
+    ("오늘 날씨가 어떤지 궁금해요", "normal"),
+])
+def test_classify_question(text, expected):
+    assert classify_question(text) == expected
+
+
+def test_limiter_stops_after_sentence_budget_across_chunks():
+    limiter = ReplyLimiter("normal", 120, max_sentences=2, time_budget_ms=0)
+    assert limiter.feed("첫 문장입니다.") == ("첫 문장입니다.", False)
+    # 종결 부호 뒤 공백이 다음 조각으로 오는 경우
+    assert limiter.feed(" 두 번째") == (" 두 번째", False)
+    text, stop = limiter.feed("입니다! 세 번째")
+    assert stop and text == "입니다!"
+    assert limiter.text == "첫 문장입니다. 두 번째입니다!" and limiter.truncated == "sentences"
+
+
+def test_time_budget_starts_at_first_token(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    limiter = ReplyLimiter("normal", 120, max_sentences=0, time_budget_ms=1000)
+
+    now[0] += 5.0  # 대기열/TTFT는 예산에 포함되지 않음
+    assert limiter.remaining_sec() is None
+    assert limiter.feed("첫 문장. 두 번째") == ("첫 문장. 두 번째", False)
+    now[0] += 0.4
+    assert limiter.remaining_sec() == pytest.approx(0.6)
+    now[0] += 0.7
+    text, stop = limiter.feed(" 문장")
+    assert stop and limiter.truncated == "time"
+    assert limiter.text == "첫 문장."  # 완결된 문장까지만 유지
+
+
+def test_finish_marks_max_tokens_truncation():
+    limiter = ReplyLimiter("short", 60, max_sentences=3, time_budget_ms=0)
+    limiter.feed("응답")
+    assert limiter.finish(None, "length") == 1 and limiter.truncated == "max_tokens"
+
+    limiter = ReplyLimiter("short", 60, max_sentences=3, time_budget_ms=0)
+    limiter.feed("응답")
+    assert limiter.finish(60) == 60 and limiter.truncated == "max_tokens"
+
+    limiter = ReplyLimiter("short", 60, max_sentences=3, time_budget_ms=0)
+    limiter.feed("응답")
+    assert limiter.finish(30, "stop") == 30 and limiter.truncated is None
+
+
+def test_policy_budget_adapts_to_recent_replies():
+    policy = GenerationPolicy(min_tokens=40, max_tokens=400)
+    assert policy.budget("explain") == 240
+    for tokens in (20, 20):
+        limiter = policy.start("안녕")
+        policy.record(limiter, tokens)
+    assert policy.budget("explain") == int((240 + 30) / 2)
+    assert policy.budget("short") == 45
+    assert policy.truncation_rate() == 0.0
+
+
+class ScriptedProvider(LLMProvider):
+    """지연 후 정해진 조각을 스트리밍하는 Provider 대역"""
+
+    def __init__(self, chunks, first_delay=0.0, delay=0.0):
+        self.chunks = chunks
+        self.first_delay = first_delay
+        self.delay = delay
+
+    async def chat(self, messages, temperature=None, max_tokens=None):
+        return ChatCompletionResponse(content="".join(self.chunks), model="scripted")
+
+    async def chat_stream(self, messages, temperature=None, max_tokens=None, stats=None):
+        await asyncio.sleep(self.first_delay)
+        for chunk in self.chunks:
+            yield chunk
+            await asyncio.sleep(self.delay)
+
+    def get_model_name(self):
+        return "scripted"
+
+    def get_provider_type(self):
+        return "scripted"
+
+
+@pytest.fixture
+def agent_with(monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+
+    def install(provider):
+        monkeypatch.setattr(agent, "get_llm_provider", lambda: provider)
+        monkeypatch.setattr(agent, "get_llm_cache", lambda: None)
+        return agent
+
+    return install
+
+
+def test_slow_first_token_does_not_empty_reply(agent_with):
+    agent = agent_with(ScriptedProvider(["안녕하세요.", " 반갑습니다."], first_delay=0.3))
+    policy = GenerationPolicy(time_budget_ms=200)
+    reply, _ = asyncio.run(agent.get_llm_response("안녕", [], policy=policy))
+    assert reply == "안녕하세요. 반갑습니다."
+
+
+def test_time_budget_cuts_long_generation(agent_with):
+    agent = agent_with(ScriptedProvider(["첫 문장.", " 두 번째", " 문장", " 계속"], delay=0.1))
+    policy = GenerationPolicy(max_sentences=0, time_budget_ms=150)
+    reply, _ = asyncio.run(agent.get_llm_response("질문", [], policy=policy))
+    assert reply == "첫 문장."
+    assert policy.truncated_turns == 1
+
+
+def test_empty_reply_falls_back_to_apology(agent_with):
+    agent = agent_with(ScriptedProvider(["", "  "]))
+    reply, _ = asyncio.run(agent.get_llm_response("질문", [], policy=GenerationPolicy()))
+    assert reply == agent.LLM_FALLBACK_REPLY
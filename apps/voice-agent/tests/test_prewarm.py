@@ -0,0 +1,105 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from llm import ChatCompletionResponse, ChatMessage, LLMPrewarmer, LLMProvider
+from llm import prewarm as prewarm_module
+
+
+class FakeProvider(LLMProvider):
+    """prewarm 호출을 기록하는 Provider 대역 (지연/실패 지정)"""
+
+    def __init__(self, delay=0.0, error=None, supported=True):
+        self.delay = delay
+        self.error = error
+        self.supported = supported
+        self.prewarmed = []
+
+    async def chat(self, messages, temperature=None, max_tokens=None):
+        return ChatCompletionResponse(content="", model="fake")
+
+    def supports_prewarm(self):
+        return self.supported
+
+    async def prewarm(self, messages):
+        self.prewarmed.append([m.content for m in messages])
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return True
+
+    def get_model_name(self):
+        return "fake"
+
+    def get_provider_type(self):
+        return "fake"
+
+
+def history(*contents):
+    return [ChatMessage(role="system", content="시스템")] + [ChatMessage(role="user", content=c) for c in contents]
+
+
+def make_prewarmer(provider, metrics, **options):
+    return LLMPrewarmer(provider, lambda event, value, **kw: metrics.append(kw["result"]), **options)
+
+
+def test_debounce_and_prefix_reuse(monkeypatch):
+    now = [1000.0]
+    # 이벤트 루프 시계는 그대로 두고 사전 준비 모듈의 시계만 대체
+    monkeypatch.setattr(prewarm_module, "time", SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+    provider, metrics = FakeProvider(delay=0.01), []
+
+    async def main():
+        prewarmer = make_prewarmer(provider, metrics, min_interval_sec=5, reuse_sec=60)
+        assert prewarmer.trigger(history("a"))
+        assert prewarmer.state(history("a")) == "in_flight"
+        assert not prewarmer.trigger(history("b"))  # 진행 중
+        await prewarmer._task
+        assert prewarmer.state(history("a")) == "warm"
+
+        now[0] += 1
+        assert not prewarmer.trigger(history("b"))  # 최소 간격 이내
+        now[0] += 10
+        assert not prewarmer.trigger(history("a"))  # 같은 접두부는 재사용
+        assert prewarmer.trigger(history("b"))
+        await prewarmer._task
+
+        now[0] += 61
+        assert prewarmer.state(history("b")) == "cold"  # 재사용 시간 경과
+        assert prewarmer.trigger(history("b"))
+        await prewarmer._task
+
+    asyncio.run(main())
+    assert [p[-1] for p in provider.prewarmed] == ["a", "b", "b"]
+    assert metrics == ["warmed", "warmed", "warmed"]
+
+
+def test_failure_is_swallowed_and_not_marked_warm():
+    provider, metrics = FakeProvider(error=ConnectionError("down")), []
+
+    async def main():
+        prewarmer = make_prewarmer(provider, metrics, min_interval_sec=0)
+        assert prewarmer.trigger(history("a"))
+        await asyncio.gather(prewarmer._task)  # 예외가 Task 밖으로 전파되지 않음
+        assert prewarmer.state(history("a")) == "cold"
+        assert prewarmer.trigger(history("a"))  # 실패한 접두부는 다시 시도
+        await prewarmer._task
+
+    asyncio.run(main())
+    assert metrics == ["error", "error"]
+
+
+def test_cancel_and_unsupported_provider():
+    provider, metrics = FakeProvider(delay=10), []
+
+    async def main():
+        prewarmer = make_prewarmer(provider, metrics)
+        assert prewarmer.trigger(history("a"))
+        await asyncio.sleep(0)
+        prewarmer.cancel()
+        await asyncio.gather(prewarmer._task, return_exceptions=True)
+        assert prewarmer.state(history("a")) == "cold"
+        assert not make_prewarmer(FakeProvider(supported=False), metrics).trigger(history("a"))
+
+    asyncio.run(main())
+    assert metrics == ["cancelled"]
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from transport import RESPONSE_BINARY_TOPIC, ResponseStreamer, decode_binary, encode_binary
+from transport.response_stream import KIND_DELTA, KIND_DONE
+
+
+def collect_stream(binary: bool, identity: str, deltas: list[str]):
+    sent = []
+
+    async def publish(payload, topic=None):
+        sent.append((payload, topic))
+
+    async def main():
+        streamer = ResponseStreamer(publish, 3, identity=identity, max_chars=4, max_delay_ms=1000, binary=binary)
+        for delta in deltas:
+            await streamer.push(delta)
+        await streamer.done("".join(deltas))
+
+    asyncio.run(main())
+    return sent
+
+
+def test_json_chunks_carry_identity_and_turn():
+    sent = collect_stream(False, "alice", ["안녕", "하세요", " 반가워요"])
+    messages = [json.loads(payload) for payload, topic in sent]
+
+    assert all(topic is None for _, topic in sent)
+    assert {(m["identity"], m["turn"]) for m in messages} == {("alice", 3)}
+    assert [m["seq"] for m in messages] == list(range(1, len(messages) + 1))
+    assert messages[-1]["type"] == "response_done" and messages[-1]["text"] == "안녕하세요 반가워요"
+    assert "".join(m["text"] for m in messages[:-1]) == "안녕하세요 반가워요"
+
+
+def test_binary_chunks_carry_identity_and_turn():
+    sent = collect_stream(True, "참가자-1", ["첫 조각", "두 번째"])
+    frames = [decode_binary(payload) for payload, topic in sent]
+
+    assert all(topic == RESPONSE_BINARY_TOPIC for _, topic in sent)
+    assert {(identity, turn) for _, turn, _, identity, _ in frames} == {("참가자-1", 3)}
+    assert frames[-1][0] == KIND_DONE and frames[-1][4] == "첫 조각두 번째"
+
+
+def test_binary_identity_is_truncated_on_character_boundary():
+    identity = "가" * 100  # 300 bytes
+    kind, turn, seq, decoded, text = decode_binary(encode_binary(KIND_DELTA, 1, 2, identity, "본문"))
+    assert (kind, turn, seq, text) == (KIND_DELTA, 1, 2, "본문")
+    assert decoded == "가" * 85
@@ -0,0 +1,153 @@
+import asyncio
+import collections
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from session import SessionRegistry
+
+
+def make_registry(metrics):
+    return SessionRegistry(lambda event, value, **kw: metrics.append((event, kw)), report_interval_sec=60)
+
+
+def slow_cancel_conversation(started, cleaned_up):
+    """취소 시 정리에 시간이 걸리는 handle_conversation 대역"""
+
+    async def run(session):
+        started.append(session)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await asyncio.sleep(0.05)
+            cleaned_up.append(session)
+
+    return run
+
+
+def test_resubscribe_while_cancelling_starts_new_session():
+    metrics, started, cleaned_up = [], [], []
+
+    async def main():
+        registry = make_registry(metrics)
+        run = slow_cancel_conversation(started, cleaned_up)
+        first = registry.start("alice", "TR_1", run)
+        await asyncio.sleep(0)
+
+        # 구독 해제 직후 같은 트랙 재구독 (이전 Task는 아직 취소 처리 중)
+        assert registry.close("alice", "TR_1", reason="unsubscribed") == 1
+        second = registry.start("alice", "TR_1", run)
+        assert second is not None and second is not first
+        await asyncio.sleep(0.1)
+
+        assert first.task.done() and second.is_active()
+        assert len(registry) == 1
+        await registry.close_all()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert [s is first for s in started] == [True, False]
+    assert cleaned_up == [first, second]
+    assert [kw["active_sessions"] for event, kw in metrics if event == "session_closed"] == [1, 0]
+
+
+def test_resubscribe_while_active_is_ignored():
+    metrics, started, cleaned_up = [], [], []
+
+    async def main():
+        registry = make_registry(metrics)
+        run = slow_cancel_conversation(started, cleaned_up)
+        registry.start("alice", "TR_1", run)
+        assert registry.start("alice", "TR_1", run) is None
+        await asyncio.sleep(0)
+        await registry.close_all()
+
+    asyncio.run(main())
+    assert len(started) == 1
+
+
+def test_rapid_churn_leaves_one_session():
+    metrics, started, cleaned_up = [], [], []
+
+    async def main():
+        registry = make_registry(metrics)
+        run = slow_cancel_conversation(started, cleaned_up)
+        for _ in range(5):
+            registry.start("alice", "TR_1", run)
+            await asyncio.sleep(0)
+            registry.close("alice", "TR_1")
+        last = registry.start("alice", "TR_1", run)
+        await asyncio.sleep(0.1)
+        assert len(registry) == 1 and last.is_active()
+        await registry.close_all()
+
+    asyncio.run(main())
+    assert len(started) == 6 and len(cleaned_up) == 6
+
+
+def test_new_track_replaces_previous_track():
+    metrics, started, cleaned_up = [], [], []
+
+    async def main():
+        registry = make_registry(metrics)
+        run = slow_cancel_conversation(started, cleaned_up)
+        first = registry.start("alice", "TR_1", run)
+        await asyncio.sleep(0)
+        second = registry.start("alice", "TR_2", run)
+        await asyncio.sleep(0.1)
+        assert first.task.done() and second.is_active()
+        await registry.close_all()
+
+    asyncio.run(main())
+    assert [kw["track_sid"] for event, kw in metrics if event == "session_closed"] == ["TR_1", "TR_2"]
+
+
+def conversation_with_buffers(freed):
+    """handle_conversation 크기의 버퍼를 잡는 대역 (48kHz 20ms 프레임 30초 + 발화 앞 여유 + 대화 기록 + 턴 Task)"""
+
+    async def run(session):
+        frames = [np.full(960, i, dtype=np.int16) for i in range(1500)]
+        padding = collections.deque(frames[-15:], maxlen=15)
+        history = [{"role": "user", "content": "안녕하세요" * 40}] * 20
+        turn = asyncio.create_task(asyncio.Event().wait())
+        session.resource_stats = lambda: {"buffered_frames": len(frames) + len(padding), "history": len(history)}
+        weakref.finalize(frames[0], freed.append, session.track_sid)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            turn.cancel()
+            await asyncio.gather(turn, return_exceptions=True)
+
+    return run
+
+
+def test_churn_keeps_rss_flat():
+    agent = pytest.importorskip("agent")
+    metrics, freed = [], []
+    cycles, warmup = 120, 20
+
+    async def churn(registry, start, count):
+        run = conversation_with_buffers(freed)
+        for i in range(start, start + count):
+            registry.start("alice", f"TR_{i}", run)
+            await asyncio.sleep(0)
+            registry.close("alice", reason="unsubscribed")
+            await asyncio.sleep(0)
+
+    async def main():
+        registry = make_registry(metrics)
+        await churn(registry, 0, warmup)
+        gc.collect()
+        baseline = agent.get_rss_mb()
+        await churn(registry, warmup, cycles - warmup)
+        await registry.close_all()
+        gc.collect()
+        return registry, baseline, agent.get_rss_mb()
+
+    registry, baseline, final = asyncio.run(main())
+    # 누수 시 세션당 약 3MB (100회면 300MB) 증가
+    assert final - baseline < 30, f"RSS grew {final - baseline:.1f}MB over {cycles - warmup} sessions"
+    assert len(registry) == 0 and len(freed) == cycles
+    assert sum(1 for event, _ in metrics if event == "session_closed") == cycles
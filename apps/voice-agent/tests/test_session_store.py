@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from session import ConversationStateStore
+
+HISTORY = [{"role": "user", "content": "안녕"}, {"role": "assistant", "content": "안녕하세요."}]
+
+
+def test_batched_write_and_restore(redis_url):
+    async def main():
+        writer = ConversationStateStore(redis_url, flush_interval_ms=10)
+        writer.save("room", "alice", HISTORY[:1], 1)
+        writer.save("room", "alice", HISTORY, 2)  # 같은 키는 최신 상태만 기록
+        writer.save("room", "bob", HISTORY, 1)
+        await asyncio.sleep(0.2)
+
+        reader = ConversationStateStore(redis_url)  # 재시작 후 다른 Job 프로세스
+        alice, missing = await reader.load("room", "alice"), await reader.load("room", "carol")
+        ttl = await reader.client.ttl(ConversationStateStore.key("room", "alice"))
+        await writer.close()
+        await reader.close()
+        return writer.totals, alice, missing, ttl
+
+    totals, alice, missing, ttl = asyncio.run(main())
+    assert alice.history == HISTORY and alice.turns == 2
+    assert missing is None
+    assert 0 < ttl <= 3600
+    assert totals["written"] == 2 and totals["flushes"] == 1 and totals["errors"] == 0
+
+
+def test_close_flushes_pending_state(redis_url):
+    async def main():
+        store = ConversationStateStore(redis_url, flush_interval_ms=60000)
+        store.save("room", "alice", HISTORY, 1)
+        await store.close()  # Job 종료 콜백
+
+        reader = ConversationStateStore(redis_url)
+        state = await reader.load("room", "alice")
+        await reader.close()
+        return state
+
+    assert asyncio.run(main()).history == HISTORY
+
+
+def test_load_error_is_not_a_miss(unused_redis_url):
+    async def main():
+        store = ConversationStateStore(unused_redis_url, timeout_sec=0.2, retry_after_sec=30)
+        with pytest.raises(Exception):
+            await store.load("room", "alice")
+        assert not store.available()
+        # 쓰기 보류 중에도 조회 결과를 "없음"으로 보지 않음
+        with pytest.raises(ConnectionError):
+            await store.load("room", "alice")
+        await store.close()
+        return store.totals
+
+    assert asyncio.run(main())["errors"] == 1
+
+
+def test_store_is_opt_in(monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+
+    monkeypatch.setattr(agent, "_session_store", None)
+    monkeypatch.setattr(agent, "SESSION_STATE_REDIS_URL", "redis://127.0.0.1:6379/2")
+    monkeypatch.setattr(agent, "SESSION_STATE_ENABLED", False)
+    assert agent.get_session_store() is None
+
+    monkeypatch.setattr(agent, "SESSION_STATE_ENABLED", True)
+    monkeypatch.setattr(agent, "SESSION_STATE_REDIS_URL", "")
+    assert agent.get_session_store() is None
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from stt import STTClient, STTServer
+
+
+class _Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Info:
+    language = "ko"
+
+
+class FakeWhisper:
+    """동시 추론 수를 기록하는 가짜 모델"""
+
+    def __init__(self, delay_sec=0.05):
+        self.delay_sec = delay_sec
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **options):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay_sec)
+        with self._lock:
+            self.active -= 1
+        return [_Segment(f" {len(audio)} ")], _Info()
+
+
+def test_requests_run_concurrently_up_to_workers(tmp_path):
+    model = FakeWhisper()
+
+    async def main():
+        server = STTServer(lambda: model, socket_path=str(tmp_path / "stt.sock"), workers=2)
+        await server.start()
+        try:
+            client = STTClient(server.socket_path, timeout=5.0)
+            results = await asyncio.gather(*[
+                client.transcribe(np.zeros(100 + i, dtype=np.float32), language="ko") for i in range(6)
+            ])
+        finally:
+            await server.close()
+        return server, results
+
+    server, results = asyncio.run(main())
+
+    assert [r.text for r in results] == [str(100 + i) for i in range(6)]
+    assert model.max_active == 2
+    assert any(r.queue_ms > 0 for r in results)
+    assert server._dispatch_task.done()
+    assert not (tmp_path / "stt.sock").exists()
+
+
+def test_close_fails_pending_requests(tmp_path):
+    model = FakeWhisper(delay_sec=0.5)
+
+    async def main():
+        server = STTServer(lambda: model, socket_path=str(tmp_path / "stt.sock"), workers=1)
+        await server.start()
+        jobs = [asyncio.create_task(_submit(server, i)) for i in range(3)]
+        await asyncio.sleep(0.1)
+        await server.close()
+        return await asyncio.wait_for(asyncio.gather(*jobs, return_exceptions=True), 5.0)
+
+    async def _submit(server, i):
+        from stt.server import _Job
+
+        job = _Job(np.zeros(10 + i, dtype=np.float32), {})
+        await server._queue.put(job)
+        return await job.future
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ConnectionError) for r in results)
+
+
+def speech_frames(seconds=1.0, sample_rate=16000):
+    pcm = (0.1 * np.sin(2 * np.pi * 220 * np.arange(int(seconds * sample_rate)) / sample_rate) * 32767).astype(np.int16)
+    return [SimpleNamespace(data=pcm.tobytes(), sample_rate=sample_rate)]
+
+
+@pytest.fixture
+def agent_module(monkeypatch):
+    pytest.importorskip("livekit.agents")
+    import agent
+
+    monkeypatch.setattr(agent, "STT_SERVER_SOCKET", "/tmp/missing-stt.sock")
+    monkeypatch.setattr(agent, "_whisper_model", None)
+    return agent
+
+
+def test_server_down_falls_back_to_local_whisper(agent_module, monkeypatch, tmp_path):
+    agent = agent_module
+    client = STTClient(str(tmp_path / "missing.sock"), timeout=1.0, retry_after_sec=30)
+    model, loads = FakeWhisper(delay_sec=0), []
+    monkeypatch.setattr(agent, "get_stt_client", lambda: client)
+    monkeypatch.setattr(agent, "get_whisper_model", lambda: loads.append(1) or model)
+
+    text, duration_ms = asyncio.run(agent.transcribe_audio(speech_frames()))
+    assert text == "16000" and duration_ms > 0
+    assert not client.available()
+
+    # 보류 중에는 서버에 요청하지 않고 바로 프로세스 내 모델 사용
+    monkeypatch.setattr(client, "transcribe", lambda *a, **kw: pytest.fail("server used while backing off"))
+    assert asyncio.run(agent.transcribe_audio(speech_frames()))[0] == "16000"
+    assert loads == [1, 1]
+
+
+def test_server_and_local_failure_returns_empty_turn(agent_module, monkeypatch, tmp_path):
+    agent = agent_module
+    client = STTClient(str(tmp_path / "missing.sock"), timeout=1.0)
+
+    def unavailable():
+        raise RuntimeError("faster-whisper not installed")
+
+    monkeypatch.setattr(agent, "get_stt_client", lambda: client)
+    monkeypatch.setattr(agent, "get_whisper_model", unavailable)
+    assert asyncio.run(agent.transcribe_audio(speech_frames())) == ("", 0.0)
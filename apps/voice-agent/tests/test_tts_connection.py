@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("edge_tts")
+from aiohttp import web
+
+from tts import TTSConnectionManager
+from tts.connection import build_edge_url_and_headers
+
+HANDSHAKE_DELAY_SEC = 0.1  # TLS/websocket 핸드셰이크 비용 흉내
+AUDIO_HEADER = b"Path:audio\r\nContent-Type:audio/mpeg"
+
+
+class EdgeStandIn:
+    """edge-tts 합성 websocket 대역 (speech.config 후 ssml마다 오디오 1개 + turn.end)"""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.drop_next = False
+
+    async def handler(self, request):
+        self.connections += 1
+        await asyncio.sleep(HANDSHAKE_DELAY_SEC)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            if "Path:ssml" not in message.data:
+                continue
+            if self.drop_next:
+                self.drop_next = False
+                await ws.close()
+                break
+            self.requests.append(message.data)
+            await ws.send_str("X-RequestId:x\r\nPath:turn.start\r\n\r\n{}")
+            await ws.send_bytes(len(AUDIO_HEADER).to_bytes(2, "big") + AUDIO_HEADER + b"\x00" * 1000)
+            await ws.send_str("X-RequestId:x\r\nPath:turn.end\r\n\r\n{}")
+        return ws
+
+
+async def start_stand_in(stand_in):
+    app = web.Application()
+    app.router.add_get("/ws", stand_in.handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"ws://127.0.0.1:{port}/ws"
+
+
+async def timed_synthesize(manager, text, voice="ko-KR-SunHiNeural"):
+    """첫 오디오 청크까지의 시간(ms), 총 바이트, 연결 통계"""
+    stats = {}
+    start = time.perf_counter()
+    first_ms = None
+    total = 0
+    async for chunk in manager.synthesize(text, voice, stats):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+        total += len(chunk)
+    return first_ms, total, stats
+
+
+def test_reused_connection_skips_handshake():
+    async def main():
+        stand_in = EdgeStandIn()
+        runner, url = await start_stand_in(stand_in)
+        manager = TTSConnectionManager(url=url)
+        try:
+            results = [await timed_synthesize(manager, f"문장 {i} <tag>") for i in range(3)]
+        finally:
+            await manager.close()
+            await runner.cleanup()
+        return stand_in, results
+
+    stand_in, results = asyncio.run(main())
+    cold_ms, total, stats = results[0]
+    assert total == 1000 and not stats["reused"]
+    assert cold_ms >= HANDSHAKE_DELAY_SEC * 1000
+    for warm_ms, _, stats in results[1:]:
+        assert stats["reused"]
+        assert warm_ms < HANDSHAKE_DELAY_SEC * 1000 / 2
+    assert stand_in.connections == 1
+    assert "&lt;tag&gt;" in stand_in.requests[0]
+
+
+def test_warm_hides_connect_latency():
+    async def main():
+        stand_in = EdgeStandIn()
+        runner, url = await start_stand_in(stand_in)
+        manager = TTSConnectionManager(url=url)
+        try:
+            manager.warm("ko-KR-SunHiNeural")
+            await asyncio.sleep(HANDSHAKE_DELAY_SEC * 2)
+            return await timed_synthesize(manager, "안녕하세요")
+        finally:
+            await manager.close()
+            await runner.cleanup()
+
+    first_ms, _, stats = asyncio.run(main())
+    assert stats["prewarmed"]
+    assert first_ms < HANDSHAKE_DELAY_SEC * 1000 / 2
+
+
+def test_stale_connection_reconnects_once():
+    async def main():
+        stand_in = EdgeStandIn()
+        runner, url = await start_stand_in(stand_in)
+        manager = TTSConnectionManager(url=url)
+        try:
+            await timed_synthesize(manager, "첫 문장")
+            stand_in.drop_next = True
+            _, total, _ = await timed_synthesize(manager, "두 번째 문장")
+        finally:
+            await manager.close()
+            await runner.cleanup()
+        return stand_in, total, manager
+
+    stand_in, total, manager = asyncio.run(main())
+    assert total == 1000
+    assert stand_in.connections == 2
+    assert not manager._closing
+
+
+def test_edge_url_uses_pinned_edge_tts_internals():
+    url, headers = build_edge_url_and_headers()
+    assert url.startswith("wss://") and "&Sec-MS-GEC=" in url and "&ConnectionId=" in url
+    assert any(k.lower() == "cookie" for k in headers)
@@ -0,0 +1,261 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("livekit.plugins.silero")
+from livekit import rtc
+from livekit.agents import vad as agents_vad
+from livekit.plugins.silero import onnx_model
+
+from speech import BatchedVAD, BatchedVADStream, EnergyGate, RemoteVAD, VADServer
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+
+
+@pytest.fixture(scope="module")
+def session():
+    return onnx_model.new_inference_session(force_cpu=True)
+
+
+def vowel(duration: float, f0: float = 120.0, seed: int = 0) -> np.ndarray:
+    """성문 펄스열 + 포먼트 공진기로 만든 합성 모음 ("아")"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = np.cumsum(f0 * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / SAMPLE_RATE
+    y = np.zeros_like(t)
+    y[np.flatnonzero(np.diff(np.floor(phase)) > 0)] = 1.0
+    for freq, bandwidth in ((700, 130), (1220, 70), (2600, 160)):
+        r = np.exp(-np.pi * bandwidth / SAMPLE_RATE)
+        a1, a2 = -2 * r * np.cos(2 * np.pi * freq / SAMPLE_RATE), r * r
+        out = np.zeros_like(y)
+        y1 = y2 = 0.0
+        for i, x in enumerate(y):
+            v = (1 - r) * x - a1 * y1 - a2 * y2
+            out[i] = v
+            y2, y1 = y1, v
+        y = out
+    envelope = np.minimum(1, np.minimum(t / 0.05, (duration - t) / 0.05)) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2)
+    y = y * envelope / np.max(np.abs(y)) * 0.3
+    return (y + rng.normal(0, 0.001, len(y))).astype(np.float32)
+
+
+def utterance(lead_sec: float, seed: int = 0, f0: float = 120.0) -> np.ndarray:
+    """무음 - 모음 - 무음 (길이는 윈도우 배수)"""
+    signal = np.concatenate([
+        np.zeros(int(lead_sec * SAMPLE_RATE), np.float32),
+        vowel(0.8, f0=f0, seed=seed),
+        np.zeros(SAMPLE_RATE, np.float32),
+    ])
+    return signal[: len(signal) // WINDOW * WINDOW]
+
+
+def to_int16(signal: np.ndarray) -> np.ndarray:
+    return (signal * 32767).astype(np.int16)
+
+
+def reference_probabilities(session, signal: np.ndarray) -> list[float]:
+    """단일 스트림 Silero 순차 추론 (컨텍스트 64샘플 + RNN 상태 유지)
+
+    livekit silero 0.12의 OnnxModel은 RNN 상태를 갱신하지 않으므로 같은 세션을 직접 실행한다.
+    """
+    pcm = to_int16(signal).astype(np.float32) / 32767.0
+    context = np.zeros(64, np.float32)
+    state = np.zeros((2, 1, 128), np.float32)
+    probabilities = []
+    for start in range(0, len(pcm) - WINDOW + 1, WINDOW):
+        inputs = np.concatenate([context, pcm[start:start + WINDOW]])[None]
+        out, state = session.run(None, {"input": inputs, "state": state, "sr": np.array(SAMPLE_RATE, np.int64)})
+        context = inputs[0, -64:]
+        probabilities.append(out.item())
+    return probabilities
+
+
+def run_batched(vad: BatchedVAD, signals: list[np.ndarray], chunk: int = 160, monkeypatch=None):
+    """스트림별 10ms 청크를 번갈아 넣고 (윈도우 확률, 이벤트) 수집"""
+    probabilities: dict[int, list[float]] = {}
+    if monkeypatch:
+        update = BatchedVADStream.update
+
+        def record(stream, probability, *args):
+            probabilities.setdefault(id(stream), []).append(probability)
+            update(stream, probability, *args)
+
+        monkeypatch.setattr(BatchedVADStream, "update", record)
+
+    async def main():
+        streams = [vad.stream() for _ in signals]
+        pcms = [to_int16(s) for s in signals]
+
+        async def collect(stream):
+            return [event async for event in stream]
+
+        tasks = [asyncio.create_task(collect(s)) for s in streams]
+        for offset in range(0, max(len(p) for p in pcms), chunk):
+            for stream, pcm in zip(streams, pcms):
+                stream.push_pcm(pcm[offset:offset + chunk])
+            await asyncio.sleep(0)
+        for stream in streams:
+            stream.end_input()
+        events = await asyncio.gather(*tasks)
+        return [probabilities.get(id(s), []) for s in streams], events
+
+    return asyncio.run(main())
+
+
+def event_summary(events) -> list[tuple[str, int]]:
+    return [(e.type.name, e.samples_index) for e in events]
+
+
+def test_energy_gate_separates_silence_noise_and_voice():
+    rng = np.random.default_rng(1)
+    windows = np.stack([
+        np.zeros(WINDOW, np.float32),
+        rng.normal(0, 0.0005, WINDOW).astype(np.float32),  # -66dB 잡음
+        rng.normal(0, 0.005, WINDOW).astype(np.float32),  # -46dB 광대역 잡음 (영교차율 높음)
+        vowel(0.1)[800:800 + WINDOW],
+        (0.01 * np.sin(2 * np.pi * 200 * np.arange(WINDOW) / SAMPLE_RATE)).astype(np.float32),  # -43dB 저음
+    ])
+    assert EnergyGate(-50.0, 0.35).silent(windows).tolist() == [True, True, True, False, False]
+
+
+def test_batched_probabilities_match_sequential_silero(session, monkeypatch):
+    signals = [utterance(0.5), utterance(0.2, seed=1, f0=180.0), utterance(0.9, seed=2, f0=95.0)]
+    vad = BatchedVAD(session, batch_wait_ms=0)
+    probabilities, events = run_batched(vad, signals, monkeypatch=monkeypatch)
+
+    for signal, batched in zip(signals, probabilities):
+        np.testing.assert_allclose(batched, reference_probabilities(session, signal), atol=1e-4)
+    assert vad.totals["batches"] < vad.totals["windows"]  # 여러 스트림이 한 번의 추론으로 묶임
+    for stream_events in events:
+        assert [name for name, _ in event_summary(stream_events)] == ["START_OF_SPEECH", "END_OF_SPEECH"]
+
+
+def test_batched_events_follow_silero_rules(session):
+    signal = utterance(0.5)
+    (events,) = run_batched(BatchedVAD(session, batch_wait_ms=0), [signal])[1]
+    start, end = events
+    assert start.type == agents_vad.VADEventType.START_OF_SPEECH and start.speaking
+    assert 0.5 <= start.timestamp <= 0.6  # 모음 시작 직후
+    assert end.type == agents_vad.VADEventType.END_OF_SPEECH and not end.speaking
+    assert end.silence_duration >= 0.55 and end.timestamp < len(signal) / SAMPLE_RATE
+    assert start.frames == [] and end.frames == []
+
+
+def test_gate_skips_silence_with_close_events(session):
+    signals = [
+        utterance(0.5),
+        np.concatenate([utterance(1.0, seed=3), utterance(0.3, seed=4)]),
+        np.concatenate([utterance(0.4, seed=6, f0=95.0), utterance(3.0, seed=7)]),
+    ]
+    ungated = run_batched(BatchedVAD(session, batch_wait_ms=0), signals)[1]
+    gated_vad = BatchedVAD(session, gate=EnergyGate(), batch_wait_ms=0)
+    gated = run_batched(gated_vad, signals)[1]
+
+    assert event_summary(gated[0]) == event_summary(ungated[0])
+    for gated_events, events in zip(gated, ungated):
+        assert [name for name, _ in event_summary(gated_events)] == [name for name, _ in event_summary(events)]
+        for (name, gated_index), (_, index) in zip(event_summary(gated_events), event_summary(events)):
+            # 생략한 윈도우는 확률 0으로 평활화되어 확률이 임계값 근처인 발화 끝은 조금 어긋날 수 있음
+            tolerance = WINDOW if name == "START_OF_SPEECH" else 8 * WINDOW
+            assert abs(index - gated_index) <= tolerance
+    assert gated_vad.totals["gated"] / gated_vad.totals["windows"] > 0.3
+
+
+def make_frames(signal: np.ndarray, sample_rate: int = SAMPLE_RATE, samples: int = 160) -> list[rtc.AudioFrame]:
+    pcm = to_int16(signal)
+    return [
+        rtc.AudioFrame(pcm[i:i + samples].tobytes(), sample_rate, 1, len(pcm[i:i + samples]))
+        for i in range(0, len(pcm), samples)
+    ]
+
+
+async def stream_events(vad, frames) -> list:
+    stream = vad.stream()
+    for frame in frames:
+        stream.push_frame(frame)
+        await asyncio.sleep(0)
+    stream.end_input()
+    events = [event async for event in stream]
+    await stream.aclose()
+    return events
+
+
+def test_remote_vad_matches_in_process_vad(session, tmp_path):
+    frames = make_frames(utterance(0.5))
+    socket_path = str(tmp_path / "vad.sock")
+
+    async def main():
+        local = await stream_events(BatchedVAD(session, batch_wait_ms=0), frames)
+        server = VADServer(lambda: BatchedVAD(session, batch_wait_ms=0), socket_path=socket_path)
+        await server.start()
+        remote = RemoteVAD(socket_path, fallback=lambda: pytest.fail("fallback used"))
+        try:
+            results = await asyncio.gather(stream_events(remote, frames), stream_events(remote, frames))
+        finally:
+            await server.close()
+        return local, results, server.vad.totals
+
+    local, results, totals = asyncio.run(main())
+    assert len(local) == 2
+    for events in results:
+        assert event_summary(events) == event_summary(local)
+    # 두 Job 프로세스의 스트림이 서버의 한 BatchedVAD에서 함께 배치됨
+    assert totals["batches"] < totals["windows"]
+
+
+def test_remote_vad_falls_back_when_server_is_down(session, tmp_path):
+    frames = make_frames(utterance(0.5))
+    fallback = BatchedVAD(session, batch_wait_ms=0)
+
+    async def main():
+        remote = RemoteVAD(str(tmp_path / "missing.sock"), fallback=lambda: fallback)
+        events = await stream_events(remote, frames)
+        return remote, events, await stream_events(BatchedVAD(session, batch_wait_ms=0), frames)
+
+    remote, events, local = asyncio.run(main())
+    assert not remote.available()
+    assert event_summary(events) == event_summary(local)
+    assert fallback.totals["windows"] > 0
+
+
+def test_remote_vad_falls_back_when_server_stalls(session, tmp_path):
+    frames = make_frames(np.concatenate([np.zeros(20 * SAMPLE_RATE, np.float32), utterance(0.5)]))
+    socket_path = str(tmp_path / "stalled.sock")
+    fallback = BatchedVAD(session, batch_wait_ms=0)
+
+    async def main():
+        stop = asyncio.Event()
+
+        async def never_read(reader, writer):
+            await stop.wait()  # 연결은 받지만 오디오를 읽지 않는 서버
+
+        server = await asyncio.start_unix_server(never_read, path=socket_path)
+        remote = RemoteVAD(socket_path, fallback=lambda: fallback, max_buffer_bytes=32 * 1024)
+        try:
+            stream = remote.stream()
+            await asyncio.sleep(0.05)  # 연결 후 프레임 전송
+            for frame in frames:
+                stream.push_frame(frame)
+                if stream._writer is not None:
+                    assert stream._writer.transport.get_write_buffer_size() <= 32 * 1024 + 1024
+                await asyncio.sleep(0)
+            stream.end_input()
+            events = await asyncio.wait_for(stream_events_from(stream), 10)
+            await stream.aclose()
+        finally:
+            stop.set()
+            server.close()
+        return remote, events
+
+    async def stream_events_from(stream):
+        return [event async for event in stream]
+
+    remote, events = asyncio.run(main())
+    assert not remote.available()
+    # 멈춘 뒤의 오디오는 프로세스 내 VAD가 처리 (밀린 버퍼 상한만큼만 버림)
+    unsent_windows = (32 * 1024 + 1024) // 2 // WINDOW
+    total_windows = len(frames) * 160 // WINDOW
+    assert 0 < fallback.totals["windows"] < total_windows - unsent_windows
+    assert all(e.type in (agents_vad.VADEventType.START_OF_SPEECH, agents_vad.VADEventType.END_OF_SPEECH) for e in events)
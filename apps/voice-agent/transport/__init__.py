@@ -0,0 +1,14 @@
+from .backoff import Backoff
+from .framing import encode_message, read_message, write_message
+from .response_stream import ResponseStreamer, encode_binary, decode_binary, RESPONSE_BINARY_TOPIC
+
+__all__ = [
+    "Backoff",
+    "encode_message",
+    "read_message",
+    "write_message",
+    "ResponseStreamer",
+    "encode_binary",
+    "decode_binary",
+    "RESPONSE_BINARY_TOPIC",
+]
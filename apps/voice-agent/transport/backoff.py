@@ -0,0 +1,30 @@
+"""
+공유 자원 장애 시 일시 우회 (호스트 서버 / Redis 클라이언트 공용)
+"""
+
+import logging
+import time
+
+
+class Backoff:
+    """오류가 나면 retry_after_sec 동안 사용 보류 (그동안 호출 측은 대체 경로 사용)"""
+
+    def __init__(self, name: str, fallback: str, retry_after_sec: float, logger: logging.Logger):
+        self.name = name              # 로그용 자원 이름 (예: "VAD server (/tmp/vad.sock)")
+        self.fallback = fallback      # 로그용 대체 경로 (예: "using in-process VAD")
+        self.retry_after_sec = retry_after_sec
+        self.logger = logger
+        self.failures = 0
+        self._disabled_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def remaining_sec(self) -> float:
+        """다시 시도할 수 있을 때까지 남은 시간"""
+        return max(0.0, self._disabled_until - time.monotonic())
+
+    def fail(self, e: Exception):
+        self.logger.warning(f"{self.name} unavailable, {self.fallback} for {self.retry_after_sec:.0f}s: {e}")
+        self._disabled_until = time.monotonic() + self.retry_after_sec
+        self.failures += 1
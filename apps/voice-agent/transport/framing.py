@@ -0,0 +1,33 @@
+"""
+호스트 서버 공용 메시지 프레이밍 (STT / LLM 제한 / VAD 서버와 Job 프로세스 간 Unix 소켓)
+"""
+
+import asyncio
+import json
+import struct
+
+# 메시지 프레이밍: 4바이트 big-endian 길이 + JSON 본문
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict:
+    """길이 접두 JSON 메시지 수신"""
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message too large: {length} bytes")
+    body = await reader.readexactly(length)
+    return json.loads(body.decode("utf-8"))
+
+
+def encode_message(message: dict) -> bytes:
+    """길이 접두 JSON 메시지 직렬화"""
+    body = json.dumps(message).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+async def write_message(writer: asyncio.StreamWriter, message: dict):
+    """길이 접두 JSON 메시지 전송"""
+    writer.write(encode_message(message))
+    await writer.drain()
@@ -0,0 +1,121 @@
+"""
+응답 텍스트 점진 전송
+LLM 스트림 조각을 시간/크기 예산으로 묶어 순번이 붙은 response_delta로 보내고,
+마지막에 전체 텍스트가 담긴 response_done으로 클라이언트 상태를 맞춘다.
+턴 번호는 참가자별로 매기므로 메시지마다 대상 참가자 identity를 함께 보내고,
+클라이언트는 (identity, turn) 단위로 조각을 재조립한다.
+
+바이너리 프레이밍 (topic = RESPONSE_BINARY_TOPIC):
+    kind(u8: 1 = delta, 2 = done) turn(u32) seq(u32) identity_len(u8) + UTF-8 identity + UTF-8 텍스트
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger("voice-agent.transport.response_stream")
+
+RESPONSE_BINARY_TOPIC = "agent-response"
+_BINARY_HEADER = struct.Struct(">BIIB")
+KIND_DELTA = 1
+KIND_DONE = 2
+
+
+def encode_binary(kind: int, turn: int, seq: int, identity: str, text: str) -> bytes:
+    # identity는 최대 255바이트 (UTF-8 문자 경계에서 자름)
+    identity_bytes = identity.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+    return _BINARY_HEADER.pack(kind, turn, seq, len(identity_bytes)) + identity_bytes + text.encode("utf-8")
+
+
+def decode_binary(payload: bytes) -> tuple[int, int, int, str, str]:
+    kind, turn, seq, identity_length = _BINARY_HEADER.unpack_from(payload, 0)
+    text_start = _BINARY_HEADER.size + identity_length
+    identity = payload[_BINARY_HEADER.size:text_start].decode("utf-8")
+    return kind, turn, seq, identity, payload[text_start:].decode("utf-8")
+
+
+class ResponseStreamer:
+    """턴 단위 응답 텍스트 스트리머"""
+
+    def __init__(
+        self,
+        publish: Callable[[bytes, Optional[str]], Awaitable[None]],
+        turn: int,
+        identity: str = "",
+        max_chars: int = 24,
+        max_delay_ms: float = 150.0,
+        binary: bool = False,
+    ):
+        self.publish = publish
+        self.turn = turn
+        self.identity = identity
+        self.max_chars = max_chars
+        self.max_delay_sec = max_delay_ms / 1000
+        self.binary = binary
+        self.seq = 0
+        self.messages = 0
+        self.bytes = 0
+        self.started_at = time.time()
+        self.first_text_at: Optional[float] = None
+        self._buffer = ""
+        self._last_flush = self.started_at
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def push(self, delta: str):
+        """LLM 조각 추가 - 크기/시간 예산을 넘으면 전송, 아니면 지연 전송 예약"""
+        if not delta:
+            return
+        self._buffer += delta
+        if len(self._buffer) >= self.max_chars or time.time() - self._last_flush >= self.max_delay_sec:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_delay_sec)
+        await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+            text, self._buffer = self._buffer, ""
+            self._last_flush = time.time()
+            await self._send(KIND_DELTA, text)
+            if self.first_text_at is None:
+                self.first_text_at = time.time()
+
+    async def done(self, full_text: str):
+        """남은 조각 전송 후 전체 텍스트로 마무리"""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+        async with self._lock:
+            await self._send(KIND_DONE, full_text)
+        if self.first_text_at is None:
+            self.first_text_at = time.time()
+
+    async def _send(self, kind: int, text: str):
+        self.seq += 1
+        if self.binary:
+            payload = encode_binary(kind, self.turn, self.seq, self.identity, text)
+            topic = RESPONSE_BINARY_TOPIC
+        else:
+            payload = json.dumps({
+                "type": "response_delta" if kind == KIND_DELTA else "response_done",
+                "identity": self.identity,
+                "turn": self.turn,
+                "seq": self.seq,
+                "text": text,
+            }).encode("utf-8")
+            topic = None
+        self.messages += 1
+        self.bytes += len(payload)
+        await self.publish(payload, topic)
+
+    def first_text_ms(self) -> float:
+        return ((self.first_text_at or time.time()) - self.started_at) * 1000
@@ -0,0 +1,10 @@
+from .connection import TTSConnectionManager, MAX_SSML_TEXT_BYTES
+from .filler import FillerBank, apply_fade, fade_out
+
+__all__ = [
+    "TTSConnectionManager",
+    "MAX_SSML_TEXT_BYTES",
+    "FillerBank",
+    "apply_fade",
+    "fade_out",
+]
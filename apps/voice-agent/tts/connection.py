@@ -0,0 +1,235 @@
+"""
+edge-tts 연결 관리자
+Voice별로 websocket 연결을 미리 열어 두고 (speech.config 전송 완료 상태)
+여러 합성 요청에 재사용해 TLS 핸드셰이크 / 설정 전송 비용을 제거한다.
+
+접속 URL/헤더/DRM 토큰은 edge-tts 내부 모듈(constants, drm)을 그대로 사용하므로
+requirements.txt에서 edge-tts 버전을 고정한다 (업그레이드 시 communicate.py의 접속 방식과 대조).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import AsyncIterator, Optional
+from xml.sax.saxutils import escape
+
+import aiohttp
+from edge_tts import constants as edge_constants
+from edge_tts.drm import DRM
+
+logger = logging.getLogger("voice-agent.tts.connection")
+
+OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"
+MAX_SSML_TEXT_BYTES = 4096  # 단일 요청 최대 텍스트 (초과 시 호출 측에서 분할 합성)
+
+
+def _timestamp() -> str:
+    return time.strftime("%a %b %d %Y %H:%M:%S GMT+0000 (Coordinated Universal Time)", time.gmtime())
+
+
+def _parse_headers(raw: bytes) -> dict:
+    headers = {}
+    for line in raw.split(b"\r\n"):
+        if b":" in line:
+            key, value = line.split(b":", 1)
+            headers[key.decode()] = value.decode()
+    return headers
+
+
+def build_edge_url_and_headers() -> tuple[str, dict]:
+    """edge-tts Communicate와 동일한 접속 URL/헤더 생성"""
+    url = (
+        f"{edge_constants.WSS_URL}&ConnectionId={uuid.uuid4().hex}"
+        f"&Sec-MS-GEC={DRM.generate_sec_ms_gec()}"
+        f"&Sec-MS-GEC-Version={edge_constants.SEC_MS_GEC_VERSION}"
+    )
+    return url, DRM.headers_with_muid(edge_constants.WSS_HEADERS)
+
+
+class TTSConnection:
+    """speech.config 전송이 끝난 단일 합성 websocket"""
+
+    def __init__(self, voice: str, session: aiohttp.ClientSession, ws: aiohttp.ClientWebSocketResponse):
+        self.voice = voice
+        self.session = session
+        self.ws = ws
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.requests = 0
+
+    def is_healthy(self, max_age_sec: float, max_idle_sec: float) -> bool:
+        now = time.monotonic()
+        return (
+            not self.ws.closed
+            and now - self.created_at < max_age_sec
+            and now - self.last_used_at < max_idle_sec
+        )
+
+    async def synthesize(self, text: str) -> AsyncIterator[bytes]:
+        """SSML 요청 전송 후 turn.end까지 오디오 청크 수신"""
+        request_id = uuid.uuid4().hex
+        ssml = (
+            "<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='en-US'>"
+            f"<voice name='{self.voice}'><prosody pitch='+0Hz' rate='+0%' volume='+0%'>"
+            f"{escape(text)}</prosody></voice></speak>"
+        )
+        await self.ws.send_str(
+            f"X-RequestId:{request_id}\r\n"
+            "Content-Type:application/ssml+xml\r\n"
+            f"X-Timestamp:{_timestamp()}Z\r\n"
+            "Path:ssml\r\n\r\n"
+            f"{ssml}"
+        )
+        self.requests += 1
+
+        async for message in self.ws:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                raw = message.data.encode("utf-8")
+                headers = _parse_headers(raw[:raw.find(b"\r\n\r\n")])
+                if headers.get("Path") == "turn.end":
+                    self.last_used_at = time.monotonic()
+                    return
+            elif message.type == aiohttp.WSMsgType.BINARY:
+                if len(message.data) < 2:
+                    continue
+                header_length = int.from_bytes(message.data[:2], "big")
+                headers = _parse_headers(message.data[2:2 + header_length])
+                audio = message.data[2 + header_length:]
+                if headers.get("Path") == "audio" and audio:
+                    yield audio
+            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                break
+
+        raise ConnectionError("TTS websocket closed before turn.end")
+
+    async def close(self):
+        try:
+            await self.ws.close()
+        finally:
+            await self.session.close()
+
+
+class TTSConnectionManager:
+    """Voice별 warm 연결 풀 (상태 확인 + 재연결)"""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_idle_per_voice: int = 2,
+        max_age_sec: float = 120.0,
+        max_idle_sec: float = 30.0,
+        connect_timeout_sec: float = 5.0,
+    ):
+        self.url = url  # 지정 시 해당 주소로 접속 (로컬 stand-in 측정용)
+        self.max_idle_per_voice = max_idle_per_voice
+        self.max_age_sec = max_age_sec
+        self.max_idle_sec = max_idle_sec
+        self.connect_timeout_sec = connect_timeout_sec
+        self._idle: dict[str, deque[TTSConnection]] = defaultdict(deque)
+        self._warming: dict[str, asyncio.Task] = {}
+        self._closing: set[asyncio.Task] = set()  # 백그라운드 연결 종료 (참조 유지)
+
+    async def _connect(self, voice: str) -> TTSConnection:
+        if self.url:
+            url, headers = self.url, {}
+        else:
+            url, headers = build_edge_url_and_headers()
+
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, connect=self.connect_timeout_sec))
+        try:
+            ws = await session.ws_connect(url, headers=headers, compress=15)
+            await ws.send_str(
+                f"X-Timestamp:{_timestamp()}\r\n"
+                "Content-Type:application/json; charset=utf-8\r\n"
+                "Path:speech.config\r\n\r\n"
+                '{"context":{"synthesis":{"audio":{"metadataoptions":{'
+                '"sentenceBoundaryEnabled":"false","wordBoundaryEnabled":"false"},'
+                f'"outputFormat":"{OUTPUT_FORMAT}"'
+                "}}}}\r\n"
+            )
+        except Exception:
+            await session.close()
+            raise
+        return TTSConnection(voice, session, ws)
+
+    def _take_idle(self, voice: str) -> Optional[TTSConnection]:
+        idle = self._idle[voice]
+        while idle:
+            conn = idle.popleft()
+            if conn.is_healthy(self.max_age_sec, self.max_idle_sec):
+                return conn
+            self._close_later(conn)
+        return None
+
+    def _close_later(self, conn: TTSConnection):
+        task = asyncio.create_task(conn.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _release(self, conn: TTSConnection):
+        idle = self._idle[conn.voice]
+        if conn.is_healthy(self.max_age_sec, self.max_idle_sec) and len(idle) < self.max_idle_per_voice:
+            idle.append(conn)
+        else:
+            self._close_later(conn)
+
+    def warm(self, voice: str):
+        """턴 시작 시 호출 - 사용 가능한 연결이 없으면 백그라운드로 미리 연결"""
+        idle = self._idle[voice]
+        if any(c.is_healthy(self.max_age_sec, self.max_idle_sec) for c in idle):
+            return
+        task = self._warming.get(voice)
+        if task and not task.done():
+            return
+
+        async def open_connection():
+            try:
+                self._release(await self._connect(voice))
+            except Exception as e:
+                logger.warning(f"TTS pre-connect failed for {voice}: {e}")
+
+        self._warming[voice] = asyncio.create_task(open_connection())
+
+    async def synthesize(self, text: str, voice: str, stats: Optional[dict] = None) -> AsyncIterator[bytes]:
+        """warm 연결로 합성 (응답 전 연결 오류 시 새 연결로 1회 재시도)"""
+        stats = stats if stats is not None else {}
+        warming = self._warming.get(voice)
+        if warming and not warming.done() and not self._idle[voice]:
+            await warming
+
+        for attempt in range(2):
+            conn = self._take_idle(voice)
+            stats["reused"] = conn is not None and conn.requests > 0
+            stats["prewarmed"] = conn is not None
+            if conn is None:
+                conn = await self._connect(voice)
+
+            received = False
+            try:
+                async for chunk in conn.synthesize(text):
+                    received = True
+                    yield chunk
+            except (aiohttp.ClientError, ConnectionError) as e:
+                await conn.close()
+                if received or attempt == 1:
+                    raise
+                logger.debug(f"TTS connection stale, reconnecting: {e}")
+                continue
+            except BaseException:
+                # 소비 중단/취소 시 응답이 섞이지 않도록 연결 폐기
+                await conn.close()
+                raise
+
+            self._release(conn)
+            return
+
+    async def close(self):
+        for task in self._warming.values():
+            task.cancel()
+        for idle in self._idle.values():
+            while idle:
+                await idle.popleft().close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
@@ -0,0 +1,67 @@
+"""
+응답 대기용 필러 음성
+"음…", "잠시만요" 같은 짧은 음성을 미리 합성/디코딩해 PCM으로 보관한다.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger("voice-agent.tts.filler")
+
+
+def apply_fade(pcm: np.ndarray, sample_rate: int, fade_ms: float = 5.0) -> np.ndarray:
+    """클릭 방지용 앞뒤 페이드 적용"""
+    pcm = pcm.astype(np.float32)
+    fade = min(len(pcm) // 2, int(sample_rate * fade_ms / 1000))
+    if fade > 0:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        pcm[:fade] *= ramp
+        pcm[-fade:] *= ramp[::-1]
+    return pcm.astype(np.int16)
+
+
+def fade_out(chunk: np.ndarray) -> np.ndarray:
+    """중단 시 마지막 프레임을 0까지 감쇠"""
+    ramp = np.linspace(1.0, 0.0, len(chunk), dtype=np.float32)
+    return (chunk.astype(np.float32) * ramp).astype(np.int16)
+
+
+class FillerBank:
+    """미리 디코딩된 필러 클립 보관소"""
+
+    def __init__(self, texts: list[str], sample_rate: int = 24000):
+        self.texts = [t for t in texts if t.strip()]
+        self.sample_rate = sample_rate
+        self.clips: list[np.ndarray] = []
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.clips)
+
+    async def load(
+        self,
+        synthesize: Callable[[str], Awaitable[bytes]],
+        decode: Callable[[bytes], Awaitable[Optional[np.ndarray]]],
+    ):
+        """필러 텍스트를 합성/디코딩해 메모리에 적재 (진행 중인 적재가 있으면 끝나기를 기다린 뒤 재사용)"""
+        async with self._load_lock:
+            if self.ready:
+                return
+            clips = []
+            for text in self.texts:
+                try:
+                    pcm = await decode(await synthesize(text))
+                    if pcm is not None and len(pcm):
+                        clips.append(apply_fade(pcm, self.sample_rate))
+                except Exception as e:
+                    logger.warning(f"Failed to prepare filler '{text}': {e}")
+            self.clips = clips
+            logger.info(f"Prepared {len(clips)}/{len(self.texts)} filler clips")
+
+    def pick(self) -> Optional[np.ndarray]:
+        return random.choice(self.clips) if self.clips else None
@@ -14,6 +14,38 @@ import {
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:3000";
 const LIVEKIT_URL = process.env.NEXT_PUBLIC_LIVEKIT_URL || "ws://localhost:7880";
 
+// 에이전트 응답 바이너리 프레이밍 (kind u8, turn u32, seq u32, identity_len u8 + UTF-8 identity + UTF-8 텍스트)
+const RESPONSE_BINARY_TOPIC = "agent-response";
+const RESPONSE_KIND_DELTA = 1;
+const RESPONSE_KIND_DONE = 2;
+
+type ResponseChunk = {
+  type: "response_delta" | "response_done";
+  // 턴 번호는 참가자별로 매겨지므로 (identity, turn)으로 구분
+  identity: string;
+  turn: number;
+  seq: number;
+  text: string;
+};
+
+function decodeResponseFrame(payload: Uint8Array): ResponseChunk {
+  const view = new DataView(payload.buffer, payload.byteOffset, payload.byteLength);
+  const kind = view.getUint8(0);
+  const identityEnd = 10 + view.getUint8(9);
+  const decoder = new TextDecoder();
+  return {
+    type: kind === RESPONSE_KIND_DONE ? "response_done" : "response_delta",
+    identity: decoder.decode(payload.subarray(10, identityEnd)),
+    turn: view.getUint32(1),
+    seq: view.getUint32(5),
+    text: decoder.decode(payload.subarray(identityEnd)),
+  };
+}
+
+function responseKey(chunk: ResponseChunk): string {
+  return JSON.stringify([chunk.identity ?? "", chunk.turn]);
+}
+
 type Message = {
   id: string;
   role: "user" | "assistant" | "system";
@@ -34,6 +66,9 @@ export function VoiceChat() {
   const audioContextRef = useRef<AudioContext | null>(null);
   const analyserRef = useRef<AnalyserNode | null>(null);
   const animationFrameRef = useRef<number | null>(null);
+  // (참가자, 턴)별 수신한 응답 조각 (seq 순서로 재조립)
+  const responseChunksRef = useRef<Map<string, Map<number, string>>>(new Map());
+  const responseIdsRef = useRef<Map<string, string>>(new Map());
 
   const log = useCallback((msg: string) => {
     const time = new Date().toLocaleTimeString();
@@ -48,6 +83,39 @@ export function VoiceChat() {
     ]);
   }, []);
 
+  const applyResponseChunk = useCallback((chunk: ResponseChunk) => {
+    const key = responseKey(chunk);
+    const id =
+      responseIdsRef.current.get(key) ?? `response-${Date.now()}-${key}`;
+    let content: string;
+
+    if (chunk.type === "response_done") {
+      // 최종 텍스트로 교체 (누락/역순 조각 보정)
+      responseChunksRef.current.delete(key);
+      responseIdsRef.current.delete(key);
+      content = chunk.text;
+    } else {
+      responseIdsRef.current.set(key, id);
+      const chunks = responseChunksRef.current.get(key) ?? new Map();
+      chunks.set(chunk.seq, chunk.text);
+      responseChunksRef.current.set(key, chunks);
+      content = Array.from(chunks.entries())
+        .sort(([a], [b]) => a - b)
+        .map(([, text]) => text)
+        .join("");
+    }
+
+    setMessages((prev) => {
+      const index = prev.findIndex((m) => m.id === id);
+      if (index === -1) {
+        return [...prev, { id, role: "assistant", content }];
+      }
+      const next = [...prev];
+      next[index] = { ...next[index], content };
+      return next;
+    });
+  }, []);
+
   const getToken = useCallback(
     async (roomName: string, participantName: string) => {
       // 먼저 방 생성 (이미 있으면 무시)
@@ -153,9 +221,27 @@ export function VoiceChat() {
 
       room.on(
         RoomEvent.DataReceived,
-        (payload: Uint8Array, participant?: RemoteParticipant) => {
+        (
+          payload: Uint8Array,
+          participant?: RemoteParticipant,
+          kind?: unknown,
+          topic?: string
+        ) => {
           try {
+            if (topic === RESPONSE_BINARY_TOPIC) {
+              applyResponseChunk(decodeResponseFrame(payload));
+              return;
+            }
+
             const data = JSON.parse(new TextDecoder().decode(payload));
+
+            if (data.type === "response_delta" || data.type === "response_done") {
+              applyResponseChunk(data);
+              if (data.type === "response_done") {
+                log(`Data received: ${JSON.stringify(data)}`);
+              }
+              return;
+            }
             log(`Data received: ${JSON.stringify(data)}`);
 
             if (data.type === "transcription") {
@@ -192,7 +278,7 @@ export function VoiceChat() {
       log(`Connection error: ${err}`);
       setStatus("disconnected");
     }
-  }, [getToken, log, addMessage, setupAudioVisualizer]);
+  }, [getToken, log, addMessage, applyResponseChunk, setupAudioVisualizer]);
 
   const disconnect = useCallback(async () => {
     try {